@@ -1,8 +1,18 @@
 from .base import BaseAlgorithm
 from .session import Session
-from .shared_memory import read_image_from_shared_memory, write_image_array_to_shared_memory
+from .shared_memory import (
+    read_image_from_shared_memory,
+    write_image_array_to_shared_memory,
+    read_array_from_shared_memory,
+    write_array_to_shared_memory,
+    release_shared_memory,
+)
 from .logger import StructuredLogger
 from .diagnostics import Diagnostics
+from .client import AdapterClient
+from .aio_client import AsyncAdapterClient
+from .pool import AdapterPool
+from .runner import MockRunner
 from .errors import RecoverableError, FatalError, GPUOutOfMemoryError, ProgramError
 
 __all__ = [
@@ -10,10 +20,17 @@ __all__ = [
     "Session",
     "read_image_from_shared_memory",
     "write_image_array_to_shared_memory",
+    "read_array_from_shared_memory",
+    "write_array_to_shared_memory",
+    "release_shared_memory",
     "StructuredLogger",
     "Diagnostics",
     "RecoverableError",
     "FatalError",
     "GPUOutOfMemoryError",
     "ProgramError",
+    "AdapterClient",
+    "AdapterPool",
+    "MockRunner",
+    "AsyncAdapterClient",
 ]
@@ -5,52 +5,58 @@ import os
 import sys
 import time
 import re
+import signal
 import threading
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
-from ..logger import StructuredLogger
+from ..logger import StructuredLogger, flush_loggers, get_levels, logger_counters, set_level
 from ..base import BaseAlgorithm
-from ..shared_memory import read_image_from_shared_memory
+from ..framing import read_frame_timed, write_frame_bytes
+from ..imports import load_import_index, preload, slow_imports
+from ..profiling import CPU_MODES, ExecuteProfiler
+from ..recording import TrafficRecorder
+from ..serialization import dumps
+from ..shared_memory import ResultSegmentManager, read_image_from_shared_memory, shared_memory_read_stats
+from ..stats import RuntimeStats
 
 _PROTO_OUT = None
+_RECORDER: Optional[TrafficRecorder] = None
+_STATS = RuntimeStats()
+
+_CAPABILITIES = [
+    "ping",
+    "call",
+    "shutdown",
+    "shared_memory:v1",
+    "execute",
+    "timing:v1",
+    "stats:v1",
+    "result_shm:v1",
+    "partial:v1",
+    "log_level:v1",
+]
 
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+def _elapsed_ms(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000.0, 3)
+
+
+def _write_bytes(data: bytes) -> None:
+    write_frame_bytes(_PROTO_OUT or sys.stdout.buffer, data)
+    if _RECORDER is not None:
+        _RECORDER.outbound(data)
+
+
 def _write_frame(payload: Dict[str, Any]) -> None:
-    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    length = len(data).to_bytes(4, byteorder="big")
-    out = _PROTO_OUT or sys.stdout.buffer
-    out.write(length + data)
-    out.flush()
-
-
-def _read_exact(n: int) -> Optional[bytes]:
-    buf = b""
-    while len(buf) < n:
-        chunk = sys.stdin.buffer.read(n - len(buf))
-        if not chunk:
-            return None
-        buf += chunk
-    return buf
-
-
-def _read_frame() -> Optional[Dict[str, Any]]:
-    h = _read_exact(4)
-    if h is None:
-        return None
-    ln = int.from_bytes(h, byteorder="big")
-    if ln <= 0:
-        return None
-    body = _read_exact(ln)
-    if body is None:
-        return None
-    try:
-        return json.loads(body.decode("utf-8"))
-    except Exception:
-        return None
+    _write_bytes(dumps(payload))
+
+
+def _read_frame_timed() -> Tuple[Optional[Dict[str, Any]], float]:
+    return read_frame_timed(sys.stdin.buffer)
 
 
 def _get_sdk_version() -> str:
@@ -123,8 +129,9 @@ def _discover_entry(cli_entry: Optional[str]) -> Optional[str]:
 
 def _import_entry(ep: str) -> BaseAlgorithm:
     m, c = ep.split(":", 1)
-    mod = importlib.import_module(m)
-    cls = getattr(mod, c)
+    # 走 __import__ 而非 importlib.import_module，入口模块本身才会出现在 -X importtime 输出中
+    __import__(m)
+    cls = getattr(sys.modules[m], c)
     inst = cls()
     return inst
 
@@ -134,25 +141,45 @@ def _send_hello() -> None:
         "type": "hello",
         "sdk_version": _get_sdk_version(),
         "timestamp_ms": _now_ms(),
-        "capabilities": [
-            "ping",
-            "call",
-            "shutdown",
-            "shared_memory:v1",
-            "execute"
-        ]
+        "capabilities": list(_CAPABILITIES),
     })
 
 
+def _negotiate(runner_hello: Dict[str, Any]) -> set:
+    requested = runner_hello.get("capabilities") or []
+    if not isinstance(requested, list):
+        return set()
+    return {c for c in requested if c in _CAPABILITIES}
+
+
 def _send_pong(req: Dict[str, Any]) -> None:
     rid = req.get("request_id")
     _write_frame({"type": "pong", "request_id": rid, "timestamp_ms": _now_ms(), "status": "OK"})
 
 
 def _send_error(message: str, code: str, rid: Optional[str]) -> None:
+    _STATS.record_error(code)
     _write_frame({"type": "error", "request_id": rid, "timestamp_ms": _now_ms(), "status": "ERROR", "message": message, "error_code": code})
 
 
+def _send_stats(req: Dict[str, Any]) -> None:
+    _write_frame({"type": "stats", "request_id": req.get("request_id"), "timestamp_ms": _now_ms(), "status": "OK", "data": _STATS.snapshot(shared_memory_read_stats(), logger_counters())})
+
+
+def _send_log_level(req: Dict[str, Any]) -> None:
+    # {"type": "log_level", "level": "debug", "logger": "algo.detector"}：省略 logger 时调整默认级别，level 为 null 时移除该 logger 的覆盖；均省略时仅查询
+    rid = req.get("request_id")
+    try:
+        if "level" in req or req.get("logger"):
+            levels = set_level(req.get("level"), req.get("logger") or None)
+        else:
+            levels = get_levels()
+    except ValueError as e:
+        _send_error(str(e), "1000", rid)
+        return
+    _write_frame({"type": "log_level", "request_id": rid, "timestamp_ms": _now_ms(), "status": "OK", "data": levels})
+
+
 def _send_shutdown_ack() -> None:
     _write_frame({"type": "shutdown", "timestamp_ms": _now_ms(), "status": "OK"})
 
@@ -161,17 +188,113 @@ def _result_from(status: str, message: str, rid: str, step_index: int, data: Opt
     return {"type": "result", "request_id": rid, "timestamp_ms": _now_ms(), "status": status, "message": message, "data": {"step_index": step_index, **(data or {})}}
 
 
+def _write_result(frame: Dict[str, Any], timing: Dict[str, Any], attach_timing: bool) -> float:
+    t0 = time.perf_counter()
+    data = dumps(frame)
+    timing["serialize_ms"] = _elapsed_ms(t0)
+    timing["total_ms"] = round(timing["total_ms"] + timing["serialize_ms"], 3)
+    if attach_timing:
+        # 序列化耗时需写入同一帧：先序列化主体，再拼接 timing，避免二次序列化整个结果
+        data = data[:-1] + b', "timing": ' + dumps(timing) + b"}"
+    t1 = time.perf_counter()
+    _write_bytes(data)
+    return _elapsed_ms(t1)
+
+
+def _partial_writer(rid: str) -> Any:
+    seq = [0]
+
+    def _emit(data: Dict[str, Any]) -> None:
+        seq[0] += 1
+        _write_frame({"type": "partial", "request_id": rid, "timestamp_ms": _now_ms(), "seq": seq[0], "data": data})
+
+    return _emit
+
+
+def _take_outputs(alg: Any) -> Dict[str, Any]:
+    pending = getattr(alg, "_pending_outputs", None)
+    if not pending:
+        return {}
+    alg._pending_outputs = {}
+    return pending
+
+
+def _observe_call(timing: Dict[str, Any], write_ms: float) -> None:
+    for stage in ("decode", "shm_read_cur", "shm_read_guide", "execute", "shm_write", "serialize", "total"):
+        _STATS.observe(stage, timing.get(stage + "_ms"))
+    _STATS.observe("write", write_ms)
+
+
+def _load_imports(args: argparse.Namespace, logger: StructuredLogger) -> None:
+    index = load_import_index(os.environ.get("PROC_ALGO_ROOT") or os.getcwd())
+    _STATS.startup["import_index"] = index is not None
+    if index is None:
+        return
+    if _STATS.startup["import_ms"] >= args.slow_import_ms:
+        logger.warning("slow_startup_imports", import_ms=_STATS.startup["import_ms"], top=slow_imports(index, args.slow_import_ms / 10.0, "startup"))
+    if args.preload_imports:
+        # 把 execute 内首次导入的模块提前到握手阶段，避免由第一次检测承担
+        res = preload(index, "lazy")
+        _STATS.startup["preload_ms"] = res["elapsed_ms"]
+        logger.info("imports_preloaded", imported=res["imported"], failed=res["failed"], elapsed_ms=res["elapsed_ms"])
+        return
+    lazy = slow_imports(index, args.slow_import_ms / 10.0, "lazy")
+    if lazy and float(index.get("lazy_ms") or 0.0) >= args.slow_import_ms:
+        logger.warning("slow_lazy_imports", lazy_ms=index.get("lazy_ms"), top=lazy, hint="set PROC_PRELOAD_IMPORTS=1 to import these before the first call")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(prog="procvision-adapter")
     parser.add_argument("--entry", type=str, default=None)
     parser.add_argument("--log-level", type=str, default=os.environ.get("PROC_LOG_LEVEL", "info"))
     parser.add_argument("--heartbeat-interval-ms", type=int, default=int(os.environ.get("PROC_HEARTBEAT_INTERVAL_MS", "5000")))
     parser.add_argument("--heartbeat-grace-ms", type=int, default=int(os.environ.get("PROC_HEARTBEAT_GRACE_MS", "2000")))
+    parser.add_argument("--record", type=str, default=os.environ.get("PROC_RECORD_FILE"))
+    parser.add_argument("--preload-imports", action="store_true", default=str(os.environ.get("PROC_PRELOAD_IMPORTS") or "").strip().lower() in {"1", "true", "yes", "on"})
+    parser.add_argument("--slow-import-ms", type=float, default=float(os.environ.get("PROC_SLOW_IMPORT_MS", "500")))
+    parser.add_argument("--profile-dir", type=str, default=os.environ.get("PROC_PROFILE_DIR"))
+    parser.add_argument("--profile-calls", type=int, default=int(os.environ.get("PROC_PROFILE_CALLS", "20")))
+    parser.add_argument("--profile-skip", type=int, default=int(os.environ.get("PROC_PROFILE_SKIP", "0")))
+    parser.add_argument("--profile-cpu", type=str, choices=CPU_MODES, default=os.environ.get("PROC_PROFILE_CPU", "cprofile"))
+    parser.add_argument("--profile-no-memory", action="store_true", default=str(os.environ.get("PROC_PROFILE_MEMORY", "1")).strip().lower() in {"0", "false", "no", "off"})
+    parser.add_argument("--log-async", action="store_true", default=str(os.environ.get("PROC_LOG_ASYNC") or "").strip().lower() in {"1", "true", "yes", "on"})
+    parser.add_argument("--log-queue-size", type=int, default=int(os.environ.get("PROC_LOG_QUEUE_SIZE", "10000")))
+    parser.add_argument("--log-overflow", type=str, choices=("drop", "block"), default=os.environ.get("PROC_LOG_OVERFLOW", "drop"))
+    parser.add_argument("--log-rate-limit", type=float, default=float(os.environ.get("PROC_LOG_RATE_LIMIT") or 0))
+    parser.add_argument("--log-summary-s", type=float, default=float(os.environ.get("PROC_LOG_SUMMARY_S") or 10.0))
     args = parser.parse_args()
 
+    # 写回环境变量：入口导入后 BaseAlgorithm 创建的 logger 使用同一配置
+    os.environ["PROC_LOG_ASYNC"] = "1" if args.log_async else "0"
+    os.environ["PROC_LOG_QUEUE_SIZE"] = str(args.log_queue_size)
+    os.environ["PROC_LOG_OVERFLOW"] = args.log_overflow
+    os.environ["PROC_LOG_RATE_LIMIT"] = str(args.log_rate_limit)
+    os.environ["PROC_LOG_SUMMARY_S"] = str(args.log_summary_s)
+    try:
+        set_level(args.log_level)
+        bad_level = None
+    except ValueError:
+        bad_level = args.log_level
     logger = StructuredLogger()
-    global _PROTO_OUT
+    if bad_level is not None:
+        logger.warning("invalid_log_level", level=bad_level, fallback="info")
+    if args.log_async:
+        # SIGTERM 默认直接终止进程，不执行 atexit：先写出异步队列中的日志
+        def _on_term(signum: int, frame: Any) -> None:
+            flush_loggers(1.0)
+            os._exit(128 + signum)
+
+        try:
+            signal.signal(signal.SIGTERM, _on_term)
+        except Exception:
+            pass
+    global _PROTO_OUT, _RECORDER
     _PROTO_OUT = os.fdopen(os.dup(1), "wb", closefd=True)
+    if args.record:
+        try:
+            _RECORDER = TrafficRecorder(args.record)
+        except Exception as e:
+            logger.error("record_open_failed", path=args.record, error=str(e))
     strict_stdio = str(os.environ.get("PROC_STRICT_STDIO") or "").strip().lower() in {"1", "true", "yes", "on"}
     stdout_guard = {"active": False, "bytes": 0, "preview": b""}
     guard_lock = threading.Lock()
@@ -224,23 +347,52 @@ def main() -> None:
     if not ep:
         _send_error("entry_point not found", "1004", None)
         return
+    t_import = time.perf_counter()
     try:
         alg = _import_entry(ep)
     except Exception as e:
         _send_error(str(e), "1000", None)
         return
+    _STATS.startup["import_ms"] = _elapsed_ms(t_import)
+    _load_imports(args, logger)
+
+    profiler: Optional[ExecuteProfiler] = None
+    if args.profile_dir:
+        profiler = ExecuteProfiler(
+            args.profile_dir,
+            calls=args.profile_calls,
+            skip=args.profile_skip,
+            cpu=args.profile_cpu,
+            memory=not args.profile_no_memory,
+            on_written=lambda s: logger.info("profile_written", dir=args.profile_dir, calls=s.get("calls"), files=s.get("files")),
+        )
 
     running = False
+    features: set = set()
+    segments = ResultSegmentManager(keep=int(os.environ.get("PROC_RESULT_SHM_KEEP", "8")))
+    last_write_ms: Optional[float] = None
     try:
         while True:
-            msg = _read_frame()
+            msg, decode_ms = _read_frame_timed()
             if msg is None:
                 break
+            if _RECORDER is not None:
+                _RECORDER.inbound(msg)
             t = msg.get("type")
             if t == "ping":
                 _send_pong(msg)
                 continue
             if t == "hello":
+                features = _negotiate(msg)
+                continue
+            if t == "stats":
+                _send_stats(msg)
+                continue
+            if t == "log_level":
+                _send_log_level(msg)
+                continue
+            if t == "release":
+                segments.release(str(msg.get("request_id") or ""))
                 continue
             if t == "shutdown":
                 _send_shutdown_ack()
@@ -250,6 +402,9 @@ def main() -> None:
                     _send_error("busy", "1000", msg.get("request_id"))
                     continue
                 running = True
+                _STATS.record_call()
+                t_call = time.perf_counter()
+                timing: Dict[str, Any] = {"decode_ms": decode_ms}
                 try:
                     rid = msg.get("request_id") or ""
                     d = msg.get("data", {})
@@ -265,14 +420,31 @@ def main() -> None:
                     if not cur_image_shm_id or not guide_image_shm_id:
                         _send_error("missing cur_image_shm_id/guide_image_shm_id", "1000", rid)
                         continue
+                    t0 = time.perf_counter()
                     cur_image = read_image_from_shared_memory(cur_image_shm_id, cur_image_meta)
+                    timing["shm_read_cur_ms"] = _elapsed_ms(t0)
+                    t0 = time.perf_counter()
                     guide_image = read_image_from_shared_memory(guide_image_shm_id, guide_image_meta)
+                    timing["shm_read_guide_ms"] = _elapsed_ms(t0)
                     if strict_stdio:
                         with guard_lock:
                             stdout_guard["active"] = True
                             stdout_guard["bytes"] = 0
                             stdout_guard["preview"] = b""
-                    res = alg.execute(step_index, step_desc, cur_image, guide_image, guide_info)
+                    _take_outputs(alg)
+                    if "partial:v1" in features:
+                        alg._partial_sink = _partial_writer(rid)
+                    t0 = time.perf_counter()
+                    try:
+                        if profiler is not None:
+                            with profiler.call():
+                                res = alg.execute(step_index, step_desc, cur_image, guide_image, guide_info)
+                        else:
+                            res = alg.execute(step_index, step_desc, cur_image, guide_image, guide_info)
+                    finally:
+                        if "partial:v1" in features:
+                            alg._partial_sink = None
+                    timing["execute_ms"] = _elapsed_ms(t0)
                     out_bytes = 0
                     out_preview = b""
                     if strict_stdio:
@@ -298,7 +470,19 @@ def main() -> None:
                         st = res.get("status") or "OK"
                         msg_text = res.get("message") or ""
                         data = res.get("data") or {}
-                        _write_frame(_result_from(st, msg_text, rid, step_index, data))
+                        outputs = _take_outputs(alg)
+                        if outputs and "result_shm:v1" in features:
+                            t0 = time.perf_counter()
+                            data = {**data, "outputs": segments.publish(rid, outputs)}
+                            timing["shm_write_ms"] = _elapsed_ms(t0)
+                        elif outputs:
+                            logger.info("result_outputs_dropped", request_id=rid, outputs=sorted(outputs.keys()), reason="result_shm:v1 not negotiated")
+                        # 当前帧的写出耗时无法自报，附带上一帧的写出耗时
+                        timing["prev_write_ms"] = last_write_ms
+                        timing["total_ms"] = round(_elapsed_ms(t_call) + decode_ms, 3)
+                        last_write_ms = _write_result(_result_from(st, msg_text, rid, step_index, data), timing, "timing:v1" in features)
+                        _STATS.record_result(st, res.get("error_code"))
+                        _observe_call(timing, last_write_ms)
                     else:
                         _send_error("invalid execute return", "1000", rid)
                 except Exception as e:
@@ -308,6 +492,15 @@ def main() -> None:
                 continue
     except KeyboardInterrupt:
         pass
+    except Exception as e:
+        logger.error("adapter_fatal", error=f"{type(e).__name__}: {e}")
+        flush_loggers()
+        raise
+    segments.release_all()
+    if profiler is not None:
+        profiler.close()
+    if _RECORDER is not None:
+        _RECORDER.close()
     try:
         if strict_stdio:
             try:
@@ -318,6 +511,7 @@ def main() -> None:
             guard_thread.join(timeout=0.2)
     except Exception:
         pass
+    flush_loggers()
 
 
 if __name__ == "__main__":
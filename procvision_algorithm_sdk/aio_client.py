@@ -0,0 +1,352 @@
+import asyncio
+import inspect
+import os
+import sys
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from .client import ADAPTER_EXIT_ERROR_CODE, TIMEOUT_ERROR_CODE, _error_frame
+from .framing import encode_frame
+from .serialization import loads
+
+
+class AsyncAdapterClient:
+    def __init__(
+        self,
+        project: str,
+        entry: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        capabilities: Optional[List[str]] = None,
+        strict_stdio: bool = False,
+        python: Optional[str] = None,
+        adapter_args: Optional[List[str]] = None,
+        heartbeat_interval_ms: int = 5000,
+        heartbeat_grace_ms: int = 2000,
+        hello_timeout_s: float = 30.0,
+        call_timeout_s: Optional[float] = None,
+        restart_on_timeout: bool = True,
+        stderr_handler: Optional[Callable[[bytes], Any]] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        self.project = project
+        self.entry = entry
+        self.extra_env = dict(env or {})
+        self.requested_capabilities = list(capabilities or [])
+        self.strict_stdio = strict_stdio
+        self.python = python or sys.executable
+        self.adapter_args = list(adapter_args or [])
+        self.heartbeat_interval_ms = heartbeat_interval_ms
+        self.heartbeat_grace_ms = heartbeat_grace_ms
+        self.hello_timeout_s = hello_timeout_s
+        self.call_timeout_s = call_timeout_s
+        self.restart_on_timeout = restart_on_timeout
+        self.stderr_handler = stderr_handler
+        self.name = name or os.path.basename(os.path.abspath(project))
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.hello: Optional[Dict[str, Any]] = None
+        self.capabilities: List[str] = []
+        self.restarts = 0
+        self.last_error: Optional[Dict[str, Any]] = None
+        self._pending: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._partials: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._hello_future: Optional["asyncio.Future[Dict[str, Any]]"] = None
+        self._shutdown_future: Optional["asyncio.Future[None]"] = None
+        self._eof = False
+        # 在事件循环内首次使用时创建（Python 3.8/3.9 的 Lock 构造时绑定事件循环）
+        self._restart_lock: Optional[asyncio.Lock] = None
+        self._restart_due = False
+        self._generation = 0
+
+    async def __aenter__(self) -> "AsyncAdapterClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.proc.pid if self.proc is not None else None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None and self.hello is not None and not self._eof
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._pending)
+
+    def _get_restart_lock(self) -> asyncio.Lock:
+        if self._restart_lock is None:
+            self._restart_lock = asyncio.Lock()
+        return self._restart_lock
+
+    async def start(self) -> Dict[str, Any]:
+        cmd = [self.python, "-m", "procvision_algorithm_sdk.adapter"]
+        if self.entry:
+            cmd += ["--entry", self.entry]
+        cmd += self.adapter_args
+        env = os.environ.copy()
+        env["PROC_ALGO_ROOT"] = os.path.abspath(self.project)
+        if self.strict_stdio:
+            env["PROC_STRICT_STDIO"] = "1"
+        env.update(self.extra_env)
+        loop = asyncio.get_running_loop()
+        self.hello = None
+        self.last_error = None
+        self._eof = False
+        self._generation += 1
+        self._hello_future = loop.create_future()
+        self._shutdown_future = loop.create_future()
+        self.proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.project,
+            env=env,
+            limit=16 * 1024 * 1024,
+        )
+        self._tasks = [loop.create_task(self._reader(self.proc)), loop.create_task(self._stderr_reader(self.proc))]
+        try:
+            self.hello = await asyncio.wait_for(asyncio.shield(self._hello_future), self.hello_timeout_s)
+        except Exception:
+            await self._kill()
+            raise RuntimeError("adapter hello missing")
+        offered = self.hello.get("capabilities") or []
+        self.capabilities = [c for c in self.requested_capabilities if c in offered]
+        runner_hello: Dict[str, Any] = {
+            "type": "hello",
+            "runner_version": "dev",
+            "heartbeat_interval_ms": self.heartbeat_interval_ms,
+            "heartbeat_grace_ms": self.heartbeat_grace_ms,
+        }
+        if self.capabilities:
+            runner_hello["capabilities"] = list(self.capabilities)
+        try:
+            await self._send(runner_hello)
+        except Exception:
+            pass
+        return self.hello
+
+    async def _reader(self, proc: asyncio.subprocess.Process) -> None:
+        stream = proc.stdout
+        try:
+            while stream is not None:
+                try:
+                    h = await stream.readexactly(4)
+                    body = await stream.readexactly(int.from_bytes(h, byteorder="big"))
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                try:
+                    frame = loads(body)
+                except Exception:
+                    break
+                self._dispatch(frame)
+        finally:
+            if proc is self.proc:
+                self._eof = True
+                if self._hello_future is not None and not self._hello_future.done():
+                    self._hello_future.set_exception(RuntimeError("adapter exited before hello"))
+                err = self.last_error or {}
+                self._fail_all(err.get("message") or "adapter exited", err.get("error_code") or ADAPTER_EXIT_ERROR_CODE)
+
+    def _dispatch(self, frame: Dict[str, Any]) -> None:
+        t = frame.get("type")
+        if t == "hello" and self._hello_future is not None and not self._hello_future.done():
+            self._hello_future.set_result(frame)
+            return
+        if t == "shutdown":
+            if self._shutdown_future is not None and not self._shutdown_future.done():
+                self._shutdown_future.set_result(None)
+            return
+        rid = frame.get("request_id")
+        if rid is None:
+            self.last_error = frame
+            return
+        rid = str(rid)
+        if t == "partial":
+            cb = self._partials.get(rid)
+            if cb is not None:
+                try:
+                    r = cb(frame)
+                    if inspect.isawaitable(r):
+                        asyncio.ensure_future(r)
+                except Exception:
+                    pass
+            return
+        fut = self._pending.pop(rid, None)
+        self._partials.pop(rid, None)
+        if fut is not None and not fut.done():
+            fut.set_result(frame)
+
+    async def _stderr_reader(self, proc: asyncio.subprocess.Process) -> None:
+        stream = proc.stderr
+        try:
+            while stream is not None:
+                line = await stream.readline()
+                if not line:
+                    break
+                if self.stderr_handler is not None:
+                    try:
+                        r = self.stderr_handler(line)
+                        if inspect.isawaitable(r):
+                            await r
+                    except Exception:
+                        pass
+        except Exception:
+            pass
+
+    def _fail_all(self, message: str, code: str) -> None:
+        pending = list(self._pending.items())
+        self._pending.clear()
+        self._partials.clear()
+        for rid, fut in pending:
+            if not fut.done():
+                fut.set_result(_error_frame(rid, message, code))
+
+    async def _send(self, frame: Dict[str, Any]) -> None:
+        proc = self.proc
+        if proc is None or proc.stdin is None:
+            raise BrokenPipeError("adapter not started")
+        proc.stdin.write(encode_frame(frame))
+        await proc.stdin.drain()
+
+    async def _ensure_ready(self) -> None:
+        lock = self._get_restart_lock()
+        if not lock.locked() and not (self._restart_due and not self._pending):
+            return
+        # 等待进行中的重启；超时后推迟的重启在其他在途调用全部结束后执行
+        async with lock:
+            if self._restart_due and not self._pending and self.proc is not None:
+                await self._restart()
+
+    async def request(self, frame_type: str, timeout: Optional[float] = 5.0, on_partial: Optional[Callable[[Dict[str, Any]], Any]] = None, **fields: Any) -> Dict[str, Any]:
+        rid = str(fields.pop("request_id", None) or uuid.uuid4())
+        try:
+            await self._ensure_ready()
+        except Exception as e:
+            return _error_frame(rid, str(e), ADAPTER_EXIT_ERROR_CODE)
+        if not self.alive:
+            err = self.last_error or {}
+            return _error_frame(rid, err.get("message") or "adapter not running", err.get("error_code") or ADAPTER_EXIT_ERROR_CODE)
+        fut: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        gen = self._generation
+        self._pending[rid] = fut
+        if on_partial is not None:
+            self._partials[rid] = on_partial
+        try:
+            await self._send({"type": frame_type, "request_id": rid, **fields})
+            return await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(rid, None)
+            self._partials.pop(rid, None)
+            if frame_type == "call" and self.restart_on_timeout:
+                # 超时的 execute 仍占用适配器，需重启；仍有其他在途调用时推迟到它们结束，避免一并失败；
+                # 代次不同说明适配器已被重启过，不再重复重启
+                async with self._get_restart_lock():
+                    if gen == self._generation:
+                        if self._pending:
+                            self._restart_due = True
+                        else:
+                            try:
+                                await self._restart()
+                            except Exception:
+                                pass
+            return _error_frame(rid, f"{'execute' if frame_type == 'call' else frame_type} 超时", TIMEOUT_ERROR_CODE)
+        except (BrokenPipeError, ConnectionError) as e:
+            self._pending.pop(rid, None)
+            self._partials.pop(rid, None)
+            return _error_frame(rid, f"adapter write failed: {e}", ADAPTER_EXIT_ERROR_CODE)
+        except asyncio.CancelledError:
+            # 调用方取消：丢弃该请求，迟到的结果帧会被忽略
+            self._pending.pop(rid, None)
+            self._partials.pop(rid, None)
+            raise
+
+    async def call(
+        self,
+        data: Dict[str, Any],
+        timeout: Optional[float] = None,
+        request_id: Optional[str] = None,
+        on_partial: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Dict[str, Any]:
+        limit = self.call_timeout_s if timeout is None else timeout
+        return await self.request("call", limit, on_partial=on_partial, request_id=request_id, data=data)
+
+    async def ping(self, timeout: Optional[float] = 5.0) -> bool:
+        return (await self.request("ping", timeout)).get("type") == "pong"
+
+    async def stats(self, timeout: Optional[float] = 5.0) -> Dict[str, Any]:
+        return await self.request("stats", timeout)
+
+    async def set_log_level(self, level: Optional[str], logger: Optional[str] = None, timeout: Optional[float] = 5.0) -> Dict[str, Any]:
+        # 运行时调整适配器内日志级别；logger 为算法模块名（点分前缀匹配），level=None 移除该覆盖
+        return await self.request("log_level", timeout, level=level, logger=logger)
+
+    async def release(self, request_id: str) -> None:
+        if self.alive:
+            await self._send({"type": "release", "request_id": request_id})
+
+    async def restart(self) -> Dict[str, Any]:
+        async with self._get_restart_lock():
+            return await self._restart()
+
+    async def _restart(self) -> Dict[str, Any]:
+        self.restarts += 1
+        self._restart_due = False
+        await self._kill()
+        return await self.start()
+
+    async def _kill(self) -> None:
+        proc = self.proc
+        self._generation += 1
+        self.proc = None
+        self.hello = None
+        self._fail_all("adapter restarted", ADAPTER_EXIT_ERROR_CODE)
+        if proc is None:
+            return
+        try:
+            proc.kill()
+        except Exception:
+            pass
+        await self._reap(proc, 1.0)
+
+    async def _reap(self, proc: asyncio.subprocess.Process, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except Exception:
+            pass
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+        except Exception:
+            pass
+        if self._tasks:
+            # 先给读协程机会消费管道中剩余的帧与日志，再取消
+            await asyncio.wait(self._tasks, timeout=0.5)
+        for t in self._tasks:
+            if not t.done():
+                t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def close(self, timeout: float = 1.0) -> None:
+        proc = self.proc
+        if proc is None:
+            return
+        if self.alive and self._shutdown_future is not None:
+            try:
+                await self._send({"type": "shutdown"})
+                await asyncio.wait_for(asyncio.shield(self._shutdown_future), timeout)
+            except Exception:
+                pass
+        self.proc = None
+        self.hello = None
+        try:
+            proc.terminate()
+        except Exception:
+            pass
+        await self._reap(proc, timeout)
+        self._fail_all("adapter closed", ADAPTER_EXIT_ERROR_CODE)
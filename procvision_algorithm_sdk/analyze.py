@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from typing import Any, Dict, List, Optional, Set
+
+from .deploy import _zip_root
+from .imports import IMPORT_INDEX_FILE, parse_importtime
+from .packaging import CHECKSUMS_FILE, _file_digest
+
+# 分析项目目录时跳过的顶层目录（与 package 一致，另含 .git）
+_SKIP_DIRS = (".venv", ".procvision_cache", ".git")
+_CHUNK = 1024 * 1024
+
+
+def _project_members(project: str) -> List[Dict[str, Any]]:
+    base = os.path.abspath(project)
+    out: List[Dict[str, Any]] = []
+    for root, dirs, files in os.walk(base):
+        if root == base:
+            dirs[:] = [d for d in dirs if not d.startswith(_SKIP_DIRS)]
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for f in files:
+            p = os.path.join(root, f)
+            sha, _ = _file_digest(p)
+            out.append({"path": os.path.relpath(p, base).replace("\\", "/"), "size": os.path.getsize(p), "compressed": None, "sha256": sha})
+    return out
+
+
+def _zip_members(z: zipfile.ZipFile) -> List[Dict[str, Any]]:
+    known: Dict[str, Dict[str, Any]] = {}
+    for n in z.namelist():
+        if n.endswith("/" + CHECKSUMS_FILE) and n.count("/") == 1:
+            try:
+                known = json.loads(z.read(n).decode("utf-8")).get("files") or {}
+            except Exception:
+                known = {}
+    out: List[Dict[str, Any]] = []
+    for info in z.infolist():
+        if info.is_dir():
+            continue
+        sha = (known.get(info.filename) or {}).get("sha256")
+        if sha is None:
+            # 无 checksums.json（旧包）时流式计算
+            h = hashlib.sha256()
+            with z.open(info) as f:
+                for buf in iter(lambda: f.read(_CHUNK), b""):
+                    h.update(buf)
+            sha = h.hexdigest()
+        out.append({"path": info.filename, "size": info.file_size, "compressed": info.compress_size, "sha256": sha})
+    return out
+
+
+def _wheel_top_level(whl: zipfile.ZipFile) -> List[str]:
+    names = whl.namelist()
+    for n in names:
+        if n.endswith(".dist-info/top_level.txt") and n.count("/") == 1:
+            tops = [s.strip() for s in whl.read(n).decode("utf-8", "replace").splitlines() if s.strip()]
+            if tops:
+                return sorted(set(t.split("/")[0] for t in tops))
+    tops: Set[str] = set()
+    for n in names:
+        head = n.split("/")[0]
+        if head.endswith((".dist-info", ".data")):
+            continue
+        if "/" in n:
+            tops.add(head)
+        elif n.endswith(".py"):
+            tops.add(n[:-3])
+        elif n.endswith((".so", ".pyd")):
+            tops.add(n.split(".")[0])
+    return sorted(tops)
+
+
+def _wheels(members: List[Dict[str, Any]], opener: Any) -> List[Dict[str, Any]]:
+    out = []
+    for m in members:
+        norm = m["path"]
+        if not norm.endswith(".whl") or not (norm.startswith("wheels/") or "/wheels/" in norm):
+            continue
+        try:
+            with opener(norm) as f, zipfile.ZipFile(f) as whl:
+                tops = _wheel_top_level(whl)
+        except Exception:
+            tops = []
+        out.append({"file": os.path.basename(norm), "size": m["size"], "top_level": tops})
+    return out
+
+
+def _summarize(members: List[Dict[str, Any]], top: int, root: str = "") -> Dict[str, Any]:
+    by_dir: Dict[str, List[int]] = {}
+    by_sha: Dict[str, List[Dict[str, Any]]] = {}
+    for m in members:
+        # package 生成的 zip 以项目目录名为顶层：去掉该前缀后按一级目录归类，根下文件归入 "."
+        rel = m["path"][len(root):] if root and m["path"].startswith(root) else m["path"]
+        key = rel.split("/")[0] if "/" in rel else "."
+        agg = by_dir.setdefault(key, [0, 0])
+        agg[0] += 1
+        agg[1] += m["size"]
+        if m["size"] > 0:
+            by_sha.setdefault(m["sha256"], []).append(m)
+    groups = [
+        {"sha256": sha, "size": ms[0]["size"], "count": len(ms), "wasted_bytes": ms[0]["size"] * (len(ms) - 1), "paths": sorted(x["path"] for x in ms)}
+        for sha, ms in by_sha.items()
+        if len(ms) > 1
+    ]
+    groups.sort(key=lambda g: -g["wasted_bytes"])
+    largest = sorted(members, key=lambda m: -m["size"])[:top]
+    return {
+        "files": len(members),
+        "bytes": sum(m["size"] for m in members),
+        "compressed_bytes": sum(m["compressed"] for m in members) if members and all(m["compressed"] is not None for m in members) else None,
+        "largest": [{k: m[k] for k in ("path", "size", "compressed")} for m in largest],
+        "by_dir": sorted(({"path": k, "files": v[0], "bytes": v[1]} for k, v in by_dir.items()), key=lambda d: -d["bytes"])[:top],
+        "duplicates": {"groups": groups[:top], "group_count": len(groups), "wasted_bytes": sum(g["wasted_bytes"] for g in groups)},
+    }
+
+
+def measure_imports(root: str, entry: Optional[str] = None, python: Optional[str] = None, env: Optional[Dict[str, str]] = None, timeout: float = 300.0) -> Dict[str, Any]:
+    # 与 Runner 相同的启动路径：启动适配器（hello 后导入入口），stdin 关闭后适配器自行退出
+    cmd = [python or sys.executable, "-X", "importtime", "-m", "procvision_algorithm_sdk.adapter"] + (["--entry", entry] if entry else [])
+    run_env = os.environ.copy()
+    run_env["PROC_ALGO_ROOT"] = os.path.abspath(root)
+    run_env.update(env or {})
+    t0 = time.perf_counter()
+    try:
+        res = subprocess.run(cmd, cwd=root, env=run_env, stdin=subprocess.DEVNULL, capture_output=True, timeout=timeout)
+    except Exception as e:
+        return {"status": "ERROR", "message": f"启动适配器失败: {e}"}
+    text = (res.stderr or b"").decode("utf-8", "replace")
+    modules = parse_importtime(text)
+    if not modules:
+        return {"status": "ERROR", "message": "未获取到 -X importtime 输出: " + "\n".join(text.splitlines()[-5:])}
+    packages: Dict[str, Dict[str, Any]] = {}
+    for m in modules:
+        name = m["module"].split(".")[0]
+        agg = packages.setdefault(name, {"module": name, "self_ms": 0.0, "modules": 0})
+        agg["self_ms"] += m["self_ms"]
+        agg["modules"] += 1
+    rows = sorted(packages.values(), key=lambda r: -r["self_ms"])
+    for r in rows:
+        r["self_ms"] = round(r["self_ms"], 3)
+    return {
+        "status": "OK" if res.returncode == 0 else "ERROR",
+        "message": "" if res.returncode == 0 else f"适配器退出码 {res.returncode}: " + "\n".join(text.splitlines()[-5:]),
+        "wall_ms": round((time.perf_counter() - t0) * 1000.0, 3),
+        "total_ms": round(sum(m["self_ms"] for m in modules), 3),
+        "imported": sorted(packages),
+        "packages": rows,
+    }
+
+
+def _extract_for_imports(z: zipfile.ZipFile, root: str, dest: str) -> str:
+    # 仅解压算法目录（不含 wheels/），依赖由 --python 指定的环境提供
+    for info in z.infolist():
+        name = info.filename
+        if info.is_dir() or name.startswith("wheels/") or not name.startswith(root):
+            continue
+        target = os.path.abspath(os.path.join(dest, name))
+        if not target.startswith(os.path.abspath(dest) + os.sep):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with z.open(info) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, _CHUNK)
+    return os.path.join(dest, root) if root else dest
+
+
+def _lazy_imports(root: str) -> Set[str]:
+    try:
+        with open(os.path.join(root, IMPORT_INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        return {m["module"].split(".")[0] for m in index.get("modules") or [] if m.get("phase") == "lazy"}
+    except Exception:
+        return set()
+
+
+def analyze(
+    target: str,
+    entry: Optional[str] = None,
+    top: int = 20,
+    imports: bool = True,
+    python: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout: float = 300.0,
+) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    is_zip = os.path.isfile(target)
+    tmp: Optional[str] = None
+    try:
+        if is_zip:
+            try:
+                z = zipfile.ZipFile(target)
+            except Exception as e:
+                return {"status": "ERROR", "message": f"无法打开算法包: {e}"}
+            with z:
+                members = _zip_members(z)
+                wheels = _wheels(members, z.open)
+                prefix = _zip_root(z)
+                root = None
+                if imports and prefix is not None:
+                    tmp = tempfile.mkdtemp(prefix="procvision-analyze-")
+                    root = _extract_for_imports(z, prefix, tmp)
+        elif os.path.isdir(target):
+            members = _project_members(target)
+            base = os.path.abspath(target)
+            wheels = _wheels(members, lambda p: open(os.path.join(base, p), "rb"))
+            root = base
+            prefix = ""
+        else:
+            return {"status": "ERROR", "message": f"路径不存在: {target}"}
+
+        report: Dict[str, Any] = {"status": "OK", "target": os.path.abspath(target), "kind": "zip" if is_zip else "project"}
+        report.update(_summarize(members, top, prefix or ""))
+        report["wheels"] = wheels
+        report["wheel_bytes"] = sum(w["size"] for w in wheels)
+        if imports:
+            if root is None:
+                report["imports"] = {"status": "ERROR", "message": "算法包缺少 manifest.json"}
+            else:
+                imp = measure_imports(root, entry=entry, python=python, env=env, timeout=timeout)
+                report["imports"] = imp
+                if imp.get("imported"):
+                    imp["packages"] = imp["packages"][:top]
+                    imported = set(imp["imported"]) | _lazy_imports(root)
+                    # 启动路径与导入索引中的 lazy 阶段都未导入其任何顶层模块的 wheel 视为未使用
+                    for w in wheels:
+                        w["imported"] = bool(set(w["top_level"]) & imported)
+                    unused = [w for w in wheels if w["top_level"] and not w["imported"]]
+                    report["unused_wheels"] = [{"file": w["file"], "size": w["size"], "top_level": w["top_level"]} for w in unused]
+                    report["unused_wheel_bytes"] = sum(w["size"] for w in unused)
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+    report["elapsed_s"] = round(time.perf_counter() - t0, 3)
+    return report
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from .logger import StructuredLogger
 from .diagnostics import Diagnostics
@@ -7,10 +7,27 @@ from .diagnostics import Diagnostics
 
 class BaseAlgorithm(ABC):
     def __init__(self) -> None:
-        self.logger = StructuredLogger()
+        self.logger = StructuredLogger(name=type(self).__module__)
         self.diagnostics = Diagnostics()
         self._resources_loaded: bool = False
         self._model_version: Optional[str] = None
+        self._pending_outputs: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        self._partial_sink: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    def publish_output(self, name: str, array: Any, **meta: Any) -> None:
+        # 大尺寸结果（掩码/热力图/调试图）经共享内存返回，result 帧仅携带引用
+        self.__dict__.setdefault("_pending_outputs", {})[name] = (array, meta)
+
+    def emit_partial(self, data: Dict[str, Any]) -> bool:
+        # 仅在 Runner 协商 partial:v1 且处于 execute 调用期间有效，否则返回 False
+        sink = getattr(self, "_partial_sink", None)
+        if sink is None:
+            return False
+        sink(data)
+        return True
+
+    def report_progress(self, percent: float, message: str = "") -> bool:
+        return self.emit_partial({"progress": max(0.0, min(100.0, float(percent))), "message": message})
 
     @abstractmethod
     def execute(
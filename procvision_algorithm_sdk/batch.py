@@ -0,0 +1,279 @@
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from .bench import _IMAGE_EXTS, _image_size, percentiles
+from .pool import AdapterPool
+from .shared_memory import dev_write_image_to_shared_memory, read_image_from_shared_memory, release_shared_memory
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _parse_guide_info(value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except Exception:
+            return None
+    return value
+
+
+def iter_jobs(
+    source: str,
+    guide_image: Optional[str] = None,
+    step_index: int = 1,
+    step_desc: str = "",
+    guide_info: Any = None,
+) -> Iterator[Dict[str, Any]]:
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for f in sorted(files):
+                if os.path.splitext(f)[1].lower() not in _IMAGE_EXTS:
+                    continue
+                path = os.path.join(root, f)
+                yield {
+                    "id": os.path.relpath(path, source).replace(os.sep, "/"),
+                    "cur_image": path,
+                    "guide_image": guide_image or path,
+                    "step_index": step_index,
+                    "step_desc": step_desc,
+                    "guide_info": guide_info if guide_info is not None else [],
+                }
+        return
+    base = os.path.dirname(os.path.abspath(source))
+    ext = os.path.splitext(source)[1].lower()
+    with open(source, "r", encoding="utf-8-sig", newline="") as f:
+        if ext == ".csv":
+            rows: Iterator[Dict[str, Any]] = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for n, row in enumerate(rows, 1):
+            cur = str(row.get("cur_image") or row.get("image") or "")
+            if not cur:
+                continue
+            guide = str(row.get("guide_image") or guide_image or cur)
+            gi = _parse_guide_info(row.get("guide_info"))
+            sidx = row.get("step_index")
+            yield {
+                "id": str(row.get("id") or f"{n}:{cur}"),
+                "cur_image": cur if os.path.isabs(cur) else os.path.join(base, cur),
+                "guide_image": guide if os.path.isabs(guide) else os.path.join(base, guide),
+                "step_index": int(sidx) if sidx not in (None, "") else step_index,
+                "step_desc": str(row.get("step_desc") if row.get("step_desc") not in (None, "") else step_desc),
+                "guide_info": gi if gi is not None else (guide_info if guide_info is not None else []),
+            }
+
+
+def _completed_ids(output: str) -> Set[str]:
+    done: Set[str] = set()
+    if not os.path.isfile(output):
+        return done
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except Exception:
+                # 中断时可能残留半行，忽略后该任务会被重新执行
+                continue
+            if isinstance(rec, dict) and rec.get("id") is not None:
+                done.add(str(rec["id"]))
+    return done
+
+
+def _record(job: Dict[str, Any], exe: Dict[str, Any], latency_ms: float) -> Dict[str, Any]:
+    data = exe.get("data") or {}
+    rec: Dict[str, Any] = {
+        "id": job["id"],
+        "cur_image": job["cur_image"],
+        "guide_image": job["guide_image"],
+        "step_index": job["step_index"],
+        "status": exe.get("status"),
+        "result_status": data.get("result_status") if exe.get("status") == "OK" else None,
+        "latency_ms": round(latency_ms, 3),
+    }
+    if exe.get("status") == "OK":
+        rec["data"] = data
+    else:
+        rec["message"] = exe.get("message")
+        rec["error_code"] = exe.get("error_code")
+    return rec
+
+
+def _init_inprocess_worker(project: str, entry: Optional[str]) -> None:
+    from .cli import _import_entry, _load_manifest
+
+    ep = entry or _load_manifest(os.path.join(project, "manifest.json"))["entry_point"]
+    _WORKER["alg"] = _import_entry(ep, os.path.abspath(project))()
+
+
+def _stage_images(job: Dict[str, Any]) -> Any:
+    sid = f"dev-shm:batch-{os.getpid()}-{threading.get_ident()}-{time.time_ns()}"
+    ids = {"cur": f"{sid}:cur", "guide": f"{sid}:guide"}
+    metas: Dict[str, Dict[str, Any]] = {}
+    try:
+        for key, path in (("cur", job["cur_image"]), ("guide", job["guide_image"])):
+            with open(path, "rb") as f:
+                dev_write_image_to_shared_memory(ids[key], f.read())
+            w, h = _image_size(path)
+            metas[key] = {"width": int(w), "height": int(h), "timestamp_ms": int(time.time() * 1000), "camera_id": "cam-batch", "color_space": "RGB"}
+    except Exception:
+        _release(ids)
+        raise
+    return ids, metas
+
+
+def _release(ids: Dict[str, str]) -> None:
+    for i in ids.values():
+        try:
+            release_shared_memory(i)
+        except Exception:
+            pass
+
+
+def _run_inprocess(job: Dict[str, Any]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    try:
+        ids, metas = _stage_images(job)
+    except Exception as e:
+        return _record(job, {"status": "ERROR", "message": f"图片读取失败: {e}", "error_code": "1002"}, (time.perf_counter() - t0) * 1000.0)
+    try:
+        # 与适配器相同的共享内存解码路径，保证两种模式结果一致
+        cur = read_image_from_shared_memory(ids["cur"], metas["cur"])
+        guide = read_image_from_shared_memory(ids["guide"], metas["guide"])
+        exe = _WORKER["alg"].execute(job["step_index"], job["step_desc"], cur, guide, job["guide_info"])
+        if not isinstance(exe, dict):
+            exe = {"status": "ERROR", "message": "invalid execute result", "error_code": "1009"}
+    except Exception as e:
+        exe = {"status": "ERROR", "message": str(e), "error_code": "1009"}
+    finally:
+        _release(ids)
+    return _record(job, exe, (time.perf_counter() - t0) * 1000.0)
+
+
+def _run_adapter(pool: AdapterPool, name: str, job: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    try:
+        ids, metas = _stage_images(job)
+    except Exception as e:
+        return _record(job, {"status": "ERROR", "message": f"图片读取失败: {e}", "error_code": "1002"}, (time.perf_counter() - t0) * 1000.0)
+    data = {
+        "step_index": job["step_index"],
+        "step_desc": job["step_desc"],
+        "guide_info": job["guide_info"],
+        "cur_image_shm_id": ids["cur"],
+        "cur_image_meta": metas["cur"],
+        "guide_image_shm_id": ids["guide"],
+        "guide_image_meta": metas["guide"],
+    }
+    try:
+        frame = pool.call(name, data, timeout=timeout)
+    finally:
+        _release(ids)
+    if frame.get("type") == "result":
+        exe = {"status": frame.get("status"), "message": frame.get("message"), "data": frame.get("data", {})}
+    else:
+        exe = {"status": "ERROR", "message": frame.get("message") or "execute failed", "error_code": frame.get("error_code") or "1000"}
+    return _record(job, exe, (time.perf_counter() - t0) * 1000.0)
+
+
+def run_batch(
+    project: str,
+    source: str,
+    output: str,
+    workers: int = 1,
+    in_process: bool = False,
+    guide_image: Optional[str] = None,
+    step_index: int = 1,
+    step_desc: str = "",
+    guide_info: Any = None,
+    entry: Optional[str] = None,
+    timeout: Optional[float] = None,
+    resume: bool = True,
+    env: Optional[Dict[str, str]] = None,
+    on_record: Any = None,
+) -> Dict[str, Any]:
+    workers = max(1, int(workers))
+    done = _completed_ids(output) if resume else set()
+    counts = {"OK": 0, "NG": 0, "ERROR": 0}
+    latencies: List[float] = []
+    pool: Optional[AdapterPool] = None
+    name = ""
+    if in_process:
+        executor: Any = ProcessPoolExecutor(max_workers=workers, initializer=_init_inprocess_worker, initargs=(project, entry))
+    else:
+        pool = AdapterPool(health_interval_s=0)
+        try:
+            name = pool.add(project, replicas=workers, entry=entry, call_timeout_s=timeout, env=env)
+        except Exception as e:
+            pool.close(drain_timeout=0)
+            return {"status": "ERROR", "message": f"adapter start failed: {e}"}
+        executor = ThreadPoolExecutor(max_workers=workers)
+    skipped = 0
+    t0 = time.perf_counter()
+    out = open(output, "a" if resume else "w", encoding="utf-8")
+
+    def _collect(fut: Future) -> None:
+        try:
+            rec = fut.result()
+        except Exception as e:
+            rec = {"id": inflight.pop(fut)["id"], "status": "ERROR", "message": str(e), "error_code": "1000"}
+        else:
+            inflight.pop(fut, None)
+        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        # 逐行落盘，中断后可按 id 续跑
+        out.flush()
+        if rec.get("status") == "OK":
+            counts["NG" if rec.get("result_status") == "NG" else "OK"] += 1
+        else:
+            counts["ERROR"] += 1
+        if isinstance(rec.get("latency_ms"), (int, float)):
+            latencies.append(float(rec["latency_ms"]))
+        if on_record is not None:
+            on_record(rec)
+
+    inflight: Dict[Future, Dict[str, Any]] = {}
+    try:
+        for job in iter_jobs(source, guide_image, step_index, step_desc, guide_info):
+            if job["id"] in done:
+                skipped += 1
+                continue
+            # 有界提交窗口：大数据集下不一次性排入全部任务
+            while len(inflight) >= workers * 2:
+                finished, _ = wait(list(inflight), return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    _collect(fut)
+            if in_process:
+                fut = executor.submit(_run_inprocess, job)
+            else:
+                fut = executor.submit(_run_adapter, pool, name, job, timeout)
+            inflight[fut] = job
+        while inflight:
+            finished, _ = wait(list(inflight), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                _collect(fut)
+    finally:
+        executor.shutdown(wait=True)
+        out.close()
+        if pool is not None:
+            pool.close(drain_timeout=5.0)
+    wall_s = time.perf_counter() - t0
+    processed = counts["OK"] + counts["NG"] + counts["ERROR"]
+    return {
+        "status": "OK" if counts["ERROR"] == 0 else "ERROR",
+        "output": os.path.abspath(output),
+        "mode": "in-process" if in_process else "adapter",
+        "workers": workers,
+        "processed": processed,
+        "skipped": skipped,
+        "counts": counts,
+        "wall_s": round(wall_s, 3),
+        "throughput_per_s": round(processed / wall_s, 3) if wall_s > 0 else 0.0,
+        "latency": percentiles(latencies),
+    }
@@ -0,0 +1,231 @@
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .client import AdapterClient
+from .pool import AdapterPool
+from .shared_memory import dev_write_image_to_shared_memory, release_shared_memory, write_image_array_to_shared_memory
+from .stats import LatencyHistogram
+
+_IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"}
+
+
+def percentiles(samples: List[float]) -> Dict[str, Any]:
+    if not samples:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "min_ms": 0.0}
+    s = sorted(samples)
+    n = len(s)
+
+    def _q(q: float) -> float:
+        # 最近秩法，样本量小时不插值，避免报告不存在的延迟
+        return round(s[min(n - 1, max(0, int(math.ceil(q / 100.0 * n)) - 1))], 3)
+
+    return {
+        "count": n,
+        "mean_ms": round(sum(s) / n, 3),
+        "p50_ms": _q(50),
+        "p90_ms": _q(90),
+        "p99_ms": _q(99),
+        "max_ms": round(s[-1], 3),
+        "min_ms": round(s[0], 3),
+    }
+
+
+def _image_size(path: str) -> Any:
+    try:
+        import PIL.Image as Image  # type: ignore
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return (640, 480)
+
+
+def prepare_images(tag: str, images: Optional[str], width: int, height: int, count: int = 1) -> List[Dict[str, Any]]:
+    pairs: List[Dict[str, Any]] = []
+    files: List[str] = []
+    if images and os.path.isdir(images):
+        files = sorted(os.path.join(images, f) for f in os.listdir(images) if os.path.splitext(f)[1].lower() in _IMAGE_EXTS)
+    elif images and os.path.isfile(images):
+        files = [images]
+    ts = int(time.time() * 1000)
+    if files:
+        for i, path in enumerate(files):
+            with open(path, "rb") as f:
+                buf = f.read()
+            w, h = _image_size(path)
+            shm_id = f"dev-shm:{tag}:{i}"
+            dev_write_image_to_shared_memory(shm_id, buf)
+            meta = {"width": int(w), "height": int(h), "timestamp_ms": ts, "camera_id": "cam-bench", "color_space": "RGB"}
+            pairs.append({"cur_image_shm_id": shm_id, "cur_image_meta": meta, "guide_image_shm_id": shm_id, "guide_image_meta": meta, "source": path})
+        return pairs
+    rng = np.random.default_rng(0)
+    for i in range(max(1, count)):
+        shm_id = f"dev-shm:{tag}:synthetic-{i}"
+        write_image_array_to_shared_memory(shm_id, rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8))
+        meta = {"width": int(width), "height": int(height), "timestamp_ms": ts, "camera_id": "cam-bench", "color_space": "RGB"}
+        pairs.append({"cur_image_shm_id": shm_id, "cur_image_meta": meta, "guide_image_shm_id": shm_id, "guide_image_meta": meta, "source": "synthetic"})
+    return pairs
+
+
+def release_images(pairs: List[Dict[str, Any]]) -> None:
+    for shm_id in {p["cur_image_shm_id"] for p in pairs} | {p["guide_image_shm_id"] for p in pairs}:
+        try:
+            release_shared_memory(shm_id)
+        except Exception:
+            pass
+
+
+def _resources(frame: Dict[str, Any]) -> Dict[str, Any]:
+    return ((frame or {}).get("data") or {}).get("resources") or {}
+
+
+def bench(
+    project: str,
+    entry: Optional[str] = None,
+    calls: int = 100,
+    warmup: int = 10,
+    concurrency: int = 1,
+    replicas: int = 1,
+    rate: Optional[float] = None,
+    images: Optional[str] = None,
+    width: int = 640,
+    height: int = 480,
+    step_index: int = 1,
+    step_desc: str = "bench",
+    guide_info: Any = None,
+    timeout: Optional[float] = None,
+    adapter_args: Optional[List[str]] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    tag = f"bench-{int(time.time() * 1000)}"
+    pairs = prepare_images(tag, images, width, height)
+    client_kwargs: Dict[str, Any] = {"entry": entry, "capabilities": ["timing:v1"], "call_timeout_s": timeout, "adapter_args": adapter_args, "env": env}
+    pool = AdapterPool(health_interval_s=0)
+    t_start = time.perf_counter()
+    try:
+        name = pool.add(project, replicas=max(1, replicas), name="bench", **client_kwargs)
+    except Exception as e:
+        pool.close(drain_timeout=0)
+        release_images(pairs)
+        return {"status": "ERROR", "message": f"adapter start failed: {e}"}
+    startup_ms = round((time.perf_counter() - t_start) * 1000.0, 3)
+    clients: List[AdapterClient] = pool.clients(name)
+    # hello 在导入入口之前发出；首个 stats 响应排在入口导入与实例化之后，即“可接收检测”的时刻
+    boot = [((c.stats(timeout=300.0).get("data") or {}).get("startup") or {}) for c in clients]
+    ready_ms = round((time.perf_counter() - t_start) * 1000.0, 3)
+
+    def _data(i: int) -> Dict[str, Any]:
+        p = pairs[i % len(pairs)]
+        return {
+            "step_index": step_index,
+            "step_desc": step_desc,
+            "guide_info": guide_info if guide_info is not None else [],
+            "cur_image_shm_id": p["cur_image_shm_id"],
+            "cur_image_meta": p["cur_image_meta"],
+            "guide_image_shm_id": p["guide_image_shm_id"],
+            "guide_image_meta": p["guide_image_meta"],
+        }
+
+    first_call_ms: Optional[float] = None
+    try:
+        for i in range(max(0, warmup)):
+            t0 = time.perf_counter()
+            pool.call(name, _data(i), timeout=timeout)
+            if first_call_ms is None:
+                first_call_ms = round((time.perf_counter() - t0) * 1000.0, 3)
+        before = [_resources(c.stats()) for c in clients]
+
+        latencies: List[float] = []
+        stages: Dict[str, LatencyHistogram] = {}
+        outcomes: Dict[str, int] = {"OK": 0, "NG": 0, "ERROR": 0}
+        errors: Dict[str, int] = {}
+        lock = threading.Lock()
+        counter = [0]
+        t_bench = time.perf_counter()
+
+        def _worker() -> None:
+            while True:
+                with lock:
+                    i = counter[0]
+                    if i >= calls:
+                        return
+                    counter[0] += 1
+                scheduled = t_bench + i / rate if rate else None
+                if scheduled is not None:
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                t0 = scheduled if scheduled is not None else time.perf_counter()
+                frame = pool.call(name, _data(i), timeout=timeout)
+                # 固定速率模式从计划发送时刻起算，避免协调遗漏（coordinated omission）低估尾延迟
+                ms = (time.perf_counter() - t0) * 1000.0
+                with lock:
+                    latencies.append(ms)
+                    if frame.get("type") == "result" and frame.get("status") == "OK":
+                        rs = (frame.get("data") or {}).get("result_status")
+                        outcomes["NG" if rs == "NG" else "OK"] += 1
+                    else:
+                        outcomes["ERROR"] += 1
+                        code = str(frame.get("error_code") or "execute_error")
+                        errors[code] = errors.get(code, 0) + 1
+                    for k, v in (frame.get("timing") or {}).items():
+                        if k.endswith("_ms") and k != "prev_write_ms" and isinstance(v, (int, float)):
+                            stages.setdefault(k[:-3], LatencyHistogram()).record(float(v))
+
+        threads = [threading.Thread(target=_worker, daemon=True) for _ in range(max(1, concurrency))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall_s = time.perf_counter() - t_bench
+        after = [_resources(c.stats()) for c in clients]
+    finally:
+        pool.close(drain_timeout=5.0)
+        release_images(pairs)
+
+    def _sum(items: List[Dict[str, Any]], key: str) -> Optional[float]:
+        vals = [it.get(key) for it in items]
+        if not vals or any(v is None for v in vals):
+            return None
+        return float(sum(vals))
+
+    rss_before = _sum(before, "rss_bytes")
+    rss_after = _sum(after, "rss_bytes")
+    cpu_before = (_sum(before, "cpu_user_s") or 0.0) + (_sum(before, "cpu_system_s") or 0.0)
+    cpu_after = (_sum(after, "cpu_user_s") or 0.0) + (_sum(after, "cpu_system_s") or 0.0)
+    cpu_s = round(cpu_after - cpu_before, 3)
+    return {
+        "status": "OK" if outcomes["ERROR"] == 0 else "ERROR",
+        "config": {
+            "project": os.path.abspath(project),
+            "calls": calls,
+            "warmup": warmup,
+            "concurrency": concurrency,
+            "replicas": replicas,
+            "rate": rate,
+            "images": images or f"synthetic {width}x{height}",
+        },
+        "startup_ms": startup_ms,
+        "ready_ms": ready_ms,
+        "import_ms": max((b.get("import_ms") or 0.0 for b in boot), default=None),
+        "preload_ms": max((b.get("preload_ms") or 0.0 for b in boot), default=None),
+        "first_call_ms": first_call_ms,
+        "wall_s": round(wall_s, 3),
+        "throughput_per_s": round(len(latencies) / wall_s, 3) if wall_s > 0 else 0.0,
+        "latency": percentiles(latencies),
+        "stages": {k: h.snapshot() for k, h in stages.items()},
+        "outcomes": outcomes,
+        "errors_by_code": errors,
+        "resources": {
+            "rss_before_bytes": rss_before,
+            "rss_after_bytes": rss_after,
+            "rss_growth_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+            "peak_rss_bytes": _sum(after, "peak_rss_bytes"),
+            "cpu_s": cpu_s,
+            "cpu_util": round(cpu_s / wall_s, 3) if wall_s > 0 else None,
+        },
+    }
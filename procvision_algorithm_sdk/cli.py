@@ -7,14 +7,29 @@ import time
 import zipfile
 import subprocess
 import shutil
-import uuid
-import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import numpy as np
 
+from .analyze import analyze
 from .base import BaseAlgorithm
+from .batch import run_batch
+from .bench import bench, prepare_images, release_images
+from .client import AdapterClient
+from .deploy import deploy_package
+from .imports import IMPORT_INDEX_FILE, build_import_index
+from .imports import compile_bytecode as compile_bytecode_members
+from .packaging import CHECKSUMS_FILE, build_zip
+from .perf_validate import manifest_perf_checks
+from .profiling import CPU_MODES, ExecuteProfiler
+from .regression import compare as compare_baseline
+from .regression import default_scenario_name, load_baseline, parse_thresholds, rerun_baseline, run_scenario, save_baseline
+from .replay import DEFAULT_IGNORE, replay
+from .runner import load_scenario, run_scenario as run_runner_scenario
+from .soak import soak, write_samples_csv
+from .validate_many import discover_projects, validate_many
+from .wheel_cache import fetch_wheels
 from .shared_memory import dev_write_image_to_shared_memory
 
 
@@ -119,6 +134,20 @@ def validate(project: Optional[str], manifest: Optional[str], zip_path: Optional
     return {"summary": {"status": status, "passed": passed, "failed": failed}, "checks": checks}
 
 
+def _print_validate_many_human(report: Dict[str, Any]) -> None:
+    s = report.get("summary", {})
+    print(
+        f"批量校验: {s.get('status')} | 项目: {s.get('projects')} | 通过: {s.get('passed')} | 失败: {s.get('failed')}"
+        f" | 并行 {s.get('workers')} | 耗时 {s.get('wall_s')}s（串行累计 {s.get('serial_s')}s，{s.get('speedup')}x）"
+    )
+    for r in report.get("projects", []):
+        mark = "✅" if r.get("status") == "PASS" else "❌"
+        print(f"{mark} {r.get('project')} | {round(r.get('wall_ms', 0.0) / 1000.0, 2)}s")
+        for c in r.get("checks", []):
+            if c.get("result") == "FAIL":
+                print(f"    ❌ {c.get('name')}: {c.get('message')}")
+
+
 def _print_validate_human(report: Dict[str, Any]) -> None:
     summary = report.get("summary", {})
     checks = report.get("checks", [])
@@ -217,6 +246,14 @@ def package(
     python_runtime: Optional[str],
     runtime_python_version: Optional[str],
     runtime_abi: Optional[str],
+    incremental: bool = True,
+    jobs: Optional[int] = None,
+    wheel_cache: Optional[str] = None,
+    offline: bool = False,
+    find_links: Optional[str] = None,
+    compile_bytecode: bool = False,
+    import_index: bool = False,
+    target_python: Optional[str] = None,
 ) -> Dict[str, Any]:
     manifest_path = os.path.join(project, "manifest.json")
     mf = _load_manifest(manifest_path)
@@ -265,134 +302,162 @@ def package(
     wheels_dir = os.path.join(project, "wheels")
     os.makedirs(wheels_dir, exist_ok=True)
     if not skip_download:
-        cmd = [
-            sys.executable,
-            "-m",
-            "pip",
-            "download",
-            "-r",
-            req_path,
-            "-d",
-            wheels_dir,
-        ]
         wp = wheels_platform or cfg.get("wheels_platform") or "win_amd64"
         pv = python_version or cfg.get("python_version") or "3.10"
         impl = implementation or cfg.get("implementation") or "cp"
         ab = abi or cfg.get("abi") or "cp310"
-        cmd += ["--platform", wp, "--python-version", pv, "--implementation", impl, "--abi", ab]
-        cmd += ["--only-binary=:all:"]
         torch_url = None
-        if _requirements_has_torch(req_path):
+        if not offline and _requirements_has_torch(req_path):
             torch_url = _detect_torch_cuda_index_url()
-        if torch_url:
-            cmd += ["--extra-index-url", torch_url]
-        res = subprocess.run(cmd, capture_output=True, text=True)
-        if res.returncode != 0:
-            output = (res.stderr or "") + ("\n" + res.stdout if res.stdout else "")
+        try:
+            fetched = fetch_wheels(req_path, wheels_dir, wp, pv, impl, ab, cache_dir=wheel_cache, offline=offline, find_links=find_links, extra_index_url=torch_url, jobs=jobs)
+        except Exception as e:
+            return {"status": "ERROR", "message": f"wheels 获取失败: {e}"}
+        if fetched["status"] != "OK":
+            output = fetched.get("message") or ""
             hint = ""
-            if "No matching distribution found" in output:
+            if "No matching distribution found" in output or offline:
                 hint = "\n提示: 请确保 requirements 版本在目标环境 (python=" + pv + ", abi=" + ab + ") 有可用的 wheel；建议在目标 Python 版本的虚拟环境中执行 pip freeze 生成 requirements.txt。"
             return {"status": "ERROR", "message": (output.strip() or "pip download 失败") + hint}
     base = os.path.abspath(project)
     zip_path = os.path.abspath(zip_name)
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as z:
-        for root, dirs, files in os.walk(base):
-            rel_root = os.path.relpath(root, base)
-            if rel_root.startswith(".venv"):
-                continue
-            if rel_root.startswith("wheels"):
+    cache_root = os.path.join(base, ".procvision_cache")
+    members: List[Any] = []
+    for root, dirs, files in os.walk(base):
+        rel_root = os.path.relpath(root, base)
+        if rel_root == ".":
+            # 顶层剪枝，不再遍历 .venv 等大目录
+            dirs[:] = [d for d in dirs if not d.startswith((".venv", "wheels", ".procvision_cache"))]
+        for f in files:
+            p = os.path.join(root, f)
+            if os.path.abspath(p) in (zip_path, zip_path + ".tmp"):
                 continue
-            for f in files:
-                p = os.path.join(root, f)
-                arc = os.path.join(os.path.basename(base), rel_root, f)
-                z.write(p, arcname=arc)
-        for root, dirs, files in os.walk(wheels_dir):
-            for f in files:
-                p = os.path.join(root, f)
-                rel = os.path.relpath(p, base)
-                z.write(p, arcname=rel)
-        # 运行时参数默认化与自动发现
-        def _discover_python_runtime_dir(project_dir: str, cfg_obj: Dict[str, Any], explicit: Optional[str]) -> Optional[str]:
-            if explicit and os.path.isdir(explicit):
-                return explicit
-            env_dir = os.environ.get("PROC_PYTHON_RUNTIME")
-            if env_dir and os.path.isdir(env_dir):
-                return env_dir
-            cfg_dir = cfg_obj.get("python_runtime")
-            if cfg_dir and os.path.isdir(cfg_dir):
-                return cfg_dir
-            candidates: List[str] = []
-            # common relative locations
-            for rel in ["python_runtime", "runtime/python", "runtime/python_runtime", "py_runtime", "python"]:
-                p = os.path.join(project_dir, rel)
+            arc = os.path.join(os.path.basename(base), rel_root, f)
+            members.append((p, arc))
+    for root, dirs, files in os.walk(wheels_dir):
+        for f in files:
+            p = os.path.join(root, f)
+            rel = os.path.relpath(p, base)
+            members.append((p, rel))
+    # 运行时参数默认化与自动发现
+    def _discover_python_runtime_dir(project_dir: str, cfg_obj: Dict[str, Any], explicit: Optional[str]) -> Optional[str]:
+        if explicit and os.path.isdir(explicit):
+            return explicit
+        env_dir = os.environ.get("PROC_PYTHON_RUNTIME")
+        if env_dir and os.path.isdir(env_dir):
+            return env_dir
+        cfg_dir = cfg_obj.get("python_runtime")
+        if cfg_dir and os.path.isdir(cfg_dir):
+            return cfg_dir
+        candidates: List[str] = []
+        # common relative locations
+        for rel in ["python_runtime", "runtime/python", "runtime/python_runtime", "py_runtime", "python"]:
+            p = os.path.join(project_dir, rel)
+            if os.path.isdir(p):
+                candidates.append(p)
+        # also check in parent directory (workspace-level .venv or runtime)
+        parent_dir = os.path.dirname(project_dir)
+        if parent_dir and os.path.isdir(parent_dir):
+            for rel in [".venv", "python_runtime", "runtime/python"]:
+                p = os.path.join(parent_dir, rel)
                 if os.path.isdir(p):
                     candidates.append(p)
-            # also check in parent directory (workspace-level .venv or runtime)
-            parent_dir = os.path.dirname(project_dir)
-            if parent_dir and os.path.isdir(parent_dir):
-                for rel in [".venv", "python_runtime", "runtime/python"]:
-                    p = os.path.join(parent_dir, rel)
-                    if os.path.isdir(p):
+        # scan project subdirs for python.exe (Windows embeddable)
+        for root, dirs, files in os.walk(project_dir):
+            rel_root = os.path.relpath(root, project_dir)
+            if "python.exe" in files:
+                # prefer venv root when python.exe is under .venv\Scripts
+                if os.path.basename(root).lower() == "scripts" and ".venv" in root.replace("/", "\\"):
+                    venv_root = os.path.dirname(root)
+                    candidates.append(venv_root)
+                else:
+                    candidates.append(root)
+        # scan parent top-level dirs for python.exe (avoid deep recursion for performance)
+        try:
+            for entry in os.listdir(parent_dir):
+                p = os.path.join(parent_dir, entry)
+                if not os.path.isdir(p):
+                    continue
+                # common venv or runtime locations
+                if os.path.isfile(os.path.join(p, "python.exe")) or os.path.isfile(os.path.join(p, "Scripts", "python.exe")):
+                    # .venv root preferred
+                    if os.path.basename(p).lower() == ".venv":
                         candidates.append(p)
-            # scan project subdirs for python.exe (Windows embeddable)
-            for root, dirs, files in os.walk(project_dir):
-                rel_root = os.path.relpath(root, project_dir)
-                if "python.exe" in files:
-                    # prefer venv root when python.exe is under .venv\Scripts
-                    if os.path.basename(root).lower() == "scripts" and ".venv" in root.replace("/", "\\"):
-                        venv_root = os.path.dirname(root)
-                        candidates.append(venv_root)
                     else:
-                        candidates.append(root)
-            # scan parent top-level dirs for python.exe (avoid deep recursion for performance)
-            try:
-                for entry in os.listdir(parent_dir):
-                    p = os.path.join(parent_dir, entry)
-                    if not os.path.isdir(p):
-                        continue
-                    # common venv or runtime locations
-                    if os.path.isfile(os.path.join(p, "python.exe")) or os.path.isfile(os.path.join(p, "Scripts", "python.exe")):
-                        # .venv root preferred
-                        if os.path.basename(p).lower() == ".venv":
-                            candidates.append(p)
-                        else:
-                            candidates.append(p)
-            except Exception:
-                pass
-            for c in candidates:
-                if (
-                    os.path.isfile(os.path.join(c, "python.exe"))  # embeddable/runtime root (Windows)
-                    or os.path.isfile(os.path.join(c, "Scripts", "python.exe"))  # venv (Windows)
-                    or os.path.isfile(os.path.join(c, "bin", "python"))  # venv (Linux/Mac)
-                ):
-                    return c
-            return None
+                        candidates.append(p)
+        except Exception:
+            pass
+        for c in candidates:
+            if (
+                os.path.isfile(os.path.join(c, "python.exe"))  # embeddable/runtime root (Windows)
+                or os.path.isfile(os.path.join(c, "Scripts", "python.exe"))  # venv (Windows)
+                or os.path.isfile(os.path.join(c, "bin", "python"))  # venv (Linux/Mac)
+            ):
+                return c
+        return None
 
-        runtime_dir = _discover_python_runtime_dir(base, cfg, python_runtime)
-        runtime_pyver = runtime_python_version or cfg.get("python_version") or python_version or f"{sys.version_info.major}.{sys.version_info.minor}"
-        runtime_pyabi = runtime_abi or cfg.get("abi") or abi or f"cp{sys.version_info.major}{sys.version_info.minor}"
-        bootstrap = {
-            "has_embedded_python": bool(embed_python and runtime_dir),
-            "python_version": runtime_pyver,
-            "abi": runtime_pyabi,
-            "implementation": implementation or "",
-        }
-        z.writestr(os.path.join(os.path.basename(base), "deploy_bootstrap.json"), json.dumps(bootstrap, ensure_ascii=False, indent=2))
-        if embed_python:
-            if not runtime_dir:
-                return {
-                    "status": "ERROR",
-                    "message": "未找到 Python 运行时目录。建议：在当前项目及子目录放置包含 python.exe 的运行时目录，或使用 --python-runtime 指定，或设置环境变量 PROC_PYTHON_RUNTIME，或在 .procvision_env.json 配置 python_runtime",
-                }
-            if not os.path.isdir(runtime_dir):
-                return {"status": "ERROR", "message": f"python_runtime 目录不存在: {runtime_dir}"}
-            for root, dirs, files in os.walk(runtime_dir):
-                rel_root = os.path.relpath(root, runtime_dir)
-                for f in files:
-                    p = os.path.join(root, f)
-                    arc = os.path.join(os.path.basename(base), "python_runtime", rel_root, f) if rel_root != "." else os.path.join(os.path.basename(base), "python_runtime", f)
-                    z.write(p, arcname=arc)
-    return {"status": "OK", "zip": zip_path}
+    runtime_dir = _discover_python_runtime_dir(base, cfg, python_runtime)
+    runtime_pyver = runtime_python_version or cfg.get("python_version") or python_version or f"{sys.version_info.major}.{sys.version_info.minor}"
+    runtime_pyabi = runtime_abi or cfg.get("abi") or abi or f"cp{sys.version_info.major}{sys.version_info.minor}"
+    bootstrap = {
+        "has_embedded_python": bool(embed_python and runtime_dir),
+        "python_version": runtime_pyver,
+        "abi": runtime_pyabi,
+        "implementation": implementation or "",
+    }
+    if embed_python:
+        if not runtime_dir:
+            return {
+                "status": "ERROR",
+                "message": "未找到 Python 运行时目录。建议：在当前项目及子目录放置包含 python.exe 的运行时目录，或使用 --python-runtime 指定，或设置环境变量 PROC_PYTHON_RUNTIME，或在 .procvision_env.json 配置 python_runtime",
+            }
+        if not os.path.isdir(runtime_dir):
+            return {"status": "ERROR", "message": f"python_runtime 目录不存在: {runtime_dir}"}
+        for root, dirs, files in os.walk(runtime_dir):
+            rel_root = os.path.relpath(root, runtime_dir)
+            for f in files:
+                p = os.path.join(root, f)
+                arc = os.path.join(os.path.basename(base), "python_runtime", rel_root, f) if rel_root != "." else os.path.join(os.path.basename(base), "python_runtime", f)
+                members.append((p, arc))
+    if not incremental:
+        shutil.rmtree(os.path.join(cache_root, "package"), ignore_errors=True)
+    extra = {os.path.basename(base) + "/deploy_bootstrap.json": json.dumps(bootstrap, ensure_ascii=False, indent=2).encode("utf-8")}
+    result: Dict[str, Any] = {"status": "OK", "zip": zip_path}
+    if compile_bytecode or import_index:
+        target_ver = runtime_pyver if embed_python else (python_version or cfg.get("python_version") or runtime_pyver)
+        py = target_python or sys.executable
+        cur_ver = f"{sys.version_info.major}.{sys.version_info.minor}"
+        if not target_python and target_ver != cur_ver:
+            # pyc 与解释器版本绑定（magic number），无法跨版本生成
+            return {"status": "ERROR", "message": f"目标 Python 版本 {target_ver} 与当前解释器 {cur_ver} 不一致，请用 --target-python 指定目标版本解释器"}
+        prefix = os.path.basename(base) + os.sep
+        if compile_bytecode:
+            project_arc = [(src, arc) for src, arc in members if arc.startswith(prefix) and os.sep + "python_runtime" + os.sep not in arc]
+            # 项目自带的 __pycache__ 多为基于时间戳的旧 pyc，会与预编译结果同名冲突，一律以预编译结果为准
+            stale = {arc for src, arc in project_arc if os.sep + "__pycache__" + os.sep in arc}
+            members = [(src, arc) for src, arc in members if arc not in stale]
+            sources = [(src, arc) for src, arc in project_arc if arc.endswith(".py")]
+            bc = compile_bytecode_members(sources, os.path.join(cache_root, "bytecode"), python=py)
+            if bc.get("status") != "OK":
+                return {"status": "ERROR", "message": bc.get("message")}
+            members.extend(bc.pop("members"))
+            bc["stale_dropped"] = len(stale)
+            result["bytecode"] = bc
+        if import_index:
+            ep = mf.get("entry_point")
+            if not isinstance(ep, str) or ":" not in ep:
+                return {"status": "ERROR", "message": "生成导入索引需要 manifest.json 中的 entry_point"}
+            idx = build_import_index(base, ep, python=py)
+            if idx.pop("status") != "OK":
+                return {"status": "ERROR", "message": idx.get("message")}
+            extra[os.path.basename(base) + "/" + IMPORT_INDEX_FILE] = json.dumps(idx, ensure_ascii=False, indent=2).encode("utf-8")
+            result["import_index"] = {"modules": len(idx["modules"]), "startup_ms": idx["startup_ms"], "lazy_ms": idx["lazy_ms"]}
+    try:
+        build = build_zip(zip_path, members, os.path.join(cache_root, "package"), extra=extra, workers=jobs, checksums=os.path.basename(base) + "/" + CHECKSUMS_FILE)
+    except Exception as e:
+        return {"status": "ERROR", "message": f"写入 zip 失败: {e}"}
+    result["build"] = {k: v for k, v in build.items() if k != "members"}
+    return result
 
 
 def _sanitize_module_name(name: str) -> str:
@@ -481,58 +546,48 @@ class {class_name}(BaseAlgorithm):
     return {"status": "OK", "path": base}
 
 
-def _write_frame(fp, obj: Dict[str, Any]) -> None:
-    data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
-    ln = len(data).to_bytes(4, byteorder="big")
-    fp.write(ln + data)
-    fp.flush()
+def _print_log_line(line: bytes) -> None:
+    try:
+        s = line.decode("utf-8", errors="ignore").rstrip()
+    except Exception:
+        s = str(line)
+    if not s:
+        return
+    try:
+        obj = json.loads(s)
+        print(json.dumps(obj, ensure_ascii=False))
+    except Exception:
+        print(s)
 
 
-def _read_exact(fp, n: int) -> Optional[bytes]:
-    b = b""
-    while len(b) < n:
-        chunk = fp.read(n - len(b))
-        if not chunk:
-            return None
-        b += chunk
-    return b
+def _dev_image_meta(width: int, height: int) -> Dict[str, Any]:
+    return {"width": int(width), "height": int(height), "timestamp_ms": int(time.time() * 1000), "camera_id": "cam-dev", "color_space": "RGB"}
 
 
-def _read_frame(fp) -> Optional[Dict[str, Any]]:
-    h = _read_exact(fp, 4)
-    if h is None:
-        return None
-    ln = int.from_bytes(h, byteorder="big")
-    if ln <= 0:
-        return None
-    body = _read_exact(fp, ln)
-    if body is None:
-        return None
-    try:
-        return json.loads(body.decode("utf-8"))
-    except Exception:
-        return None
+def _dev_call_data(
+    step_index: int,
+    step_desc: str,
+    guide_info: Any,
+    cur_shm_id: str,
+    cur_meta: Dict[str, Any],
+    guide_shm_id: str,
+    guide_meta: Dict[str, Any],
+) -> Dict[str, Any]:
+    return {
+        "step_index": step_index,
+        "step_desc": step_desc or "",
+        "guide_info": guide_info if guide_info is not None else [],
+        "cur_image_shm_id": cur_shm_id,
+        "cur_image_meta": cur_meta,
+        "guide_image_shm_id": guide_shm_id,
+        "guide_image_meta": guide_meta,
+    }
 
 
-def _stderr_printer(pipe) -> None:
-    try:
-        while True:
-            line = pipe.readline()
-            if not line:
-                break
-            try:
-                s = line.decode("utf-8", errors="ignore").rstrip()
-            except Exception:
-                s = str(line)
-            if not s:
-                continue
-            try:
-                obj = json.loads(s)
-                print(json.dumps(obj, ensure_ascii=False))
-            except Exception:
-                print(s)
-    except Exception:
-        pass
+def _execute_from_frame(raw: Dict[str, Any]) -> Dict[str, Any]:
+    if raw.get("type") == "result":
+        return {"status": raw.get("status"), "message": raw.get("message"), "data": raw.get("data", {})}
+    return {"status": "ERROR", "message": raw.get("message") or "execute failed", "error_code": raw.get("error_code") or "1000"}
 
 
 def run_adapter(
@@ -550,41 +605,13 @@ def run_adapter(
         return {"execute": {"status": "ERROR", "message": "未找到 manifest.json"}}
     if not os.path.isfile(cur_image_path) or not os.path.isfile(guide_image_path):
         return {"execute": {"status": "ERROR", "message": "图片文件不存在"}}
-    with open(manifest_path, "r", encoding="utf-8") as f:
-        mf = json.load(f)
-    cmd = [sys.executable, "-m", "procvision_algorithm_sdk.adapter"]
-    if entry:
-        cmd += ["--entry", entry]
-    env = os.environ.copy()
-    env["PROC_ALGO_ROOT"] = os.path.abspath(project)
-    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=project, env=env)
-    if proc.stdout is None or proc.stdin is None:
-        return {"execute": {"status": "ERROR", "message": "子进程启动失败"}}
-    log_thread = None
-    if tail_logs and proc.stderr is not None:
-        log_thread = threading.Thread(target=_stderr_printer, args=(proc.stderr,), daemon=True)
-        log_thread.start()
-    hello = _read_frame(proc.stdout)
-    if hello is None:
-        try:
-            proc.terminate()
-        except Exception:
-            pass
-        try:
-            proc.wait(timeout=1.0)
-        except Exception:
-            pass
-        try:
-            if proc.stdin is not None:
-                proc.stdin.close()
-            if proc.stdout is not None:
-                proc.stdout.close()
-            if proc.stderr is not None:
-                proc.stderr.close()
-        except Exception:
-            pass
+    client = AdapterClient(project, entry=entry, auto_restart=False, stderr_handler=_print_log_line if tail_logs else None)
+    try:
+        client.start()
+    except Exception:
+        client.close()
         return {"execute": {"status": "ERROR", "message": "adapter hello missing"}}
-    _write_frame(proc.stdin, {"type": "hello", "runner_version": "dev", "heartbeat_interval_ms": 5000, "heartbeat_grace_ms": 2000})
+
     def _read_bytes(path: str) -> bytes:
         try:
             with open(path, "rb") as f:
@@ -609,58 +636,301 @@ def run_adapter(
     sid = f"session-{int(time.time()*1000)}"
     cur_shm_id = f"dev-shm:{sid}:cur"
     guide_shm_id = f"dev-shm:{sid}:guide"
-    cur_meta = {"width": int(cur_w), "height": int(cur_h), "timestamp_ms": int(time.time() * 1000), "camera_id": "cam-dev", "color_space": "RGB"}
-    guide_meta = {"width": int(guide_w), "height": int(guide_h), "timestamp_ms": int(time.time() * 1000), "camera_id": "cam-dev", "color_space": "RGB"}
     try:
         dev_write_image_to_shared_memory(cur_shm_id, cur_bytes)
         dev_write_image_to_shared_memory(guide_shm_id, guide_bytes)
     except Exception:
         pass
-    rid_pre = str(uuid.uuid4())
-    call_exe = {
-        "type": "call",
-        "request_id": rid_pre,
-        "data": {
-            "step_index": sidx,
-            "step_desc": step_desc or "",
-            "guide_info": guide_info if guide_info is not None else [],
-            "cur_image_shm_id": cur_shm_id,
-            "cur_image_meta": cur_meta,
-            "guide_image_shm_id": guide_shm_id,
-            "guide_image_meta": guide_meta,
-        },
-    }
-    _write_frame(proc.stdin, call_exe)
-    raw = _read_frame(proc.stdout) or {"type": "error", "status": "ERROR", "message": "execute 超时", "error_code": "1005"}
-    _write_frame(proc.stdin, {"type": "shutdown"})
-    _read_frame(proc.stdout)
     try:
-        proc.terminate()
-    except Exception:
-        pass
+        raw = client.call(_dev_call_data(sidx, step_desc, guide_info, cur_shm_id, _dev_image_meta(cur_w, cur_h), guide_shm_id, _dev_image_meta(guide_w, guide_h)))
+    finally:
+        client.close()
+    return {"execute": _execute_from_frame(raw)}
+
+
+def profile_adapter(
+    project: str,
+    output_dir: str,
+    calls: int = 20,
+    warmup: int = 2,
+    cpu: str = "cprofile",
+    memory: bool = True,
+    in_process: bool = False,
+    images: Optional[str] = None,
+    width: int = 640,
+    height: int = 480,
+    step_index: int = 1,
+    step_desc: str = "profile",
+    guide_info: Any = None,
+    entry: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    output_dir = os.path.abspath(output_dir)
+    pairs = prepare_images(f"profile-{int(time.time() * 1000)}", images, width, height)
+    total = max(0, warmup) + max(1, calls)
+    datas = [_dev_call_data(step_index, step_desc, guide_info, p["cur_image_shm_id"], p["cur_image_meta"], p["guide_image_shm_id"], p["guide_image_meta"]) for p in pairs]
     try:
-        proc.wait(timeout=1.0)
-    except Exception:
-        pass
+        if in_process:
+            ep = entry or _load_manifest(os.path.join(project, "manifest.json"))["entry_point"]
+            alg = _import_entry(ep, os.path.abspath(project))()
+            profiler = ExecuteProfiler(output_dir, calls=calls, skip=warmup, cpu=cpu, memory=memory)
+            from .shared_memory import read_image_from_shared_memory
+
+            for i in range(total):
+                d = datas[i % len(datas)]
+                cur = read_image_from_shared_memory(d["cur_image_shm_id"], d["cur_image_meta"])
+                guide = read_image_from_shared_memory(d["guide_image_shm_id"], d["guide_image_meta"])
+                with profiler.call():
+                    alg.execute(step_index, step_desc, cur, guide, d["guide_info"])
+            summary = profiler.close()
+        else:
+            # 在适配器子进程内采样，与 Runner 实际运行的路径一致
+            args = ["--profile-dir", output_dir, "--profile-calls", str(calls), "--profile-skip", str(warmup), "--profile-cpu", cpu]
+            if not memory:
+                args.append("--profile-no-memory")
+            client = AdapterClient(project, entry=entry, env=env, adapter_args=args, auto_restart=False)
+            try:
+                client.start()
+            except Exception as e:
+                client.close()
+                return {"status": "ERROR", "message": f"adapter start failed: {e}"}
+            try:
+                for i in range(total):
+                    frame = client.call(datas[i % len(datas)])
+                    if frame.get("type") != "result":
+                        return {"status": "ERROR", "message": frame.get("message") or "execute failed", "error_code": frame.get("error_code")}
+            finally:
+                client.close()
+            summary = None
+            try:
+                with open(os.path.join(output_dir, "summary.json"), "r", encoding="utf-8") as f:
+                    summary = json.load(f)
+            except Exception:
+                pass
+    finally:
+        release_images(pairs)
+    if not summary:
+        return {"status": "ERROR", "message": "profile summary not written"}
+    return {"status": "OK", "output_dir": output_dir, "summary": summary}
+
+
+def _print_profile_human(report: Dict[str, Any], top: int = 15) -> None:
+    if report.get("status") != "OK":
+        print(f"性能剖析失败: {report.get('message')}")
+        return
+    s = report.get("summary", {})
+    ex = s.get("execute_ms", {})
+    print(f"性能剖析: {s.get('calls')} 次 execute (跳过预热 {s.get('skipped')}) | CPU: {s.get('cpu_mode')} | mean {ex.get('mean')}ms | min {ex.get('min')}ms | max {ex.get('max')}ms")
+    rows = s.get("cpu_top", [])[:top]
+    if rows and "cumtime_ms" in rows[0]:
+        print(f"  {'cumtime_ms':>11} {'tottime_ms':>11} {'calls':>7}  function")
+        for r in rows:
+            print(f"  {r['cumtime_ms']:>11} {r['tottime_ms']:>11} {r['calls']:>7}  {r['function']}")
+    elif rows:
+        print(f"  {'self%':>7} {'total%':>7}  function  (samples: {s.get('samples')})")
+        for r in rows:
+            print(f"  {r['self_pct']:>7} {r['total_pct']:>7}  {r['function']}")
+    mem = s.get("memory") or {}
+    if mem:
+        print(f"内存: 单次峰值 {_fmt_bytes(mem.get('peak_per_call_bytes'))} | 平均峰值 {_fmt_bytes(mem.get('mean_peak_per_call_bytes'))} | 剖析期间留存 {_fmt_bytes(mem.get('retained_bytes'))}")
+        for r in mem.get("top", [])[:top]:
+            print(f"  {_fmt_bytes(r['size_diff_bytes']):>10} {r['count_diff']:>7}  {r['location']}")
+    for name, path in s.get("files", {}).items():
+        print(f"  {name}: {path}")
+
+
+def _print_scenario_human(name: str, scenario: Dict[str, Any]) -> None:
+    print(f"场景 {name}: {scenario.get('runs')} 轮 | 失败轮次: {scenario.get('errors')}")
+    for metric, st in scenario.get("metrics", {}).items():
+        lo, hi = st.get("ci95", [None, None])
+        print(f"  {metric:<17} mean {st.get('mean')} | stdev {st.get('stdev')} | 95% CI [{lo}, {hi}]")
+
+
+def _print_compare_human(report: Dict[str, Any]) -> None:
+    print(f"性能回归检查: {report.get('status')} | 回归项: {report.get('failed')}")
+    for c in report.get("checks", []):
+        marker = {"PASS": "✅", "FAIL": "❌"}.get(c.get("result"), "⚠️")
+        if "change_pct" in c:
+            sig = "显著" if c.get("significant") else "噪声内"
+            print(f"{marker} {c['scenario']}/{c['metric']}: {c['baseline']} -> {c['current']} ({c['change_pct']:+}%，阈值 {c['threshold_pct']}%，{sig})")
+        else:
+            print(f"{marker} {c['scenario']}/{c['metric']}: {c.get('message')}")
+
+
+def _print_replay_human(report: Dict[str, Any]) -> None:
+    if report.get("status") == "ERROR":
+        print(f"回放失败: {report.get('message')}")
+        return
+    lat = report.get("latency") or {}
+    o, r = lat.get("original") or {}, lat.get("replay") or {}
+    print(f"回放: {report.get('status')} | 模式: {report.get('mode')} | 调用: {report.get('calls')} | 一致: {report.get('matched')} | 不一致: {report.get('mismatched')} | 无原始响应: {report.get('missing_original')}")
+    print(f"延迟 p50: {o.get('p50_ms')} -> {r.get('p50_ms')} ms ({lat.get('delta_p50_ms'):+}) | p99: {o.get('p99_ms')} -> {r.get('p99_ms')} ms ({lat.get('delta_p99_ms'):+})")
+    for item in report.get("results", []):
+        if not item.get("match"):
+            print(f"❌ {item['request_id']}: {', '.join(item.get('diffs') or [])}")
+
+
+def _print_runner_human(report: Dict[str, Any]) -> None:
+    if report.get("message"):
+        print(f"模拟 Runner 失败: {report.get('message')}")
+        return
+    lat = report.get("latency") or {}
+    oc = report.get("outcomes") or {}
+    print(f"模拟 Runner: {report.get('status')} | 工位: {report.get('stations_started')} | 调用: {report.get('calls')} | 吞吐: {report.get('throughput_per_s')}/s | 耗时: {report.get('wall_s')}s")
+    print(f"延迟 p50/p99/max: {lat.get('p50_ms')}/{lat.get('p99_ms')}/{lat.get('max_ms')} ms | OK {oc.get('OK')} NG {oc.get('NG')} ERROR {oc.get('ERROR')} | 超时 {report.get('timeouts')} | 重启 {report.get('restarts')}")
+    for f in report.get("stations_failed", []):
+        print(f"❌ {f['name']}: 启动失败 {f['message']}")
+    for st in report.get("stations", []):
+        sl, hb = st.get("latency") or {}, st.get("heartbeat") or {}
+        print(
+            f"  {st['name']:<16} pid {st.get('pid')} | 调用 {st.get('calls')} | p50 {sl.get('p50_ms')} p99 {sl.get('p99_ms')} ms | 注入 p50 {(st.get('inject') or {}).get('p50_ms')} ms"
+            f" | ERROR {st['outcomes'].get('ERROR')} | 超时 {st.get('timeouts')} | 重启 {st.get('restarts')} | 心跳 {hb.get('sent')}/丢失 {hb.get('missed')}"
+        )
+
+
+def _print_analyze_human(report: Dict[str, Any]) -> None:
+    if report.get("status") != "OK":
+        print(f"分析失败: {report.get('message')}")
+        return
+    packed = f" | 压缩后 {_fmt_bytes(report['compressed_bytes'])}" if report.get("compressed_bytes") is not None else ""
+    print(f"分析: {report.get('target')} ({report.get('kind')}) | 文件 {report.get('files')} | {_fmt_bytes(report.get('bytes'))}{packed} | wheels {_fmt_bytes(report.get('wheel_bytes'))}")
+    print("最大成员:")
+    for m in report.get("largest", []):
+        print(f"  {_fmt_bytes(m['size']):>10}  {m['path']}")
+    print("按目录:")
+    for d in report.get("by_dir", []):
+        print(f"  {_fmt_bytes(d['bytes']):>10}  {d['path']} ({d['files']} 个文件)")
+    dup = report.get("duplicates") or {}
+    print(f"重复文件: {dup.get('group_count')} 组，可节省 {_fmt_bytes(dup.get('wasted_bytes'))}")
+    for g in dup.get("groups", []):
+        print(f"  {_fmt_bytes(g['size']):>10} x{g['count']}  {', '.join(g['paths'])}")
+    imp = report.get("imports")
+    if imp:
+        if imp.get("status") != "OK":
+            print(f"⚠️ 导入耗时测量失败: {imp.get('message')}")
+        if imp.get("packages"):
+            print(f"导入耗时（按顶层模块，合计 {imp.get('total_ms')}ms，启动耗时 {imp.get('wall_ms')}ms）:")
+            for r in imp["packages"]:
+                print(f"  {r['self_ms']:>10.1f}ms  {r['module']} ({r['modules']} 个模块)")
+    if "unused_wheels" in report:
+        print(f"未导入的 wheels: {len(report['unused_wheels'])} 个，{_fmt_bytes(report.get('unused_wheel_bytes'))}")
+        for w in report["unused_wheels"]:
+            print(f"  {_fmt_bytes(w['size']):>10}  {w['file']} ({', '.join(w['top_level'])})")
+
+
+def _print_deploy_human(res: Dict[str, Any]) -> None:
+    if res.get("status") != "OK":
+        print(f"部署失败: {res.get('message')}")
+        for c in (res.get("validate") or {}).get("checks", []):
+            if c.get("result") == "FAIL":
+                print(f"❌ {c.get('name')}: {c.get('message')}")
+        return
+    t = res.get("timings") or {}
+    print(f"部署成功: {res.get('path')}")
+    print(
+        f"文件 {res.get('files')}（并行解压 {res.get('parallel_members')}）| {_fmt_bytes(res.get('bytes'))} | 校验 {'sha256 通过' if res.get('verified') else '未校验（无 checksums.json）'}"
+        f" | 解压 {t.get('extract_ms')}ms | venv {t.get('venv_ms', '-')}ms | 验证 {t.get('validate_ms', '-')}ms | 总计 {t.get('total_ms')}ms"
+    )
+    if res.get("venv"):
+        print(f"Python: {res['venv'].get('python')}")
+
+
+def perf_checks(project: str, baseline_path: str, repeat: Optional[int] = None, entry: Optional[str] = None, thresholds: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
     try:
-        if proc.stdin is not None:
-            proc.stdin.close()
-        if proc.stdout is not None:
-            proc.stdout.close()
-        if proc.stderr is not None:
-            proc.stderr.close()
-    except Exception:
-        pass
+        baseline = load_baseline(baseline_path)
+    except Exception as e:
+        return [{"name": "perf_baseline", "result": "FAIL", "message": str(e)}]
+    report = compare_baseline(baseline, rerun_baseline(project, baseline, repeat=repeat, entry=entry), thresholds)
+    checks = []
+    for c in report["checks"]:
+        if c["result"] == "SKIP":
+            continue
+        msg = f"{c['baseline']} -> {c['current']} ({c['change_pct']:+}%，阈值 {c['threshold_pct']}%)" if "change_pct" in c else c.get("message", "")
+        checks.append({"name": f"perf:{c['scenario']}:{c['metric']}", "result": c["result"], "message": msg})
+    return checks
+
+
+def _load_guide_info(raw: Optional[str]) -> Any:
+    guide_info_raw = raw or "[]"
+    if isinstance(guide_info_raw, str) and guide_info_raw.startswith("@"):
+        p = guide_info_raw[1:]
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                guide_info_raw = f.read()
+        except Exception:
+            print(f"错误: guide-info 文件读取失败: {p}")
+            sys.exit(2)
     try:
-        if log_thread is not None:
-            log_thread.join(timeout=0.5)
+        return json.loads(guide_info_raw) if guide_info_raw else []
     except Exception:
-        pass
-    if isinstance(raw, dict) and raw.get("type") == "result":
-        execute_res = {"status": raw.get("status"), "message": raw.get("message"), "data": raw.get("data", {})}
-    else:
-        execute_res = {"status": "ERROR", "message": (raw or {}).get("message") if isinstance(raw, dict) else "execute failed", "error_code": (raw or {}).get("error_code") if isinstance(raw, dict) else "1000"}
-    return {"execute": execute_res}
+        print("错误: --guide-info 必须是 JSON 字符串或 @file.json")
+        sys.exit(2)
+
+
+def _fmt_bytes(n: Any) -> str:
+    if n is None:
+        return "n/a"
+    sign = "-" if n < 0 else ""
+    n = abs(float(n))
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024.0 or unit == "GB":
+            return f"{sign}{n:.1f}{unit}"
+        n /= 1024.0
+    return f"{sign}{n:.1f}GB"
+
+
+def _print_bench_human(report: Dict[str, Any]) -> None:
+    if "latency" not in report:
+        print(f"压测失败: {report.get('message')}")
+        return
+    cfg = report.get("config", {})
+    lat = report.get("latency", {})
+    out = report.get("outcomes", {})
+    res = report.get("resources", {})
+    rate = f"{cfg.get('rate')}/s" if cfg.get("rate") else "不限"
+    print(f"压测: {cfg.get('project')} | 图像: {cfg.get('images')} | 调用: {cfg.get('calls')} (预热 {cfg.get('warmup')}) | 并发: {cfg.get('concurrency')} x 副本 {cfg.get('replicas')} | 速率: {rate}")
+    print(f"启动: hello {report.get('startup_ms')}ms | 就绪 {report.get('ready_ms')}ms（入口导入 {report.get('import_ms')}ms，预加载 {report.get('preload_ms')}ms） | 首次调用: {report.get('first_call_ms')}ms")
+    print(f"吞吐: {report.get('throughput_per_s')}/s | 耗时: {report.get('wall_s')}s | OK: {out.get('OK', 0)} | NG: {out.get('NG', 0)} | ERROR: {out.get('ERROR', 0)}")
+    print(f"延迟(ms): mean {lat.get('mean_ms')} | p50 {lat.get('p50_ms')} | p90 {lat.get('p90_ms')} | p99 {lat.get('p99_ms')} | max {lat.get('max_ms')}")
+    stages = report.get("stages", {})
+    if stages:
+        print("阶段(ms):")
+        for name, st in stages.items():
+            print(f"  {name:<16} mean {st.get('mean_ms')} | p50 {st.get('p50_ms')} | p99 {st.get('p99_ms')}")
+    print(f"资源: RSS {_fmt_bytes(res.get('rss_before_bytes'))} -> {_fmt_bytes(res.get('rss_after_bytes'))} (增长 {_fmt_bytes(res.get('rss_growth_bytes'))}) | 峰值 {_fmt_bytes(res.get('peak_rss_bytes'))} | CPU {res.get('cpu_s')}s ({res.get('cpu_util')})")
+    for code, n in report.get("errors_by_code", {}).items():
+        print(f"  错误码 {code}: {n}")
+
+
+def _print_batch_human(report: Dict[str, Any]) -> None:
+    if "counts" not in report:
+        print(f"批量运行失败: {report.get('message')}")
+        return
+    c = report.get("counts", {})
+    lat = report.get("latency", {})
+    print(f"批量运行: {report.get('mode')} x {report.get('workers')} | 处理: {report.get('processed')} | 跳过(续跑): {report.get('skipped')}")
+    print(f"OK: {c.get('OK', 0)} | NG: {c.get('NG', 0)} | ERROR: {c.get('ERROR', 0)} | 耗时: {report.get('wall_s')}s | 吞吐: {report.get('throughput_per_s')}/s")
+    print(f"延迟(ms): mean {lat.get('mean_ms')} | p50 {lat.get('p50_ms')} | p99 {lat.get('p99_ms')} | max {lat.get('max_ms')}")
+    print(f"结果: {report.get('output')}")
+
+
+def _print_soak_sample(s: Dict[str, Any]) -> None:
+    p50 = "-" if s.get("p50_ms") is None else f"{s.get('p50_ms')}ms"
+    p99 = "-" if s.get("p99_ms") is None else f"{s.get('p99_ms')}ms"
+    print(f"[{s.get('t_s'):>9}s] calls {s.get('calls')} | err {s.get('errors')} | p50 {p50} | p99 {p99} | RSS {_fmt_bytes(s.get('rss_bytes'))} | fds {s.get('open_fds')} | threads {s.get('threads')}", flush=True)
+
+
+def _print_soak_human(report: Dict[str, Any]) -> None:
+    if "trends" not in report:
+        print(f"浸泡测试失败: {report.get('message')}")
+        return
+    print(f"浸泡测试: {report.get('status')} | 调用: {report.get('calls')} | 失败: {report.get('errors')} | 实际速率: {report.get('achieved_rate')}/s | 重启: {report.get('restarts')}")
+    for key, t in report.get("trends", {}).items():
+        extra = f" | 漂移 {t.get('drift_pct')}%" if "drift_pct" in t else ""
+        print(f"  趋势 {key:<10} {t.get('first')} -> {t.get('last')} | 斜率 {t.get('per_hour')}/h | r2 {t.get('r2')}{extra}")
+    for f in report.get("findings", []):
+        print(f"❌ {f.get('message')}")
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -677,6 +947,14 @@ def main() -> None:
             "  验证项目(适配器模式+日志): procvision-cli validate ./algorithm-example --full --tail-logs\n"
             "  验证压缩包(JSON输出): procvision-cli validate --zip ./algo.zip --json\n"
             "  本地运行(适配器模式+日志): procvision-cli run ./algorithm-example --cur-image ./cur.jpg --guide-image ./guide.jpg --tail-logs --json\n"
+            "  批量运行(4 个适配器): procvision-cli batch ./algorithm-example ./images -o results.jsonl --workers 4\n"
+            "  浸泡测试(1 小时, 5 次/秒): procvision-cli soak ./algorithm-example --duration 3600 --rate 5 -o soak.json\n"
+            "  性能剖析(适配器内 cProfile+tracemalloc): procvision-cli profile ./algorithm-example -n 50 -o ./profile_out\n"
+            "  模拟 Runner(4 工位各 5 次/秒): procvision-cli runner ./algo-offline.zip --deploy-root ./deploy --stations 4 --rate 5 --duration 60\n"
+            "  回放抓包(全速): procvision-cli replay ./capture.pvcap ./algorithm-example --fast\n"
+            "  性能压测(JSON输出): procvision-cli bench ./algorithm-example --calls 200 --concurrency 2 --json\n"
+            "  体积与冷启动分析: procvision-cli analyze ./algo-v1.0.0-offline.zip --top 10\n"
+            "  部署离线包(校验+venv+验证): procvision-cli deploy ./algo-v1.0.0-offline.zip --deploy-root ./deploy\n"
             "  构建离线包(嵌入运行时): procvision-cli package ./algorithm-example --embed-python --python-runtime <path_to_embeddable> --runtime-python-version 3.10 --runtime-abi cp310\n"
         ),
     )
@@ -688,13 +966,20 @@ def main() -> None:
         description="校验 manifest/入口类/execute 返回结构；支持 --full 适配器子进程完整校验与 --tail-logs 日志输出",
         formatter_class=argparse.RawTextHelpFormatter,
     )
-    v.add_argument("project", nargs="?", default=".", help="算法项目根目录，默认当前目录")
+    v.add_argument("project", nargs="*", default=None, help="算法项目根目录，默认当前目录；可显式给多个项目，或一个包含多个项目的父目录（并行校验）")
     v.add_argument("--manifest", type=str, default=None, help="指定 manifest.json 路径（可替代 --project）")
     v.add_argument("--zip", type=str, default=None, help="离线交付 zip 包路径（检查 wheels/ 与必需文件）")
     v.add_argument("--json", action="store_true", help="以 JSON 输出结果")
     v.add_argument("--full", action="store_true", help="使用适配器子进程执行完整握手与 execute 校验")
     v.add_argument("--entry", type=str, default=None, help="显式指定入口 <module:Class>，用于 --full 模式")
     v.add_argument("--tail-logs", action="store_true", help="在 --full 模式下实时输出子进程日志")
+    v.add_argument("--perf-baseline", type=str, default=None, help="性能基线 JSON；按基线场景重新压测并检查回归（可选）")
+    v.add_argument("--perf-repeat", type=int, default=None, help="性能检查每个场景的重复轮次，默认沿用基线")
+    v.add_argument("--perf-threshold", action="append", default=None, help="--perf-baseline 的回归阈值 <metric>=<pct>，可重复，同 compare -t")
+    v.add_argument("--perf", action="store_true", help="按 manifest.json performance 段检查 p99 预算、RSS 增长、输出确定性与首次调用耗时")
+    v.add_argument("--perf-calls", type=int, default=None, help="--perf 的计时调用次数，默认 performance.calls 或 50")
+    v.add_argument("-w", "--workers", type=int, default=None, help="多项目并行校验的进程数，默认 CPU 核数")
+    v.add_argument("--project-timeout", type=float, default=None, help="多项目模式下单个项目的校验超时（秒）")
 
     r = sub.add_parser(
         "run",
@@ -715,6 +1000,176 @@ def main() -> None:
     r.add_argument("--tail-logs", action="store_true", help="在适配器模式下实时输出子进程日志")
     r.add_argument("--json", action="store_true", help="以 JSON 输出结果")
 
+    bt = sub.add_parser(
+        "batch",
+        help="批量运行目录或清单中的图片",
+        description=(
+            "从图片目录或 CSV/JSONL 清单（cur_image, guide_image, step_index, step_desc, guide_info, id）读取任务，\n"
+            "在多个适配器子进程或进程内 worker 上并行执行，逐行写入 JSONL 结果；再次运行时按 id 跳过已完成任务"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    bt.add_argument("project", type=str, help="算法项目根目录")
+    bt.add_argument("source", type=str, help="图片目录，或 .csv/.jsonl 任务清单")
+    bt.add_argument("-o", "--output", type=str, required=True, help="JSONL 结果文件（续跑时追加）")
+    bt.add_argument("-w", "--workers", type=int, default=1, help="并行 worker 数（适配器副本数或进程数），默认 1")
+    bt.add_argument("--in-process", action="store_true", help="使用进程内 worker 直接调用 execute（不经适配器协议）")
+    bt.add_argument("--guide-image", type=str, default=None, help="目录模式或清单未指定时使用的固定引导图")
+    bt.add_argument("--step", type=int, default=1, help="默认步骤索引，默认 1")
+    bt.add_argument("--step-desc", type=str, default="", help="默认步骤描述文本")
+    bt.add_argument("--guide-info", type=str, default="[]", help="默认 guide_info JSON 字符串，或 @file.json")
+    bt.add_argument("--timeout", type=float, default=None, help="单次调用超时（秒，仅适配器模式）")
+    bt.add_argument("--entry", type=str, default=None, help="显式指定入口 <module:Class>")
+    bt.add_argument("--no-resume", action="store_true", help="覆盖结果文件并重新执行全部任务")
+    bt.add_argument("--json", action="store_true", help="以 JSON 输出汇总")
+
+    b = sub.add_parser(
+        "bench",
+        help="适配器子进程性能压测",
+        description=(
+            "通过适配器子进程压测 execute：预热后执行 N 次调用，报告吞吐、延迟分位数、分阶段耗时、RSS 增长与 CPU。\n"
+            "未指定 --images 时使用合成随机图像"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    b.add_argument("project", type=str, help="算法项目根目录")
+    b.add_argument("-n", "--calls", type=int, default=100, help="计时调用次数，默认 100")
+    b.add_argument("--warmup", type=int, default=10, help="预热调用次数（不计入统计），默认 10")
+    b.add_argument("-c", "--concurrency", type=int, default=1, help="在途请求数（并发调用线程数），默认 1")
+    b.add_argument("--replicas", type=int, default=1, help="适配器进程副本数，默认 1")
+    b.add_argument("--rate", type=float, default=None, help="固定请求速率（次/秒）；延迟从计划发送时刻起算")
+    b.add_argument("--images", type=str, default=None, help="图片文件或目录（循环使用）；默认合成图像")
+    b.add_argument("--width", type=int, default=640, help="合成图像宽度，默认 640")
+    b.add_argument("--height", type=int, default=480, help="合成图像高度，默认 480")
+    b.add_argument("--step", type=int, default=1, help="步骤索引，默认 1")
+    b.add_argument("--step-desc", type=str, default="bench", help="步骤描述文本")
+    b.add_argument("--guide-info", type=str, default="[]", help="guide_info JSON 字符串，或 @file.json")
+    b.add_argument("--timeout", type=float, default=None, help="单次调用超时（秒）")
+    b.add_argument("--entry", type=str, default=None, help="显式指定入口 <module:Class>")
+    b.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    b.add_argument("-o", "--output", type=str, default=None, help="将 JSON 报告写入文件")
+    b.add_argument("--repeat", type=int, default=1, help="重复压测轮次（每轮新适配器进程），用于计算置信区间，默认 1")
+    b.add_argument("--scenario", type=str, default=None, help="基线场景名，默认按图像/并发/速率生成")
+    b.add_argument("--save-baseline", type=str, default=None, help="将本场景汇总写入（合并到）基线 JSON 文件")
+
+    cp = sub.add_parser(
+        "compare",
+        help="对比性能基线，检测回归",
+        description=(
+            "对比两个基线 JSON（bench --save-baseline 生成）；指标变差超过阈值且在重复轮次噪声之外（Welch t 检验）时判定回归。\n"
+            "默认阈值：p50_ms=10%% p99_ms=20%% throughput_per_s=10%% peak_rss_bytes=10%% ready_ms=20%%"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    cp.add_argument("baseline", type=str, help="基线 JSON")
+    cp.add_argument("current", type=str, help="当前结果 JSON")
+    cp.add_argument("-t", "--threshold", action="append", default=None, help="阈值 <metric>=<pct>，可重复，如 -t p99_ms=15")
+    cp.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+
+    pf = sub.add_parser(
+        "profile",
+        help="execute 性能剖析（CPU 与内存分配）",
+        description=(
+            "在适配器子进程内（与 Runner 相同路径）剖析 N 次 execute：CPU 使用 cProfile 或栈采样，内存分配使用 tracemalloc；\n"
+            "输出 cpu.prof / cpu.collapsed / alloc.collapsed（可用 flamegraph.pl、speedscope 生成火焰图）与 summary.json"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    pf.add_argument("project", type=str, help="算法项目根目录")
+    pf.add_argument("-n", "--calls", type=int, default=20, help="剖析的 execute 次数，默认 20")
+    pf.add_argument("--warmup", type=int, default=2, help="预热次数（不剖析），默认 2")
+    pf.add_argument("--cpu", type=str, choices=CPU_MODES, default="cprofile", help="CPU 剖析方式：cprofile（确定性）/ sample（栈采样，输出火焰图）/ none")
+    pf.add_argument("--no-memory", action="store_true", help="关闭 tracemalloc 内存分配剖析")
+    pf.add_argument("--in-process", action="store_true", help="在当前进程内剖析（不经适配器子进程）")
+    pf.add_argument("-o", "--output-dir", type=str, default="profile_out", help="输出目录，默认 ./profile_out")
+    pf.add_argument("--top", type=int, default=15, help="摘要中显示的条目数，默认 15")
+    pf.add_argument("--images", type=str, default=None, help="图片文件或目录（循环使用）；默认合成图像")
+    pf.add_argument("--width", type=int, default=640, help="合成图像宽度，默认 640")
+    pf.add_argument("--height", type=int, default=480, help="合成图像高度，默认 480")
+    pf.add_argument("--step", type=int, default=1, help="步骤索引，默认 1")
+    pf.add_argument("--step-desc", type=str, default="profile", help="步骤描述文本")
+    pf.add_argument("--guide-info", type=str, default="[]", help="guide_info JSON 字符串，或 @file.json")
+    pf.add_argument("--entry", type=str, default=None, help="显式指定入口 <module:Class>")
+    pf.add_argument("--json", action="store_true", help="以 JSON 输出摘要")
+
+    sk = sub.add_parser(
+        "soak",
+        help="长时间浸泡测试与泄漏检测",
+        description=(
+            "以目标速率持续驱动适配器子进程，按固定间隔采样子进程 RSS、打开句柄数、线程数与窗口延迟；\n"
+            "对稳态样本做线性拟合，检测内存/句柄/线程泄漏与延迟漂移，输出时间序列报告"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    sk.add_argument("project", type=str, help="算法项目根目录")
+    sk.add_argument("--duration", type=float, default=600.0, help="持续时间（秒），默认 600")
+    sk.add_argument("--rate", type=float, default=10.0, help="目标调用速率（次/秒），默认 10")
+    sk.add_argument("--interval", type=float, default=5.0, help="采样间隔（秒），默认 5")
+    sk.add_argument("--images", type=str, default=None, help="图片文件或目录（循环使用）；默认合成图像")
+    sk.add_argument("--width", type=int, default=640, help="合成图像宽度，默认 640")
+    sk.add_argument("--height", type=int, default=480, help="合成图像高度，默认 480")
+    sk.add_argument("--step", type=int, default=1, help="步骤索引，默认 1")
+    sk.add_argument("--step-desc", type=str, default="soak", help="步骤描述文本")
+    sk.add_argument("--guide-info", type=str, default="[]", help="guide_info JSON 字符串，或 @file.json")
+    sk.add_argument("--timeout", type=float, default=None, help="单次调用超时（秒），超时将重启适配器")
+    sk.add_argument("--entry", type=str, default=None, help="显式指定入口 <module:Class>")
+    sk.add_argument("--rss-mb-per-hour", type=float, default=None, help="RSS 增长阈值（MB/小时），默认 20")
+    sk.add_argument("--fds-per-hour", type=float, default=None, help="句柄增长阈值（个/小时），默认 10")
+    sk.add_argument("--latency-drift-pct", type=float, default=None, help="p50 延迟漂移阈值（%%），默认 25")
+    sk.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    sk.add_argument("-o", "--output", type=str, default=None, help="将 JSON 报告（含时间序列）写入文件")
+    sk.add_argument("--csv", type=str, default=None, help="将采样时间序列写入 CSV 文件")
+
+    rn = sub.add_parser(
+        "runner",
+        help="本地模拟 Runner（部署/握手/心跳/超时重启/共享内存注入），多工位压测",
+        description=(
+            "按 runner_spec.md 模拟平台 Runner：zip 包解压部署到 <deploy_root>/<name>-<version>/（先 .tmp 后原子重命名，禁止覆盖），\n"
+            "每个工位启动一个适配器子进程，完成 hello 协商与心跳，每次检测前向工位共享内存段写入图像并发送 call；\n"
+            "超时返回 1005 并重启适配器。可用 --scenario 场景 JSON 描述多工位、多算法包的压测"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    rn.add_argument("package", nargs="?", default=None, help="算法包 zip 或已解压的项目目录（使用 --scenario 时可省略）")
+    rn.add_argument("--scenario", type=str, default=None, help="场景 JSON（stations 列表，可含 package/entry/rate/count/images 等）")
+    rn.add_argument("--deploy-root", type=str, default=None, help="部署根目录（部署 zip 包时必需）")
+    rn.add_argument("--stations", type=int, default=1, help="工位数（每工位一个适配器进程），默认 1")
+    rn.add_argument("--rate", type=float, default=None, help="每工位检测速率（次/秒），默认不限速")
+    rn.add_argument("--calls", type=int, default=None, help="每工位检测次数")
+    rn.add_argument("--duration", type=float, default=None, help="运行时长（秒）；未指定 --calls 时默认 10")
+    rn.add_argument("--heartbeat-interval-ms", type=int, default=None, help="心跳间隔（毫秒），默认 5000")
+    rn.add_argument("--heartbeat-grace-ms", type=int, default=None, help="心跳等待 pong 的宽限（毫秒），超出即重启适配器，默认 2000")
+    rn.add_argument("--timeout-ms", type=int, default=None, help="execute 超时（毫秒），超时后重启适配器")
+    rn.add_argument("--hang-timeout-ms", type=int, default=None, help="单次检测占用工位超过该时长即视为心跳丢失并重启适配器，默认 execute 超时+宽限，未设超时时 60000")
+    rn.add_argument("--images", type=str, default=None, help="图片文件或目录（循环注入）；默认合成图像")
+    rn.add_argument("--width", type=int, default=640, help="合成图像宽度，默认 640")
+    rn.add_argument("--height", type=int, default=480, help="合成图像高度，默认 480")
+    rn.add_argument("--step", type=int, default=1, help="步骤索引，默认 1")
+    rn.add_argument("--step-desc", type=str, default="station", help="步骤描述文本")
+    rn.add_argument("--guide-info", type=str, default="[]", help="guide_info JSON 字符串，或 @file.json")
+    rn.add_argument("--entry", type=str, default=None, help="显式指定入口 <module:Class>")
+    rn.add_argument("--tail-logs", action="store_true", help="实时输出适配器 stderr 日志")
+    rn.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    rn.add_argument("-o", "--output", type=str, default=None, help="将 JSON 报告写入文件")
+
+    rp = sub.add_parser(
+        "replay",
+        help="回放协议抓包并比对结果与延迟",
+        description=(
+            "回放适配器 --record（PROC_RECORD_FILE）录制的协议抓包：恢复录制时的共享内存图像，按原始时间间隔或全速重发 call，\n"
+            "逐条比对 status/message/error_code/data 与延迟（原始 vs 回放）；可回放到任意算法包（如新版本）"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    rp.add_argument("capture", type=str, help="抓包文件路径")
+    rp.add_argument("project", type=str, help="算法项目根目录")
+    rp.add_argument("--fast", action="store_true", help="全速顺序回放（默认按录制时间间隔发送）")
+    rp.add_argument("--ignore", action="append", default=None, help=f"比对时忽略的字段名，可重复；默认 {', '.join(DEFAULT_IGNORE)}")
+    rp.add_argument("--timeout", type=float, default=None, help="单次调用超时（秒）")
+    rp.add_argument("--entry", type=str, default=None, help="显式指定入口 <module:Class>")
+    rp.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    rp.add_argument("-o", "--output", type=str, default=None, help="将 JSON 报告写入文件")
+
     p = sub.add_parser(
         "package",
         help="构建离线交付 zip 包",
@@ -734,6 +1189,55 @@ def main() -> None:
     p.add_argument("--python-runtime", type=str, default=None, help="Python 运行时目录（如 Windows embeddable 包解压目录）")
     p.add_argument("--runtime-python-version", type=str, default=None, help="运行时 Python 版本（如 3.10）")
     p.add_argument("--runtime-abi", type=str, default=None, help="运行时 ABI（如 cp310）")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="并行下载/哈希/压缩数，默认 CPU 核数")
+    p.add_argument("--wheel-cache", type=str, default=None, help="跨项目共享的 wheel 缓存目录，默认 PROC_WHEEL_CACHE 或 ~/.cache/procvision/wheels")
+    p.add_argument("--offline", action="store_true", help="离线模式：仅使用 wheel 缓存与 --find-links 目录，不访问索引")
+    p.add_argument("--find-links", type=str, default=None, help="本地 wheel 目录（先导入缓存，再作为解析来源）")
+    p.add_argument("--compile-bytecode", action="store_true", help="预编译源码为基于哈希的 pyc（__pycache__），解压后仍有效，免去首次启动编译")
+    p.add_argument("--import-index", action="store_true", help="生成 import_index.json（启动与首次 execute 导入的模块及耗时），供适配器预加载/告警")
+    p.add_argument("--target-python", type=str, default=None, help="目标版本的 Python 解释器（预编译与导入索引使用），默认当前解释器")
+    p.add_argument("--no-incremental", action="store_true", help="清空构建缓存（.procvision_cache/package）后全量重建")
+
+    az = sub.add_parser(
+        "analyze",
+        help="分析项目或离线包的体积构成与冷启动导入耗时",
+        description=(
+            "统计最大成员、按目录汇总体积、按内容哈希查找重复文件；解析 wheels 的顶层模块，\n"
+            "以 -X importtime 启动适配器（与 Runner 相同的启动路径，导入入口），按顶层模块汇总导入耗时，\n"
+            "并列出启动路径（及 import_index.json 中 execute 阶段）从未导入的 wheels"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    az.add_argument("target", type=str, help="算法项目目录或离线 zip 包")
+    az.add_argument("--top", type=int, default=20, help="各列表显示条数，默认 20")
+    az.add_argument("--entry", type=str, default=None, help="显式指定入口 <module:Class>")
+    az.add_argument("--python", type=str, default=None, help="测量导入耗时所用解释器（如已部署 venv 的 python），默认当前解释器")
+    az.add_argument("--no-imports", action="store_true", help="只分析体积，不启动适配器测量导入耗时")
+    az.add_argument("--timeout", type=float, default=300.0, help="适配器启动超时（秒），默认 300")
+    az.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    az.add_argument("-o", "--output", type=str, default=None, help="将 JSON 报告写入文件")
+
+    dp = sub.add_parser(
+        "deploy",
+        help="部署离线交付包（流式解压、校验、离线安装 venv、验证后原子重命名）",
+        description=(
+            "按 runner_spec.md 将离线 zip 部署到 <deploy_root>/<name>-<version>/：\n"
+            "先流式解压到暂存目录 <name>-<version>.<pid>.tmp（大成员并行解压），逐个比对 package 写入的 checksums.json（sha256），\n"
+            "再以包内 wheels 离线安装依赖到暂存目录下的 venv，用该 venv 运行 validate --full，\n"
+            "全部通过后把 venv 中的绝对路径改写为最终路径并原子重命名；任一步失败即删除暂存目录，不会留下半部署目录；已存在的版本目录禁止覆盖"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    dp.add_argument("package", type=str, help="离线交付 zip 包路径")
+    dp.add_argument("--deploy-root", type=str, required=True, help="部署根目录")
+    dp.add_argument("--python", type=str, default=None, help="创建 venv 的基础 Python 解释器（需带 pip），默认当前解释器")
+    dp.add_argument("--system-site-packages", action="store_true", help="venv 可见基础解释器的 site-packages（工位预装 CUDA/框架时使用）")
+    dp.add_argument("--no-venv", action="store_true", help="不创建 venv，不安装依赖（validate 使用基础解释器）")
+    dp.add_argument("--no-validate", action="store_true", help="跳过部署后的 validate --full")
+    dp.add_argument("--no-verify", action="store_true", help="跳过 checksums.json 校验")
+    dp.add_argument("--require-checksums", action="store_true", help="包内缺少 checksums.json 时拒绝部署")
+    dp.add_argument("-j", "--jobs", type=int, default=None, help="大成员并行解压线程数，默认 CPU 核数")
+    dp.add_argument("--json", action="store_true", help="以 JSON 输出结果")
 
     i = sub.add_parser(
         "init",
@@ -752,11 +1256,38 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command == "validate":
-        proj = args.project
+        try:
+            perf_thresholds = parse_thresholds(args.perf_threshold)
+        except ValueError as e:
+            print(f"错误: {e}")
+            sys.exit(2)
+        if perf_thresholds and not args.perf_baseline:
+            print("错误: --perf-threshold 需配合 --perf-baseline 使用")
+            sys.exit(2)
+        # 未给路径时与单项目模式一致校验当前目录，仅显式给出的路径才展开为子项目
+        projects = discover_projects(args.project) if args.project else ["."]
+        if len(projects) > 1:
+            if args.manifest or args.zip or args.entry or args.perf_baseline:
+                print("错误: 多项目模式不支持 --manifest/--zip/--entry/--perf-baseline")
+                sys.exit(2)
+            report = validate_many(projects, workers=args.workers, full=args.full, perf=args.perf, perf_calls=args.perf_calls, timeout=args.project_timeout)
+            if args.json:
+                print(json.dumps(report, ensure_ascii=False))
+            else:
+                _print_validate_many_human(report)
+            sys.exit(0 if report["summary"]["status"] == "PASS" else 1)
+        proj = projects[0]
         if args.full and os.path.isdir(proj):
             report = validate_adapter(proj, args.entry, args.tail_logs)
         else:
             report = validate(proj, args.manifest, args.zip)
+        if args.perf and os.path.isdir(proj) and report["summary"]["status"] == "PASS":
+            report["checks"].extend(manifest_perf_checks(proj, args.entry, args.perf_calls))
+        if args.perf_baseline and os.path.isdir(proj) and report["summary"]["status"] == "PASS":
+            report["checks"].extend(perf_checks(proj, args.perf_baseline, args.perf_repeat, args.entry, perf_thresholds))
+        if args.perf or args.perf_baseline:
+            failed = sum(1 for c in report["checks"] if c["result"] == "FAIL")
+            report["summary"] = {"status": "PASS" if failed == 0 else "FAIL", "passed": len(report["checks"]) - failed, "failed": failed}
         if args.json:
             print(json.dumps(report, ensure_ascii=False))
         else:
@@ -786,20 +1317,7 @@ def main() -> None:
             print(f"错误: guide-image 文件不存在: {guide_image_path}")
             print("示例: --guide-image ./guide.jpg")
             sys.exit(2)
-        guide_info_raw = args.guide_info or "[]"
-        if isinstance(guide_info_raw, str) and guide_info_raw.startswith("@"):
-            p = guide_info_raw[1:]
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    guide_info_raw = f.read()
-            except Exception:
-                print(f"错误: guide-info 文件读取失败: {p}")
-                sys.exit(2)
-        try:
-            guide_info = json.loads(guide_info_raw) if guide_info_raw else []
-        except Exception:
-            print("错误: --guide-info 必须是 JSON 字符串或 @file.json")
-            sys.exit(2)
+        guide_info = _load_guide_info(args.guide_info)
         result = run_adapter(args.project, args.cur_image, guide_image_path, args.step, args.step_desc, guide_info, args.entry, args.tail_logs)
         if args.json:
             print(json.dumps(result, ensure_ascii=False))
@@ -808,6 +1326,221 @@ def main() -> None:
         status = result.get("execute", {}).get("status")
         sys.exit(0 if status == "OK" else 1)
 
+    if args.command == "batch":
+        if not os.path.isfile(os.path.join(args.project, "manifest.json")):
+            print(f"错误: 未找到 manifest.json: {os.path.join(args.project, 'manifest.json')}")
+            sys.exit(2)
+        if not os.path.exists(args.source):
+            print(f"错误: 任务来源不存在: {args.source}")
+            sys.exit(2)
+        report = run_batch(
+            args.project,
+            args.source,
+            args.output,
+            workers=args.workers,
+            in_process=args.in_process,
+            guide_image=args.guide_image,
+            step_index=args.step,
+            step_desc=args.step_desc,
+            guide_info=_load_guide_info(args.guide_info),
+            entry=args.entry,
+            timeout=args.timeout,
+            resume=not args.no_resume,
+        )
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            _print_batch_human(report)
+        sys.exit(0 if report.get("status") == "OK" else 1)
+
+    if args.command == "bench":
+        if not os.path.isfile(os.path.join(args.project, "manifest.json")):
+            print(f"错误: 未找到 manifest.json: {os.path.join(args.project, 'manifest.json')}")
+            sys.exit(2)
+        if args.images and not os.path.exists(args.images):
+            print(f"错误: 图片路径不存在: {args.images}")
+            sys.exit(2)
+        bench_args = {
+            "calls": args.calls,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "replicas": args.replicas,
+            "rate": args.rate,
+            "images": args.images,
+            "width": args.width,
+            "height": args.height,
+            "step_index": args.step,
+            "step_desc": args.step_desc,
+            "guide_info": _load_guide_info(args.guide_info),
+            "timeout": args.timeout,
+        }
+        if args.repeat > 1 or args.save_baseline:
+            name = args.scenario or default_scenario_name(bench_args)
+            scenario = run_scenario(args.project, repeat=args.repeat, entry=args.entry, **bench_args)
+            if args.save_baseline:
+                save_baseline(args.save_baseline, {name: scenario}, args.project)
+            if args.json:
+                print(json.dumps({"scenario": name, **scenario}, ensure_ascii=False))
+            else:
+                _print_scenario_human(name, scenario)
+                if args.save_baseline:
+                    print(f"基线已写入: {args.save_baseline}")
+            sys.exit(0 if scenario.get("errors") == 0 else 1)
+        report = bench(args.project, entry=args.entry, **bench_args)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            _print_bench_human(report)
+        sys.exit(0 if report.get("status") == "OK" else 1)
+
+    if args.command == "profile":
+        if not os.path.isfile(os.path.join(args.project, "manifest.json")):
+            print(f"错误: 未找到 manifest.json: {os.path.join(args.project, 'manifest.json')}")
+            sys.exit(2)
+        report = profile_adapter(
+            args.project,
+            args.output_dir,
+            calls=args.calls,
+            warmup=args.warmup,
+            cpu=args.cpu,
+            memory=not args.no_memory,
+            in_process=args.in_process,
+            images=args.images,
+            width=args.width,
+            height=args.height,
+            step_index=args.step,
+            step_desc=args.step_desc,
+            guide_info=_load_guide_info(args.guide_info),
+            entry=args.entry,
+        )
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            _print_profile_human(report, args.top)
+        sys.exit(0 if report.get("status") == "OK" else 1)
+
+    if args.command == "soak":
+        if not os.path.isfile(os.path.join(args.project, "manifest.json")):
+            print(f"错误: 未找到 manifest.json: {os.path.join(args.project, 'manifest.json')}")
+            sys.exit(2)
+        thresholds = {
+            k: v
+            for k, v in (
+                ("rss_mb_per_hour", args.rss_mb_per_hour),
+                ("fds_per_hour", args.fds_per_hour),
+                ("latency_drift_pct", args.latency_drift_pct),
+            )
+            if v is not None
+        }
+        report = soak(
+            args.project,
+            duration_s=args.duration,
+            rate=args.rate,
+            sample_interval_s=args.interval,
+            entry=args.entry,
+            images=args.images,
+            width=args.width,
+            height=args.height,
+            step_index=args.step,
+            step_desc=args.step_desc,
+            guide_info=_load_guide_info(args.guide_info),
+            timeout=args.timeout,
+            thresholds=thresholds,
+            on_sample=None if args.json else _print_soak_sample,
+        )
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        if args.csv and report.get("samples"):
+            write_samples_csv(report["samples"], args.csv)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            _print_soak_human(report)
+        sys.exit(0 if report.get("status") == "PASS" else 1)
+
+    if args.command == "runner":
+        try:
+            if args.scenario:
+                cfg = load_scenario(args.scenario)
+            elif args.package:
+                if not os.path.exists(args.package):
+                    raise ValueError(f"算法包不存在: {args.package}")
+                cfg = {
+                    "stations": [
+                        {
+                            "name": "station",
+                            "count": args.stations,
+                            "package": args.package,
+                            "entry": args.entry,
+                            "images": args.images,
+                            "width": args.width,
+                            "height": args.height,
+                            "step_index": args.step,
+                            "step_desc": args.step_desc,
+                            "guide_info": _load_guide_info(args.guide_info),
+                        }
+                    ]
+                }
+            else:
+                raise ValueError("请指定算法包或 --scenario")
+        except Exception as e:
+            print(f"错误: {e}")
+            sys.exit(2)
+        overrides = {
+            "deploy_root": args.deploy_root,
+            "rate": args.rate,
+            "calls": args.calls,
+            "duration_s": args.duration,
+            "heartbeat_interval_ms": args.heartbeat_interval_ms,
+            "heartbeat_grace_ms": args.heartbeat_grace_ms,
+            "execute_timeout_ms": args.timeout_ms,
+            "hang_timeout_ms": args.hang_timeout_ms,
+        }
+        cfg.update({k: v for k, v in overrides.items() if v is not None})
+        if cfg.get("calls") is None and not cfg.get("duration_s"):
+            cfg["duration_s"] = 10.0
+        report = run_runner_scenario(cfg, stderr_handler=_print_log_line if args.tail_logs else None)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            _print_runner_human(report)
+        sys.exit(0 if report.get("status") == "OK" else 1)
+
+    if args.command == "replay":
+        if not os.path.isfile(args.capture):
+            print(f"错误: 抓包文件不存在: {args.capture}")
+            sys.exit(2)
+        ignore = tuple(DEFAULT_IGNORE) + tuple(args.ignore or ())
+        report = replay(args.capture, args.project, entry=args.entry, fast=args.fast, ignore=ignore, timeout=args.timeout)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            _print_replay_human(report)
+        sys.exit(0 if report.get("status") == "PASS" else 1)
+
+    if args.command == "compare":
+        try:
+            thresholds = parse_thresholds(args.threshold)
+            report = compare_baseline(load_baseline(args.baseline), load_baseline(args.current), thresholds)
+        except Exception as e:
+            print(f"错误: {e}")
+            sys.exit(2)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            _print_compare_human(report)
+        sys.exit(0 if report["status"] == "PASS" else 1)
+
     if args.command == "package":
         res = package(
             args.project,
@@ -823,13 +1556,72 @@ def main() -> None:
             args.python_runtime,
             args.runtime_python_version,
             args.runtime_abi,
+            incremental=not args.no_incremental,
+            jobs=args.jobs,
+            wheel_cache=args.wheel_cache,
+            offline=args.offline,
+            find_links=args.find_links,
+            compile_bytecode=args.compile_bytecode,
+            import_index=args.import_index,
+            target_python=args.target_python,
         )
         if res.get("status") == "OK":
             print(f"打包成功: {res.get('zip')}")
+            st = (res.get("build") or {}).get("stats") or {}
+            if st:
+                print(
+                    f"文件 {st.get('files')} | 新压缩 {st.get('compressed')} | 复用压缩 {st.get('compress_reused')} | 原样存储 {st.get('stored')}"
+                    f" | 复用哈希 {st.get('hash_reused')} | {_fmt_bytes(st.get('bytes_in'))} -> {_fmt_bytes(st.get('bytes_out'))} | 耗时 {res['build'].get('elapsed_s')}s"
+                )
+            bc = res.get("bytecode")
+            if bc:
+                print(f"字节码: {bc.get('cache_tag')} | 新编译 {bc.get('compiled')} | 复用 {bc.get('reused')} | 失败 {len(bc.get('failed') or [])}")
+                for f in bc.get("failed") or []:
+                    print(f"  ⚠️ {f['source']}: {f['error']}")
+            ii = res.get("import_index")
+            if ii:
+                print(f"导入索引: {ii.get('modules')} 个模块 | 启动导入 {ii.get('startup_ms')}ms | execute 内延迟导入 {ii.get('lazy_ms')}ms")
             sys.exit(0)
         print(f"打包失败: {res.get('message')}")
         sys.exit(1)
 
+    if args.command == "analyze":
+        if not os.path.exists(args.target):
+            print(f"错误: 路径不存在: {args.target}")
+            print("示例: procvision-cli analyze ./algo-v1.0.0-offline.zip")
+            sys.exit(2)
+        report = analyze(args.target, entry=args.entry, top=args.top, imports=not args.no_imports, python=args.python, timeout=args.timeout)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            _print_analyze_human(report)
+        sys.exit(0 if report.get("status") == "OK" else 1)
+
+    if args.command == "deploy":
+        if not os.path.isfile(args.package):
+            print(f"错误: 算法包不存在: {args.package}")
+            print("示例: procvision-cli deploy ./algo-v1.0.0-offline.zip --deploy-root ./deploy")
+            sys.exit(2)
+        res = deploy_package(
+            args.package,
+            args.deploy_root,
+            verify=not args.no_verify,
+            require_checksums=args.require_checksums,
+            venv=not args.no_venv,
+            python=args.python,
+            system_site_packages=args.system_site_packages,
+            validate=not args.no_validate,
+            jobs=args.jobs,
+        )
+        if args.json:
+            print(json.dumps(res, ensure_ascii=False))
+        else:
+            _print_deploy_human(res)
+        sys.exit(0 if res.get("status") == "OK" else 1)
+
     if args.command == "init":
         res = init_project(args.name, args.dir, args.version, args.desc)
         if res.get("status") == "OK":
@@ -845,42 +1637,16 @@ def validate_adapter(project: str, entry: Optional[str], tail_logs: bool = False
     manifest_path = os.path.join(project, "manifest.json")
     if not os.path.isfile(manifest_path):
         return {"summary": {"status": "FAIL", "passed": 0, "failed": 1}, "checks": [{"name": "manifest_exists", "result": "FAIL", "message": "manifest.json not found"}]}
-    env = os.environ.copy()
-    env["PROC_ALGO_ROOT"] = os.path.abspath(project)
-    env["PROC_STRICT_STDIO"] = "1"
-    cmd = [sys.executable, "-m", "procvision_algorithm_sdk.adapter"]
-    if entry:
-        cmd += ["--entry", entry]
-    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=project, env=env)
-    if proc.stdout is None or proc.stdin is None:
-        return {"summary": {"status": "FAIL", "passed": 0, "failed": 1}, "checks": [{"name": "adapter_start", "result": "FAIL", "message": "start failed"}]}
-    log_thread = None
-    if tail_logs and proc.stderr is not None:
-        log_thread = threading.Thread(target=_stderr_printer, args=(proc.stderr,), daemon=True)
-        log_thread.start()
-    hello = _read_frame(proc.stdout)
+    client = AdapterClient(project, entry=entry, strict_stdio=True, auto_restart=False, stderr_handler=_print_log_line if tail_logs else None)
+    try:
+        hello: Optional[Dict[str, Any]] = client.start()
+    except Exception:
+        hello = None
     ok_hello = isinstance(hello, dict) and hello.get("type") == "hello"
     checks.append({"name": "adapter_hello", "result": "PASS" if ok_hello else "FAIL", "message": "hello" if ok_hello else "missing"})
     if not ok_hello:
-        try:
-            proc.terminate()
-        except Exception:
-            pass
-        try:
-            proc.wait(timeout=1.0)
-        except Exception:
-            pass
-        try:
-            if proc.stdin is not None:
-                proc.stdin.close()
-            if proc.stdout is not None:
-                proc.stdout.close()
-            if proc.stderr is not None:
-                proc.stderr.close()
-        except Exception:
-            pass
+        client.close()
         return {"summary": {"status": "FAIL", "passed": 0, "failed": 1}, "checks": checks}
-    _write_frame(proc.stdin, {"type": "hello", "runner_version": "dev", "heartbeat_interval_ms": 5000, "heartbeat_grace_ms": 2000})
     sid = f"session-{int(time.time()*1000)}"
     cur_shm_id = f"dev-shm:{sid}:cur"
     guide_shm_id = f"dev-shm:{sid}:guide"
@@ -889,27 +1655,11 @@ def validate_adapter(project: str, entry: Optional[str], tail_logs: bool = False
         dev_write_image_to_shared_memory(guide_shm_id, b"")
     except Exception:
         pass
-    cur_meta = {"width": 640, "height": 480, "timestamp_ms": int(time.time()*1000), "camera_id": "cam-dev", "color_space": "RGB"}
-    guide_meta = {"width": 640, "height": 480, "timestamp_ms": int(time.time()*1000), "camera_id": "cam-dev", "color_space": "RGB"}
-    rid_exe = str(uuid.uuid4())
-    _write_frame(
-        proc.stdin,
-        {
-            "type": "call",
-            "request_id": rid_exe,
-            "data": {
-                "step_index": 1,
-                "step_desc": "validate-full",
-                "guide_info": [],
-                "cur_image_shm_id": cur_shm_id,
-                "cur_image_meta": cur_meta,
-                "guide_image_shm_id": guide_shm_id,
-                "guide_image_meta": guide_meta,
-            },
-        },
-    )
-    exe = _read_frame(proc.stdout)
-    ok_exe = isinstance(exe, dict) and exe.get("type") == "result" and (exe.get("status") in {"OK", "ERROR"})
+    try:
+        exe = client.call(_dev_call_data(1, "validate-full", [], cur_shm_id, _dev_image_meta(640, 480), guide_shm_id, _dev_image_meta(640, 480)))
+    finally:
+        client.close()
+    ok_exe = exe.get("type") == "result" and (exe.get("status") in {"OK", "ERROR"})
     checks.append({"name": "execute_result", "result": "PASS" if ok_exe else "FAIL", "message": "received" if ok_exe else "invalid"})
     if ok_exe and exe.get("status") == "OK":
         data = exe.get("data", {})
@@ -918,30 +1668,6 @@ def validate_adapter(project: str, entry: Optional[str], tail_logs: bool = False
         if rs == "NG":
             dr = data.get("defect_rects", [])
             checks.append({"name": "defect_rects_limit", "result": "PASS" if isinstance(dr, list) and len(dr) <= 20 else "FAIL", "message": f"len={len(dr) if isinstance(dr, list) else 'n/a'}"})
-    _write_frame(proc.stdin, {"type": "shutdown"})
-    _read_frame(proc.stdout)
-    try:
-        proc.terminate()
-    except Exception:
-        pass
-    try:
-        proc.wait(timeout=1.0)
-    except Exception:
-        pass
-    try:
-        if proc.stdin is not None:
-            proc.stdin.close()
-        if proc.stdout is not None:
-            proc.stdout.close()
-        if proc.stderr is not None:
-            proc.stderr.close()
-    except Exception:
-        pass
-    try:
-        if log_thread is not None:
-            log_thread.join(timeout=0.5)
-    except Exception:
-        pass
     passed = sum(1 for c in checks if c["result"] == "PASS")
     failed = sum(1 for c in checks if c["result"] == "FAIL")
     status = "PASS" if failed == 0 else "FAIL"
@@ -0,0 +1,372 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from .framing import read_frame, write_frame
+
+TIMEOUT_ERROR_CODE = "1005"
+ADAPTER_EXIT_ERROR_CODE = "1000"
+
+
+def _error_frame(rid: Optional[str], message: str, code: str) -> Dict[str, Any]:
+    return {"type": "error", "request_id": rid, "timestamp_ms": int(time.time() * 1000), "status": "ERROR", "message": message, "error_code": code}
+
+
+class _Pending:
+    def __init__(self, rid: str, on_partial: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+        self.rid = rid
+        self.on_partial = on_partial
+        self.event = threading.Event()
+        self.frame: Optional[Dict[str, Any]] = None
+        self.sent_at = time.perf_counter()
+        self.generation = 0
+
+    def resolve(self, frame: Dict[str, Any]) -> None:
+        if self.frame is None:
+            self.frame = frame
+            self.event.set()
+
+
+class AdapterClient:
+    def __init__(
+        self,
+        project: str,
+        entry: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        capabilities: Optional[List[str]] = None,
+        strict_stdio: bool = False,
+        python: Optional[str] = None,
+        adapter_args: Optional[List[str]] = None,
+        heartbeat_interval_ms: int = 5000,
+        heartbeat_grace_ms: int = 2000,
+        hello_timeout_s: float = 30.0,
+        call_timeout_s: Optional[float] = None,
+        restart_on_timeout: bool = True,
+        auto_restart: bool = True,
+        max_restarts: int = 3,
+        stderr_handler: Optional[Callable[[bytes], None]] = None,
+    ) -> None:
+        self.project = project
+        self.entry = entry
+        self.extra_env = dict(env or {})
+        self.requested_capabilities = list(capabilities or [])
+        self.strict_stdio = strict_stdio
+        self.python = python or sys.executable
+        self.adapter_args = list(adapter_args or [])
+        self.heartbeat_interval_ms = heartbeat_interval_ms
+        self.heartbeat_grace_ms = heartbeat_grace_ms
+        self.hello_timeout_s = hello_timeout_s
+        self.call_timeout_s = call_timeout_s
+        self.restart_on_timeout = restart_on_timeout
+        self.auto_restart = auto_restart
+        self.max_restarts = max_restarts
+        self.stderr_handler = stderr_handler
+        self.proc: Optional[subprocess.Popen] = None
+        self.hello: Optional[Dict[str, Any]] = None
+        self.capabilities: List[str] = []
+        self.restarts = 0
+        self.last_error: Optional[Dict[str, Any]] = None
+        self._pending: Dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # 串行化重启：并发调用者在同一次崩溃后只有一个执行 kill + start
+        self._restart_lock = threading.Lock()
+        self._restart_due = False
+        self._hello_event = threading.Event()
+        self._shutdown_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._generation = 0
+        self._eof = False
+
+    def __enter__(self) -> "AdapterClient":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.proc.pid if self.proc is not None else None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and not self._eof and self.hello is not None and self.proc.poll() is None
+
+    @property
+    def outstanding(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def start(self) -> Dict[str, Any]:
+        cmd = [self.python, "-m", "procvision_algorithm_sdk.adapter"]
+        if self.entry:
+            cmd += ["--entry", self.entry]
+        cmd += self.adapter_args
+        env = os.environ.copy()
+        env["PROC_ALGO_ROOT"] = os.path.abspath(self.project)
+        if self.strict_stdio:
+            env["PROC_STRICT_STDIO"] = "1"
+        env.update(self.extra_env)
+        self.hello = None
+        self.last_error = None
+        self._eof = False
+        self._hello_event.clear()
+        self._shutdown_event.clear()
+        self._generation += 1
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=self.project, env=env)
+        gen = self._generation
+        self._threads = [
+            threading.Thread(target=self._reader, args=(self.proc, gen), daemon=True),
+            threading.Thread(target=self._stderr_reader, args=(self.proc,), daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        if not self._hello_event.wait(self.hello_timeout_s) or self.hello is None:
+            self._kill()
+            raise RuntimeError("adapter hello missing")
+        offered = self.hello.get("capabilities") or []
+        self.capabilities = [c for c in self.requested_capabilities if c in offered]
+        runner_hello: Dict[str, Any] = {
+            "type": "hello",
+            "runner_version": "dev",
+            "heartbeat_interval_ms": self.heartbeat_interval_ms,
+            "heartbeat_grace_ms": self.heartbeat_grace_ms,
+        }
+        if self.capabilities:
+            runner_hello["capabilities"] = list(self.capabilities)
+        try:
+            self._send(runner_hello)
+        except Exception:
+            # 适配器在 hello 后立即退出（如入口加载失败），错误由读线程记录到 last_error
+            pass
+        return self.hello
+
+    def _reader(self, proc: subprocess.Popen, gen: int) -> None:
+        fp = proc.stdout
+        while fp is not None:
+            frame = read_frame(fp)
+            if frame is None:
+                break
+            t = frame.get("type")
+            if t == "hello" and self.hello is None:
+                self.hello = frame
+                self._hello_event.set()
+                continue
+            if t == "shutdown":
+                self._shutdown_event.set()
+                continue
+            rid = frame.get("request_id")
+            if rid is None:
+                # 无 request_id 的 error 帧（如入口加载失败）视为适配器级错误
+                self.last_error = frame
+                continue
+            with self._lock:
+                pending = self._pending.get(str(rid))
+                if pending is not None and t != "partial":
+                    self._pending.pop(str(rid), None)
+            if pending is None:
+                continue
+            if t == "partial":
+                if pending.on_partial is not None:
+                    try:
+                        pending.on_partial(frame)
+                    except Exception:
+                        pass
+                continue
+            pending.resolve(frame)
+        self._hello_event.set()
+        if gen == self._generation:
+            self._eof = True
+            err = self.last_error or {}
+            self._fail_all(err.get("message") or "adapter exited", err.get("error_code") or ADAPTER_EXIT_ERROR_CODE)
+
+    def _stderr_reader(self, proc: subprocess.Popen) -> None:
+        fp = proc.stderr
+        try:
+            while fp is not None:
+                line = fp.readline()
+                if not line:
+                    break
+                if self.stderr_handler is not None:
+                    try:
+                        self.stderr_handler(line)
+                    except Exception:
+                        pass
+        except Exception:
+            pass
+
+    def _fail_all(self, message: str, code: str) -> None:
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for p in pending:
+            p.resolve(_error_frame(p.rid, message, code))
+
+    def _send(self, frame: Dict[str, Any]) -> None:
+        proc = self.proc
+        if proc is None or proc.stdin is None:
+            raise BrokenPipeError("adapter not started")
+        with self._write_lock:
+            write_frame(proc.stdin, frame)
+
+    def _ensure_alive(self) -> None:
+        if self.alive and not self._restart_due:
+            return
+        with self._restart_lock:
+            if self.alive:
+                # 超时后推迟的重启：等其他在途调用结束后再执行
+                if self._restart_due and not self.outstanding:
+                    self._restart()
+                return
+            if self.proc is not None and not self._eof and self.hello is None and self.proc.poll() is None:
+                raise RuntimeError("adapter not ready")
+            if self.proc is not None and not self.auto_restart:
+                raise RuntimeError("adapter exited")
+            if self.proc is not None:
+                if self.restarts >= self.max_restarts:
+                    raise RuntimeError("adapter restart limit reached")
+                self.restarts += 1
+                self._restart_due = False
+                self._kill()
+            self.start()
+
+    def submit(self, frame: Dict[str, Any], on_partial: Optional[Callable[[Dict[str, Any]], None]] = None) -> _Pending:
+        rid = str(frame.get("request_id") or uuid.uuid4())
+        frame = {**frame, "request_id": rid}
+        pending = _Pending(rid, on_partial)
+        try:
+            self._ensure_alive()
+        except Exception as e:
+            err = self.last_error or {}
+            pending.resolve(_error_frame(rid, err.get("message") or str(e), err.get("error_code") or ADAPTER_EXIT_ERROR_CODE))
+            return pending
+        with self._lock:
+            pending.generation = self._generation
+            self._pending[rid] = pending
+        try:
+            self._send(frame)
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(rid, None)
+            pending.resolve(_error_frame(rid, f"adapter write failed: {e}", ADAPTER_EXIT_ERROR_CODE))
+        return pending
+
+    def wait(self, pending: _Pending, timeout: Optional[float] = None) -> Dict[str, Any]:
+        limit = self.call_timeout_s if timeout is None else timeout
+        if not pending.event.wait(limit):
+            with self._lock:
+                self._pending.pop(pending.rid, None)
+            pending.resolve(_error_frame(pending.rid, "execute 超时", TIMEOUT_ERROR_CODE))
+            if self.restart_on_timeout:
+                # 超时的 execute 仍占用适配器，需重启；仍有其他在途调用时推迟到它们结束，避免一并失败
+                with self._restart_lock:
+                    if pending.generation == self._generation:
+                        if self.outstanding:
+                            self._restart_due = True
+                        else:
+                            self._restart()
+        return pending.frame or _error_frame(pending.rid, "execute failed", ADAPTER_EXIT_ERROR_CODE)
+
+    def call(
+        self,
+        data: Dict[str, Any],
+        timeout: Optional[float] = None,
+        request_id: Optional[str] = None,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        pending = self.submit({"type": "call", "request_id": request_id, "data": data}, on_partial)
+        return self.wait(pending, timeout)
+
+    def request(self, frame_type: str, timeout: Optional[float] = 5.0, **fields: Any) -> Dict[str, Any]:
+        pending = self.submit({"type": frame_type, **fields})
+        if not pending.event.wait(timeout):
+            with self._lock:
+                self._pending.pop(pending.rid, None)
+            return _error_frame(pending.rid, f"{frame_type} 超时", TIMEOUT_ERROR_CODE)
+        return pending.frame or _error_frame(pending.rid, f"{frame_type} failed", ADAPTER_EXIT_ERROR_CODE)
+
+    def ping(self, timeout: Optional[float] = 5.0) -> bool:
+        return self.request("ping", timeout).get("type") == "pong"
+
+    def stats(self, timeout: Optional[float] = 5.0) -> Dict[str, Any]:
+        return self.request("stats", timeout)
+
+    def set_log_level(self, level: Optional[str], logger: Optional[str] = None, timeout: Optional[float] = 5.0) -> Dict[str, Any]:
+        # 运行时调整适配器内日志级别；logger 为算法模块名（点分前缀匹配），level=None 移除该覆盖
+        return self.request("log_level", timeout, level=level, logger=logger)
+
+    def release(self, request_id: str) -> None:
+        if self.alive:
+            self._send({"type": "release", "request_id": request_id})
+
+    def restart(self) -> Dict[str, Any]:
+        with self._restart_lock:
+            return self._restart()
+
+    def _restart(self) -> Dict[str, Any]:
+        self.restarts += 1
+        self._restart_due = False
+        self._kill()
+        return self.start()
+
+    def _kill(self) -> None:
+        proc = self.proc
+        self._generation += 1
+        self.hello = None
+        self._fail_all("adapter restarted", ADAPTER_EXIT_ERROR_CODE)
+        if proc is None:
+            return
+        try:
+            proc.kill()
+        except Exception:
+            pass
+        try:
+            proc.wait(timeout=1.0)
+        except Exception:
+            pass
+        self._close_pipes(proc)
+
+    def _close_pipes(self, proc: subprocess.Popen) -> None:
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            if proc.stdout is not None:
+                proc.stdout.close()
+            if proc.stderr is not None:
+                proc.stderr.close()
+        except Exception:
+            pass
+        for t in self._threads:
+            t.join(timeout=0.5)
+
+    def close(self, timeout: float = 1.0) -> None:
+        proc = self.proc
+        if proc is None:
+            return
+        if self.alive:
+            try:
+                self._send({"type": "shutdown"})
+                self._shutdown_event.wait(timeout)
+            except Exception:
+                pass
+        self._generation += 1
+        try:
+            proc.terminate()
+        except Exception:
+            pass
+        try:
+            proc.wait(timeout=timeout)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+        self._close_pipes(proc)
+        self._fail_all("adapter closed", ADAPTER_EXIT_ERROR_CODE)
+        self.hello = None
+        self.proc = None
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .packaging import CHECKSUMS_FILE, CHECKSUMS_VERSION
+from .validate_many import validate_in_subprocess
+
+# 超过该大小的成员（模型权重、wheel 等）交给线程池并行解压
+LARGE_MEMBER_BYTES = 4 * 1024 * 1024
+_CHUNK = 1024 * 1024
+
+
+def _zip_root(z: zipfile.ZipFile) -> Optional[str]:
+    # package 生成的 zip 以项目目录名为顶层目录（wheels/ 位于 zip 根）；也兼容 manifest 直接位于根的 zip
+    best: Optional[str] = None
+    for n in z.namelist():
+        norm = n.replace("\\", "/")
+        if norm == "manifest.json":
+            return ""
+        if norm.endswith("/manifest.json") and norm.count("/") == 1:
+            best = norm[: -len("manifest.json")]
+    return best
+
+
+def _safe_target(base: str, rel: str) -> Optional[str]:
+    target = os.path.abspath(os.path.join(base, rel))
+    if target != base and not target.startswith(base + os.sep):
+        return None
+    return target
+
+
+def _load_checksums(z: zipfile.ZipFile, root: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    name = root + CHECKSUMS_FILE
+    if name not in z.NameToInfo:
+        return None
+    doc = json.loads(z.read(name).decode("utf-8"))
+    if doc.get("version") != CHECKSUMS_VERSION or doc.get("algorithm") != "sha256":
+        raise ValueError(f"不支持的校验清单格式: {CHECKSUMS_FILE}")
+    return doc.get("files") or {}
+
+
+def _extract(z: zipfile.ZipFile, info: zipfile.ZipInfo, target: str) -> Tuple[str, int]:
+    # 边解压边计算 sha256，不在内存中保留整个成员
+    h = hashlib.sha256()
+    size = 0
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with z.open(info) as src, open(target, "wb") as dst:
+        while True:
+            buf = src.read(_CHUNK)
+            if not buf:
+                break
+            h.update(buf)
+            dst.write(buf)
+            size += len(buf)
+    return h.hexdigest(), size
+
+
+def venv_python(venv_dir: str) -> str:
+    if os.name == "nt":
+        return os.path.join(venv_dir, "Scripts", "python.exe")
+    return os.path.join(venv_dir, "bin", "python")
+
+
+def _run(cmd: List[str], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> Tuple[bool, str]:
+    res = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True)
+    return res.returncode == 0, ((res.stderr or "") + ("\n" + res.stdout if res.stdout else "")).strip()
+
+
+def _install_venv(root: str, python: Optional[str], system_site_packages: bool) -> Dict[str, Any]:
+    base = python or sys.executable
+    venv_dir = os.path.join(root, "venv")
+    cmd = [base, "-m", "venv", "--without-pip"] + (["--system-site-packages"] if system_site_packages else []) + [venv_dir]
+    ok, out = _run(cmd)
+    if not ok:
+        raise RuntimeError(f"创建 venv 失败: {out[-500:]}")
+    py = venv_python(venv_dir)
+    req = next((os.path.join(root, f) for f in ("requirements.sanitized.txt", "requirements.txt") if os.path.isfile(os.path.join(root, f))), None)
+    wheels = os.path.join(root, "wheels")
+    installed = False
+    if req:
+        # venv 不带 pip（省去 ensurepip），由基础解释器的 pip 经 --python 安装到 venv；仅使用包内 wheels
+        cmd = [base, "-m", "pip", "--python", py, "install", "--no-index", "--find-links", wheels, "-r", req, "--disable-pip-version-check", "--no-warn-script-location"]
+        ok, out = _run(cmd, cwd=root)
+        if not ok:
+            raise RuntimeError(f"离线安装依赖失败: {out[-1000:]}")
+        installed = True
+    return {"path": venv_dir, "python": py, "requirements": os.path.basename(req) if req else None, "installed": installed}
+
+
+def _relocate_venv(venv_dir: str, old: str, new: str) -> int:
+    # venv 在暂存目录中创建：pyvenv.cfg、activate 与 console script 的 shebang（含 Windows 启动器 exe 尾部的 shebang）
+    # 写有暂存目录的绝对路径，重命名前替换为最终路径
+    old_b, new_b = old.encode("utf-8"), new.encode("utf-8")
+    paths = [os.path.join(venv_dir, "pyvenv.cfg")]
+    scripts = os.path.dirname(venv_python(venv_dir))
+    paths += [os.path.join(scripts, f) for f in sorted(os.listdir(scripts))]
+    rewritten = 0
+    for p in paths:
+        if os.path.islink(p) or not os.path.isfile(p):
+            continue
+        with open(p, "rb") as f:
+            data = f.read()
+        if old_b not in data:
+            continue
+        with open(p, "wb") as f:
+            f.write(data.replace(old_b, new_b))
+        rewritten += 1
+    return rewritten
+
+
+def _validate(root: str, python: str, env: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    # 以部署后的解释器运行 validate --full：与 Runner 相同的适配器路径
+    args = ["--full"]
+    try:
+        with open(os.path.join(root, "manifest.json"), "r", encoding="utf-8") as f:
+            # manifest 声明了性能预算时一并检查，超预算的包不上线
+            if json.load(f).get("performance"):
+                args.append("--perf")
+    except Exception:
+        pass
+    return validate_in_subprocess(root, python=python, extra_args=args, env=env)
+
+
+def deploy_package(
+    package: str,
+    deploy_root: str,
+    verify: bool = True,
+    require_checksums: bool = False,
+    venv: bool = False,
+    python: Optional[str] = None,
+    system_site_packages: bool = False,
+    validate: bool = False,
+    env: Optional[Dict[str, str]] = None,
+    jobs: Optional[int] = None,
+) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    if not os.path.isfile(package):
+        return {"status": "ERROR", "message": f"算法包不存在: {package}"}
+    try:
+        z = zipfile.ZipFile(package)
+    except Exception as e:
+        return {"status": "ERROR", "message": f"无法打开算法包: {e}"}
+    with z:
+        root = _zip_root(z)
+        if root is None:
+            return {"status": "ERROR", "message": "算法包缺少 manifest.json"}
+        try:
+            mf = json.loads(z.read(root + "manifest.json").decode("utf-8"))
+        except Exception as e:
+            return {"status": "ERROR", "message": f"manifest.json 解析失败: {e}"}
+        name, version = mf.get("name"), mf.get("version")
+        if not name or not version:
+            return {"status": "ERROR", "message": "manifest.json 缺少 name/version"}
+        try:
+            checksums = _load_checksums(z, root) if verify else None
+        except Exception as e:
+            return {"status": "ERROR", "message": f"校验清单解析失败: {e}"}
+        if verify and checksums is None and require_checksums:
+            return {"status": "ERROR", "message": f"算法包缺少 {CHECKSUMS_FILE}（请用新版 procvision-cli package 重新打包）"}
+        os.makedirs(deploy_root, exist_ok=True)
+        final = os.path.abspath(os.path.join(deploy_root, f"{name}-{version}"))
+        # 暂存目录名带进程号：同一 deploy_root 上的并发部署互不清理对方的暂存目录
+        tmp = f"{final}.{os.getpid()}.tmp"
+        if os.path.exists(final):
+            return {"status": "ERROR", "message": f"部署目录已存在: {final}（禁止覆盖，请先移除或升级版本号）", "path": final}
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        timings: Dict[str, float] = {}
+        result: Dict[str, Any] = {"status": "OK", "name": name, "version": version, "path": final}
+        try:
+            small: List[Tuple[zipfile.ZipInfo, str]] = []
+            large: List[Tuple[zipfile.ZipInfo, str]] = []
+            for info in z.infolist():
+                norm = info.filename.replace("\\", "/")
+                rel = norm[len(root):] if root and norm.startswith(root) else norm
+                if not rel or rel.endswith("/"):
+                    continue
+                target = _safe_target(tmp, rel)
+                if target is None:
+                    raise ValueError(f"非法成员路径: {info.filename}")
+                (large if info.file_size >= LARGE_MEMBER_BYTES else small).append((info, target))
+
+            local = threading.local()
+            handles: List[zipfile.ZipFile] = []
+
+            def _extract_large(item: Tuple[zipfile.ZipInfo, str]) -> Tuple[str, Tuple[str, int]]:
+                # 每个线程独立打开 zip，解压互不抢占同一文件句柄
+                if not hasattr(local, "zip"):
+                    local.zip = zipfile.ZipFile(package)
+                    handles.append(local.zip)
+                return item[0].filename, _extract(local.zip, item[0], item[1])
+
+            t = time.perf_counter()
+            digests: Dict[str, Tuple[str, int]] = {}
+            n_workers = max(1, min(len(large), int(jobs or os.cpu_count() or 1)))
+            with ThreadPoolExecutor(max_workers=n_workers) as ex:
+                futures = ex.map(_extract_large, large)
+                for info, target in small:
+                    digests[info.filename] = _extract(z, info, target)
+                try:
+                    digests.update(dict(futures))
+                finally:
+                    for h in handles:
+                        h.close()
+            timings["extract_ms"] = round((time.perf_counter() - t) * 1000.0, 3)
+
+            if checksums is not None:
+                bad = [n for n, (sha, size) in digests.items() if n != root + CHECKSUMS_FILE and (checksums.get(n) or {}).get("sha256") != sha]
+                missing = [n for n in checksums if n not in digests]
+                if bad or missing:
+                    raise ValueError(f"校验失败: 不一致/未登记 {sorted(bad)[:5]}，缺失 {sorted(missing)[:5]}")
+            result["verified"] = checksums is not None
+            result["files"] = len(digests)
+            result["bytes"] = sum(size for _, size in digests.values())
+            result["parallel_members"] = len(large)
+            if not os.path.isfile(os.path.join(tmp, "manifest.json")):
+                raise ValueError("解压后缺少 manifest.json")
+
+            py = python or sys.executable
+            if venv:
+                t = time.perf_counter()
+                result["venv"] = _install_venv(tmp, python, system_site_packages)
+                timings["venv_ms"] = round((time.perf_counter() - t) * 1000.0, 3)
+                py = result["venv"]["python"]
+            if validate:
+                t = time.perf_counter()
+                report = _validate(tmp, py, env)
+                timings["validate_ms"] = round((time.perf_counter() - t) * 1000.0, 3)
+                result["validate"] = report
+                if report.get("summary", {}).get("status") != "PASS":
+                    failed = [c for c in report.get("checks", []) if c.get("result") == "FAIL"]
+                    raise ValueError(f"部署校验未通过: {failed}")
+            if venv:
+                result["venv"]["relocated"] = _relocate_venv(result["venv"]["path"], tmp, final)
+            # 解压、校验、venv 安装与验证全部在暂存目录完成，最后一步原子重命名，不存在半部署的最终目录
+            os.rename(tmp, final)
+            if venv:
+                result["venv"]["path"] = os.path.join(final, "venv")
+                result["venv"]["python"] = venv_python(result["venv"]["path"])
+        except Exception as e:
+            shutil.rmtree(tmp, ignore_errors=True)
+            err: Dict[str, Any] = {"status": "ERROR", "message": f"部署失败: {e}"}
+            if "validate" in result:
+                err["validate"] = result["validate"]
+            return err
+    timings["total_ms"] = round((time.perf_counter() - t0) * 1000.0, 3)
+    result["timings"] = timings
+    return result
@@ -0,0 +1,52 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .serialization import dumps, loads
+
+
+def encode_frame(obj: Dict[str, Any]) -> bytes:
+    data = dumps(obj)
+    return len(data).to_bytes(4, byteorder="big") + data
+
+
+def write_frame(fp, obj: Dict[str, Any]) -> None:
+    fp.write(encode_frame(obj))
+    fp.flush()
+
+
+def write_frame_bytes(fp, data: bytes) -> None:
+    # 已序列化的帧体（如拼接了 timing 的结果帧）
+    fp.write(len(data).to_bytes(4, byteorder="big") + data)
+    fp.flush()
+
+
+def read_exact(fp, n: int) -> Optional[bytes]:
+    b = b""
+    while len(b) < n:
+        chunk = fp.read(n - len(b))
+        if not chunk:
+            return None
+        b += chunk
+    return b
+
+
+def read_frame_timed(fp) -> Tuple[Optional[Dict[str, Any]], float]:
+    h = read_exact(fp, 4)
+    if h is None:
+        return None, 0.0
+    # 头部读取会阻塞等待下一帧，解码耗时从拿到长度后开始计
+    t0 = time.perf_counter()
+    ln = int.from_bytes(h, byteorder="big")
+    if ln <= 0:
+        return None, 0.0
+    body = read_exact(fp, ln)
+    if body is None:
+        return None, 0.0
+    try:
+        return loads(body), round((time.perf_counter() - t0) * 1000.0, 3)
+    except Exception:
+        return None, 0.0
+
+
+def read_frame(fp) -> Optional[Dict[str, Any]]:
+    return read_frame_timed(fp)[0]
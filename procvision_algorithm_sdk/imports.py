@@ -0,0 +1,202 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+IMPORT_INDEX_FILE = "import_index.json"
+INDEX_VERSION = 1
+
+_PHASE_MARKER = "procvision-import-phase:"
+
+# 在目标解释器中运行：导入入口模块并实例化（startup），再以零图像调用一次 execute（lazy），
+# 通过 -X importtime 记录各阶段首次导入的模块
+_INDEX_SCRIPT = r"""
+import sys
+ep = sys.argv[1]
+w, h = int(sys.argv[2]), int(sys.argv[3])
+mark = lambda p: (sys.stderr.write("%s%s\n" % (sys.argv[4], p)), sys.stderr.flush())
+mark("startup")
+m, c = ep.split(":", 1)
+# importlib.import_module 绕过 -X importtime 的计时，需走 __import__
+__import__(m)
+alg = getattr(sys.modules[m], c)()
+mark("lazy")
+try:
+    import numpy as np
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    alg.execute(1, "import-index", img, img, [])
+except BaseException:
+    pass
+mark("end")
+"""
+
+# 在目标解释器中运行：生成基于哈希（checked-hash）的 pyc，已是最新的跳过
+_COMPILE_SCRIPT = r"""
+import importlib.util, json, os, py_compile, sys
+items = json.load(sys.stdin)
+tag = sys.implementation.cache_tag
+out = {"cache_tag": tag, "version": "%d.%d" % sys.version_info[:2], "compiled": 0, "reused": 0, "failed": [], "pycs": []}
+for src, cfile, dfile in items:
+    cfile = cfile.replace("{tag}", tag)
+    with open(src, "rb") as f:
+        data = f.read()
+    sh = importlib.util.source_hash(data)
+    try:
+        with open(cfile, "rb") as f:
+            head = f.read(16)
+        if head[:4] == importlib.util.MAGIC_NUMBER and head[8:16] == sh:
+            out["reused"] += 1
+            out["pycs"].append([src, cfile])
+            continue
+    except OSError:
+        pass
+    try:
+        py_compile.compile(src, cfile=cfile, dfile=dfile, doraise=True, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+        out["compiled"] += 1
+        out["pycs"].append([src, cfile])
+    except Exception as e:
+        out["failed"].append({"source": dfile, "error": str(e)})
+json.dump(out, sys.stdout)
+"""
+
+
+def parse_importtime(text: str) -> List[Dict[str, Any]]:
+    modules: List[Dict[str, Any]] = []
+    phase = None
+    for line in text.splitlines():
+        if line.startswith(_PHASE_MARKER):
+            phase = line[len(_PHASE_MARKER):].strip()
+            continue
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cum_us = int(parts[0].strip()), int(parts[1].strip())
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append({"module": name.strip(), "self_ms": round(self_us / 1000.0, 3), "cumulative_ms": round(cum_us / 1000.0, 3), "depth": depth, "phase": phase})
+    return modules
+
+
+def _python_env(project: str, env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    out = os.environ.copy()
+    paths = [os.path.abspath(project)] + ([out["PYTHONPATH"]] if out.get("PYTHONPATH") else [])
+    out["PYTHONPATH"] = os.pathsep.join(paths)
+    out.update(env or {})
+    return out
+
+
+def build_import_index(
+    project: str,
+    entry_point: str,
+    python: Optional[str] = None,
+    width: int = 640,
+    height: int = 480,
+    env: Optional[Dict[str, str]] = None,
+    timeout: float = 300.0,
+) -> Dict[str, Any]:
+    cmd = [python or sys.executable, "-X", "importtime", "-c", _INDEX_SCRIPT, entry_point, str(width), str(height), _PHASE_MARKER]
+    t0 = time.perf_counter()
+    try:
+        res = subprocess.run(cmd, cwd=project, env=_python_env(project, env), capture_output=True, text=True, timeout=timeout)
+    except Exception as e:
+        return {"status": "ERROR", "message": f"import index failed: {e}"}
+    modules = [m for m in parse_importtime(res.stderr or "") if m["phase"] in ("startup", "lazy")]
+    if res.returncode != 0 or not any(m["phase"] == "startup" for m in modules):
+        tail = "\n".join((res.stderr or "").splitlines()[-5:])
+        return {"status": "ERROR", "message": f"import index failed (exit {res.returncode}): {tail}"}
+    roots = [m for m in modules if m["depth"] == 0]
+    return {
+        "status": "OK",
+        "version": INDEX_VERSION,
+        "entry_point": entry_point,
+        "python": _interpreter_version(python),
+        "created_ms": int(time.time() * 1000),
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 3),
+        "startup_ms": round(sum(m["cumulative_ms"] for m in roots if m["phase"] == "startup"), 3),
+        "lazy_ms": round(sum(m["cumulative_ms"] for m in roots if m["phase"] == "lazy"), 3),
+        "modules": modules,
+    }
+
+
+def _interpreter_version(python: Optional[str]) -> str:
+    if not python or os.path.abspath(python) == os.path.abspath(sys.executable):
+        return "%d.%d" % sys.version_info[:2]
+    try:
+        return subprocess.check_output([python, "-c", "import sys; print('%d.%d' % sys.version_info[:2])"], text=True).strip()
+    except Exception:
+        return ""
+
+
+def load_import_index(root: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(root, IMPORT_INDEX_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == INDEX_VERSION and isinstance(data.get("modules"), list):
+            return data
+    except Exception:
+        pass
+    return None
+
+
+def slow_imports(index: Dict[str, Any], threshold_ms: float, phase: Optional[str] = None, top: int = 5) -> List[Dict[str, Any]]:
+    rows = [m for m in index.get("modules") or [] if (phase is None or m.get("phase") == phase) and float(m.get("self_ms") or 0.0) >= threshold_ms]
+    rows.sort(key=lambda m: -float(m.get("self_ms") or 0.0))
+    return [{"module": m["module"], "self_ms": m["self_ms"], "phase": m.get("phase")} for m in rows[:top]]
+
+
+def preload(index: Dict[str, Any], phase: str = "lazy") -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    imported = 0
+    failed: List[str] = []
+    # importtime 按完成顺序列出模块（子模块先于父模块），依次导入即满足依赖顺序
+    for m in index.get("modules") or []:
+        if m.get("phase") != phase or m["module"] in sys.modules:
+            continue
+        try:
+            importlib.import_module(m["module"])
+            imported += 1
+        except Exception:
+            failed.append(m["module"])
+    return {"imported": imported, "failed": failed, "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 3)}
+
+
+def compile_bytecode(items: List[Tuple[str, str]], out_dir: str, python: Optional[str] = None) -> Dict[str, Any]:
+    jobs = []
+    plan: Dict[str, str] = {}
+    for src, arc in items:
+        arc = arc.replace("\\", "/")
+        if not arc.endswith(".py"):
+            continue
+        rel_dir, name = os.path.split(arc)
+        pyc_arc = f"{rel_dir}/__pycache__/{name[:-3]}.{{tag}}.pyc" if rel_dir else f"__pycache__/{name[:-3]}.{{tag}}.pyc"
+        cfile = os.path.join(out_dir, *pyc_arc.split("/"))
+        os.makedirs(os.path.dirname(cfile), exist_ok=True)
+        plan[src] = pyc_arc
+        # dfile 为包内相对路径，traceback 中显示部署后的位置而非构建机路径
+        jobs.append([src, cfile, arc])
+    try:
+        res = subprocess.run([python or sys.executable, "-c", _COMPILE_SCRIPT], input=json.dumps(jobs), capture_output=True, text=True)
+        out = json.loads(res.stdout or "{}")
+    except Exception as e:
+        return {"status": "ERROR", "message": f"bytecode compile failed: {e}"}
+    if "cache_tag" not in out:
+        return {"status": "ERROR", "message": f"bytecode compile failed: {(res.stderr or '').strip()[-500:]}"}
+    tag = out["cache_tag"]
+    members = [(cfile, plan[src].replace("{tag}", tag)) for src, cfile in out["pycs"]]
+    return {
+        "status": "OK",
+        "cache_tag": tag,
+        "python": out["version"],
+        "compiled": out["compiled"],
+        "reused": out["reused"],
+        "failed": out["failed"],
+        "members": members,
+    }
@@ -1,24 +1,352 @@
+import atexit
 import json
+import os
 import sys
+import threading
 import time
-from typing import Any, Dict, Optional
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Union
+
+OVERFLOW_POLICIES = ("drop", "block")
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+# 默认限流按消息分桶的上限；超出后共用一个桶，避免消息中拼入变量时无限增长
+MAX_LIMIT_KEYS = 1024
+_OTHER_KEY = "<other>"
+_LEVEL_NAMES = {v: k for k, v in LEVELS.items()}
+
+_LOGGERS: "weakref.WeakSet[StructuredLogger]" = weakref.WeakSet()
+
+
+def _env_flag(name: str) -> bool:
+    return str(os.environ.get(name) or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def parse_level(level: Union[str, int]) -> int:
+    if isinstance(level, int) and level in _LEVEL_NAMES:
+        return level
+    value = LEVELS.get(str(level).strip().lower())
+    if value is None:
+        raise ValueError(f"level must be one of {tuple(LEVELS)}")
+    return value
+
+
+# 进程内日志级别：默认级别 + 按 logger 名（点分前缀）覆盖；generation 变化时各 logger 重新解析
+_LEVEL_STATE: Dict[str, Any] = {"default": LEVELS.get(str(os.environ.get("PROC_LOG_LEVEL") or "").strip().lower(), 20), "overrides": {}, "generation": 0}
+_LEVEL_LOCK = threading.Lock()
+
+
+def set_level(level: Optional[Union[str, int]], name: Optional[str] = None) -> Dict[str, Any]:
+    with _LEVEL_LOCK:
+        if name is None:
+            _LEVEL_STATE["default"] = parse_level(level if level is not None else "info")
+        elif level is None:
+            _LEVEL_STATE["overrides"].pop(name, None)
+        else:
+            _LEVEL_STATE["overrides"][name] = parse_level(level)
+        _LEVEL_STATE["generation"] += 1
+    return get_levels()
+
+
+def get_levels() -> Dict[str, Any]:
+    return {
+        "default": _LEVEL_NAMES[_LEVEL_STATE["default"]],
+        "loggers": {k: _LEVEL_NAMES[v] for k, v in sorted(_LEVEL_STATE["overrides"].items())},
+    }
+
+
+def _resolve_level(name: Optional[str], fixed: Optional[int]) -> int:
+    overrides = _LEVEL_STATE["overrides"]
+    parts = name.split(".") if name else []
+    for i in range(len(parts), 0, -1):
+        lv = overrides.get(".".join(parts[:i]))
+        if lv is not None:
+            return lv
+    return fixed if fixed is not None else _LEVEL_STATE["default"]
+
+
+class _MessageLimit:
+    __slots__ = ("rate", "burst", "every", "tokens", "last", "seen", "suppressed", "pending")
+
+    def __init__(self, rate: Optional[float], burst: Optional[float], every: Optional[int]):
+        self.rate = float(rate) if rate else None
+        self.burst = max(1.0, float(burst if burst is not None else (rate or 1.0)))
+        self.every = max(1, int(every or 1))
+        self.tokens = self.burst
+        self.last = time.monotonic()
+        self.seen = 0
+        self.suppressed = 0
+        self.pending = 0
+
+    def allow(self, now: float) -> bool:
+        self.seen += 1
+        ok = (self.seen - 1) % self.every == 0
+        if ok and self.rate is not None:
+            # 令牌桶：按速率补充，最多累积 burst 个
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+            else:
+                ok = False
+        if not ok:
+            self.suppressed += 1
+            self.pending += 1
+        return ok
+
+
+def _evaluate(value: Any) -> Any:
+    try:
+        return value()
+    except Exception as e:
+        return f"<lazy field error: {type(e).__name__}: {e}>"
 
 
 class StructuredLogger:
-    def __init__(self, sink: Optional[Any] = None):
+    def __init__(
+        self,
+        sink: Optional[Any] = None,
+        async_mode: Optional[bool] = None,
+        queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+        batch_size: int = 256,
+        flush_interval_ms: float = 50.0,
+        name: Optional[str] = None,
+        level: Optional[Union[str, int]] = None,
+        rate_limit: Optional[float] = None,
+        summary_interval_s: Optional[float] = None,
+    ):
         self.sink = sink or sys.stderr
+        self.name = name
+        self._fixed_level = parse_level(level) if level is not None else None
+        self._level = 0
+        self._level_gen = -1
+        # 未显式指定时读取环境变量，算法内 BaseAlgorithm 创建的 logger 随适配器配置切换
+        self.async_mode = _env_flag("PROC_LOG_ASYNC") if async_mode is None else bool(async_mode)
+        self.queue_size = max(1, int(queue_size or os.environ.get("PROC_LOG_QUEUE_SIZE") or 10000))
+        self.overflow = overflow or os.environ.get("PROC_LOG_OVERFLOW") or "drop"
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_s = max(0.001, float(flush_interval_ms) / 1000.0)
+        self.emitted = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.batches = 0
+        self.write_errors = 0
+        # rate_limit 为每个消息键的默认速率（条/秒）；limit() 可为单个消息设置速率、突发与 1/N 采样
+        self.rate_limit = float(rate_limit if rate_limit is not None else os.environ.get("PROC_LOG_RATE_LIMIT") or 0) or None
+        self.summary_interval_s = float(summary_interval_s if summary_interval_s is not None else os.environ.get("PROC_LOG_SUMMARY_S") or 10.0)
+        self._limits: Dict[str, _MessageLimit] = {}
+        self._limit_lock = threading.Lock()
+        self._next_summary = time.monotonic() + self.summary_interval_s
+        self._last_summary = time.monotonic()
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wake = threading.Event()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        _LOGGERS.add(self)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        lines = []
+        for r in records:
+            try:
+                lines.append(json.dumps(r, ensure_ascii=False))
+            except (TypeError, ValueError):
+                lines.append(json.dumps(r, ensure_ascii=False, default=repr))
+        self.sink.write("\n".join(lines) + "\n")
+        self.sink.flush()
+        self.emitted += len(records)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, name="procvision-log-writer", daemon=True)
+                self._thread.start()
+
+    def _writer(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            self._drain()
+            if self._closed and not self._queue:
+                return
+
+    def _drain(self) -> None:
+        while self._queue:
+            with self._cond:
+                self._busy = True
+            batch = []
+            try:
+                while self._queue and len(batch) < self.batch_size:
+                    batch.append(self._queue.popleft())
+            except IndexError:
+                pass
+            try:
+                if batch:
+                    # 一个批次只做一次 write + flush
+                    self._write(batch)
+                    self.batches += 1
+            except Exception:
+                self.write_errors += 1
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _enqueue(self, record: Dict[str, Any]) -> None:
+        if self._thread is None:
+            self._start()
+        if len(self._queue) >= self.queue_size:
+            if self.overflow == "drop":
+                self.dropped += 1
+                return
+            self.blocked += 1
+            self._wake.set()
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._queue) < self.queue_size or not self._writer_alive(), timeout=None)
+        # deque.append 在 GIL 下原子，生产者热路径不取锁
+        self._queue.append(record)
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def _writer_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _threshold(self) -> int:
+        gen = _LEVEL_STATE["generation"]
+        if self._level_gen != gen:
+            self._level = _resolve_level(self.name, self._fixed_level)
+            self._level_gen = gen
+        return self._level
+
+    def is_enabled(self, level: Union[str, int]) -> bool:
+        return parse_level(level) >= self._threshold()
 
     def _emit(self, level: str, payload: Dict[str, Any]) -> None:
         record: Dict[str, Any] = {"level": level, "timestamp_ms": int(time.time() * 1000)}
-        record.update(payload)
-        self.sink.write(json.dumps(record, ensure_ascii=False) + "\n")
-        self.sink.flush()
+        if self.name:
+            record["logger"] = self.name
+        for k, v in payload.items():
+            # 可调用的字段值延迟到确定输出时才求值（异步模式下在调用线程求值，避免对象后续被修改）
+            record[k] = _evaluate(v) if callable(v) else v
+        if self.async_mode and not self._closed:
+            self._enqueue(record)
+        else:
+            self._write([record])
+
+    def limit(self, message: str, rate: Optional[float] = None, burst: Optional[float] = None, every: Optional[int] = None) -> None:
+        # rate: 每秒最多输出条数（令牌桶，burst 为可累积的突发量）；every: 每 N 条输出 1 条；二者可叠加
+        with self._limit_lock:
+            self._limits[message] = _MessageLimit(rate, burst, every)
+
+    def _allow(self, message: str) -> bool:
+        lim = self._limits.get(message)
+        if lim is None:
+            if self.rate_limit is None:
+                return True
+            with self._limit_lock:
+                key = message if len(self._limits) < MAX_LIMIT_KEYS else _OTHER_KEY
+                lim = self._limits.get(key)
+                if lim is None:
+                    lim = self._limits[key] = _MessageLimit(self.rate_limit, None, None)
+        now = time.monotonic()
+        with self._limit_lock:
+            ok = lim.allow(now)
+        if now >= self._next_summary:
+            self.summarize()
+        return ok
+
+    def summarize(self) -> None:
+        # 汇总上一周期各消息被抑制的条数，输出一条 log_suppressed 记录（不受级别与限流影响）
+        now = time.monotonic()
+        with self._limit_lock:
+            pending = {k: lim.pending for k, lim in self._limits.items() if lim.pending}
+            for k in pending:
+                self._limits[k].pending = 0
+            interval = now - self._last_summary
+            self._last_summary = now
+            self._next_summary = now + self.summary_interval_s
+        if pending:
+            self._emit("info", {"message": "log_suppressed", "suppressed": pending, "interval_s": round(interval, 3)})
 
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        if self._limits:
+            self.summarize()
+        if self._thread is None:
+            return True
+        self._wake.set()
+        with self._cond:
+            return self._cond.wait_for(lambda: (not self._queue and not self._busy) or not self._writer_alive(), timeout=timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        self.flush(timeout)
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def counters(self) -> Dict[str, Any]:
+        # _allow 可能在其他线程插入新键，先在锁内取快照再遍历
+        with self._limit_lock:
+            limits = {k: {"seen": lim.seen, "suppressed": lim.suppressed} for k, lim in self._limits.items()}
+        return {
+            "mode": "async" if self.async_mode else "sync",
+            "emitted": self.emitted,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "queued": len(self._queue),
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "suppressed": sum(v["suppressed"] for v in limits.values()),
+            "limits": limits,
+        }
+
+    # 低于阈值或被限流/采样的记录在构造 record、求值与序列化之前直接返回
     def info(self, message: str, **fields: Any) -> None:
-        self._emit("info", {"message": message, **fields})
+        if 20 >= self._threshold() and self._allow(message):
+            self._emit("info", {"message": message, **fields})
 
     def debug(self, message: str, **fields: Any) -> None:
-        self._emit("debug", {"message": message, **fields})
+        if 10 >= self._threshold() and self._allow(message):
+            self._emit("debug", {"message": message, **fields})
+
+    def warning(self, message: str, **fields: Any) -> None:
+        if 30 >= self._threshold() and self._allow(message):
+            self._emit("warning", {"message": message, **fields})
 
     def error(self, message: str, **fields: Any) -> None:
-        self._emit("error", {"message": message, **fields})
\ No newline at end of file
+        if 40 >= self._threshold() and self._allow(message):
+            self._emit("error", {"message": message, **fields})
+
+
+def flush_loggers(timeout: Optional[float] = 5.0) -> None:
+    # 进程退出、收到终止信号或致命错误时调用，写出所有异步 logger 的积压记录
+    for lg in list(_LOGGERS):
+        try:
+            lg.flush(timeout)
+        except Exception:
+            pass
+
+
+def logger_counters() -> Dict[str, Any]:
+    total: Dict[str, Any] = {"loggers": 0, "async": 0, "emitted": 0, "suppressed": 0, "dropped": 0, "blocked": 0, "queued": 0, "batches": 0, "write_errors": 0}
+    by_message: Dict[str, int] = {}
+    for lg in list(_LOGGERS):
+        c = lg.counters()
+        total["loggers"] += 1
+        total["async"] += 1 if c["mode"] == "async" else 0
+        for k in ("emitted", "suppressed", "dropped", "blocked", "queued", "batches", "write_errors"):
+            total[k] += c[k]
+        for k, v in c["limits"].items():
+            if v["suppressed"]:
+                by_message[k] = by_message.get(k, 0) + v["suppressed"]
+    total["suppressed_by_message"] = dict(sorted(by_message.items(), key=lambda kv: -kv[1])[:20])
+    total["levels"] = get_levels()
+    return total
+
+
+atexit.register(flush_loggers)
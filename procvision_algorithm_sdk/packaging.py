@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# 已压缩或高熵格式：再次 deflate 收益极小，直接 ZIP_STORED
+STORED_EXTS = {
+    ".whl", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".zst",
+    ".onnx", ".pt", ".pth", ".pb", ".tflite", ".engine", ".trt", ".safetensors",
+    ".jpg", ".jpeg", ".png", ".webp", ".gif", ".mp4",
+}
+
+CACHE_VERSION = 1
+COMPRESS_LEVEL = 6
+CHECKSUMS_FILE = "checksums.json"
+CHECKSUMS_VERSION = 1
+_CHUNK = 1024 * 1024
+
+
+def _file_digest(path: str) -> Tuple[str, int]:
+    h = hashlib.sha256()
+    crc = 0
+    with open(path, "rb") as f:
+        while True:
+            buf = f.read(_CHUNK)
+            if not buf:
+                break
+            h.update(buf)
+            crc = zlib.crc32(buf, crc)
+    return h.hexdigest(), crc & 0xFFFFFFFF
+
+
+class BuildCache:
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.files = data.get("files") or {}
+                self.objects = data.get("objects") or {}
+        except Exception:
+            pass
+
+    def object_path(self, sha: str) -> str:
+        return os.path.join(self.objects_dir, sha[:2], sha + ".deflate")
+
+    def digest(self, path: str) -> Tuple[str, int, bool]:
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        with self._lock:
+            ent = self.files.get(key)
+        # 大小与 mtime 未变则信任上次的摘要，跳过重新读取（模型权重可达数百 MB）
+        if ent and ent.get("size") == st.st_size and ent.get("mtime_ns") == st.st_mtime_ns:
+            return ent["sha256"], ent["crc"], True
+        sha, crc = _file_digest(path)
+        with self._lock:
+            self.files[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha, "crc": crc}
+        return sha, crc, False
+
+    def compressed(self, sha: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            meta = self.objects.get(sha)
+        if meta is None:
+            return None
+        if meta.get("stored") or os.path.isfile(self.object_path(sha)):
+            return meta
+        return None
+
+    def compress(self, sha: str, path: str) -> Dict[str, Any]:
+        dst = self.object_path(sha)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+        co = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+        size = 0
+        with open(path, "rb") as src, open(tmp, "wb") as out:
+            while True:
+                buf = src.read(_CHUNK)
+                if not buf:
+                    break
+                size += len(buf)
+                out.write(co.compress(buf))
+            out.write(co.flush())
+        compress_size = os.path.getsize(tmp)
+        if compress_size >= size:
+            # 压缩无收益的文件记为 stored，下次直接跳过压缩尝试
+            os.remove(tmp)
+            meta: Dict[str, Any] = {"stored": True, "size": size}
+        else:
+            os.replace(tmp, dst)
+            meta = {"size": size, "compress_size": compress_size}
+        with self._lock:
+            self.objects[sha] = meta
+        return meta
+
+    def save(self, used: Optional[set] = None) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if used is not None:
+            # 仅保留本次构建引用的对象，避免缓存无限增长
+            for sha in list(self.objects):
+                if sha not in used:
+                    self.objects.pop(sha, None)
+                    try:
+                        os.remove(self.object_path(sha))
+                    except Exception:
+                        pass
+            self.files = {k: v for k, v in self.files.items() if v.get("sha256") in used or os.path.isfile(k)}
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": self.files, "objects": self.objects}, f)
+        os.replace(tmp, self.index_path)
+
+
+# _write_raw 依赖的 CPython zipfile 内部状态：fp（底层文件对象）、filelist / NameToInfo（中央目录登记）、
+# start_dir（中央目录写入位置）、_didModify（close 时是否重写中央目录）；缺任一项则退回 z.write
+_RAW_ATTRS = ("fp", "filelist", "NameToInfo", "start_dir", "_didModify")
+
+
+def _raw_supported(z: zipfile.ZipFile) -> bool:
+    return all(hasattr(z, a) for a in _RAW_ATTRS) and hasattr(z.fp, "tell")
+
+
+def _write_raw(z: zipfile.ZipFile, zinfo: zipfile.ZipInfo, raw_src: str, src: str) -> bool:
+    # zipfile 不支持写入预压缩数据：手工写本地文件头与 raw_src 原始数据，再登记到中央目录；
+    # 内部状态不可用时用 z.write 重新压缩 src，返回 False 表示走了退回路径
+    if not _raw_supported(z):
+        z.write(src, zinfo.filename, compress_type=zinfo.compress_type)
+        return False
+    zinfo.header_offset = z.fp.tell()  # type: ignore[union-attr]
+    z.fp.write(zinfo.FileHeader())  # type: ignore[union-attr]
+    with open(raw_src, "rb") as f:
+        shutil.copyfileobj(f, z.fp, _CHUNK)  # type: ignore[arg-type]
+    z.filelist.append(zinfo)
+    z.NameToInfo[zinfo.filename] = zinfo
+    z.start_dir = z.fp.tell()  # type: ignore[union-attr]
+    z._didModify = True  # type: ignore[attr-defined]
+    return True
+
+
+def build_zip(
+    zip_path: str,
+    members: List[Tuple[str, str]],
+    cache_dir: str,
+    extra: Optional[Dict[str, bytes]] = None,
+    workers: Optional[int] = None,
+    checksums: Optional[str] = None,
+) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    cache = BuildCache(cache_dir)
+    n_workers = max(1, int(workers or os.cpu_count() or 1))
+    stats = {"files": len(members), "hashed": 0, "hash_reused": 0, "compressed": 0, "compress_reused": 0, "stored": 0, "bytes_in": 0, "bytes_out": 0, "raw_fallback": 0}
+
+    def _prepare(item: Tuple[str, str]) -> Dict[str, Any]:
+        src, arc = item
+        sha, crc, reused = cache.digest(src)
+        size = os.path.getsize(src)
+        ext = os.path.splitext(src)[1].lower()
+        plan: Dict[str, Any] = {"src": src, "arc": arc, "sha256": sha, "crc": crc, "size": size, "hash_reused": reused}
+        if ext in STORED_EXTS or size == 0:
+            plan["mode"] = "stored"
+            return plan
+        meta = cache.compressed(sha)
+        plan["compress_reused"] = meta is not None
+        if meta is None:
+            meta = cache.compress(sha, src)
+        plan["mode"] = "stored" if meta.get("stored") else "deflated"
+        plan["compress_size"] = meta.get("compress_size")
+        return plan
+
+    # zlib 与 hashlib 处理大块数据时释放 GIL，线程池即可利用多核
+    with ThreadPoolExecutor(max_workers=n_workers) as ex:
+        plans = list(ex.map(_prepare, members))
+
+    tmp_zip = zip_path + ".tmp"
+    used = set()
+    with zipfile.ZipFile(tmp_zip, "w", zipfile.ZIP_DEFLATED) as z:
+        for plan in plans:
+            zinfo = zipfile.ZipInfo.from_file(plan["src"], plan["arc"])
+            plan["name"] = zinfo.filename
+            if zinfo.filename in z.NameToInfo:
+                continue
+            zinfo.CRC = plan["crc"]
+            zinfo.file_size = plan["size"]
+            if plan["mode"] == "deflated":
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                zinfo.compress_size = plan["compress_size"]
+                raw = _write_raw(z, zinfo, cache.object_path(plan["sha256"]), plan["src"])
+                stats["compress_reused" if plan["compress_reused"] else "compressed"] += 1
+                used.add(plan["sha256"])
+            else:
+                zinfo.compress_type = zipfile.ZIP_STORED
+                zinfo.compress_size = plan["size"]
+                raw = _write_raw(z, zinfo, plan["src"], plan["src"])
+                stats["stored"] += 1
+                if plan["size"]:
+                    used.add(plan["sha256"])
+            stats["raw_fallback"] += 0 if raw else 1
+            stats["hash_reused" if plan["hash_reused"] else "hashed"] += 1
+            stats["bytes_in"] += plan["size"]
+        files: Dict[str, Dict[str, Any]] = {}
+        for plan in plans:
+            files.setdefault(plan["name"], {"sha256": plan["sha256"], "size": plan["size"]})
+        for arc, data in (extra or {}).items():
+            z.writestr(arc, data)
+            files[z.infolist()[-1].filename] = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+        if checksums:
+            # 校验清单覆盖包内除自身外的全部成员，供 deploy 解压时逐个比对
+            doc = {"version": CHECKSUMS_VERSION, "algorithm": "sha256", "files": files}
+            z.writestr(checksums, json.dumps(doc, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8"))
+    os.replace(tmp_zip, zip_path)
+    cache.save(used)
+    stats["bytes_out"] = os.path.getsize(zip_path)
+    return {
+        "zip": zip_path,
+        "cache_dir": cache.cache_dir,
+        "workers": n_workers,
+        "elapsed_s": round(time.perf_counter() - t0, 3),
+        "stats": stats,
+        "members": [{"path": p["name"], "sha256": p["sha256"], "size": p["size"]} for p in plans],
+    }
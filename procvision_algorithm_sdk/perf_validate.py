@@ -0,0 +1,134 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .bench import _resources, percentiles, prepare_images, release_images
+from .client import AdapterClient
+from .replay import DEFAULT_IGNORE, diff_values
+
+# manifest.json 中 "performance" 段的默认值；未声明的预算不做拒绝，仅在报告中给出实测值
+DEFAULT_PERF = {
+    "image_width": 640,
+    "image_height": 480,
+    "calls": 50,
+    "warmup": 3,
+    "p99_budget_ms": None,
+    "max_rss_growth_mb": 32.0,
+    "first_call_budget_ms": None,
+    "max_first_call_ratio": None,
+    "deterministic": True,
+}
+
+
+def load_perf_spec(project: str) -> Dict[str, Any]:
+    with open(os.path.join(project, "manifest.json"), "r", encoding="utf-8") as f:
+        mf = json.load(f)
+    spec = mf.get("performance") or {}
+    if not isinstance(spec, dict):
+        raise ValueError("manifest.json performance 必须为对象")
+    return {**DEFAULT_PERF, **spec}
+
+
+def _check(name: str, ok: bool, message: str) -> Dict[str, Any]:
+    return {"name": name, "result": "PASS" if ok else "FAIL", "message": message}
+
+
+def _output(frame: Dict[str, Any]) -> Dict[str, Any]:
+    if frame.get("type") != "result":
+        return {"type": frame.get("type"), "error_code": frame.get("error_code"), "message": frame.get("message")}
+    return {"status": frame.get("status"), "message": frame.get("message"), "data": frame.get("data")}
+
+
+def manifest_perf_checks(
+    project: str,
+    entry: Optional[str] = None,
+    calls: Optional[int] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    try:
+        spec = load_perf_spec(project)
+    except Exception as e:
+        return [_check("perf_spec", False, str(e))]
+    n = int(calls or spec["calls"])
+    w, h = int(spec["image_width"]), int(spec["image_height"])
+    # 固定种子的合成图像，多次运行输入完全一致
+    pairs = prepare_images(f"perf-{int(time.time() * 1000)}", None, w, h)
+    p = pairs[0]
+    data = {
+        "step_index": 1,
+        "step_desc": "validate-perf",
+        "guide_info": [],
+        "cur_image_shm_id": p["cur_image_shm_id"],
+        "cur_image_meta": p["cur_image_meta"],
+        "guide_image_shm_id": p["guide_image_shm_id"],
+        "guide_image_meta": p["guide_image_meta"],
+    }
+    outputs: List[Dict[str, Any]] = []
+    latencies: List[float] = []
+    try:
+        with AdapterClient(project, entry=entry, env=env, call_timeout_s=timeout, auto_restart=False) as client:
+            client.stats(timeout=300.0)
+            t0 = time.perf_counter()
+            frame = client.call(data, timeout=timeout)
+            first_call_ms = (time.perf_counter() - t0) * 1000.0
+            outputs.append(_output(frame))
+            for _ in range(max(0, int(spec["warmup"]))):
+                outputs.append(_output(client.call(data, timeout=timeout)))
+            before = _resources(client.stats())
+            for _ in range(n):
+                t0 = time.perf_counter()
+                frame = client.call(data, timeout=timeout)
+                latencies.append((time.perf_counter() - t0) * 1000.0)
+                outputs.append(_output(frame))
+            after = _resources(client.stats())
+        fresh: Optional[Dict[str, Any]] = None
+        if spec["deterministic"]:
+            # 新进程再跑一次，覆盖随机种子、全局状态等跨进程不确定性
+            with AdapterClient(project, entry=entry, env=env, call_timeout_s=timeout, auto_restart=False) as client:
+                fresh = _output(client.call(data, timeout=timeout))
+    except Exception as e:
+        return [_check("perf_run", False, f"{type(e).__name__}: {e}")]
+    finally:
+        release_images(pairs)
+
+    checks: List[Dict[str, Any]] = []
+    errors = sum(1 for o in outputs if o.get("status") != "OK")
+    checks.append(_check("perf_calls_ok", errors == 0, f"{len(outputs)} 次调用，失败 {errors}"))
+    lat = percentiles(latencies)
+    budget = spec["p99_budget_ms"]
+    res = f"{w}x{h}"
+    if budget is None:
+        checks.append(_check("perf_p99_budget", True, f"p99={lat['p99_ms']}ms @ {res}（manifest 未声明 performance.p99_budget_ms）"))
+    else:
+        checks.append(_check("perf_p99_budget", lat["p99_ms"] <= float(budget), f"p99={lat['p99_ms']}ms 预算 {budget}ms @ {res}，n={n}"))
+
+    rb, ra = before.get("rss_bytes"), after.get("rss_bytes")
+    if rb is None or ra is None:
+        checks.append(_check("perf_rss_growth", True, "RSS 不可用，跳过"))
+    else:
+        growth_mb = round((ra - rb) / (1024.0 * 1024.0), 3)
+        limit = float(spec["max_rss_growth_mb"])
+        checks.append(_check("perf_rss_growth", growth_mb <= limit, f"{n} 次调用 RSS 增长 {growth_mb}MB 上限 {limit}MB"))
+
+    if spec["deterministic"]:
+        # 只比对 data 中的检测结果；timing 与 debug 等诊断字段不参与
+        ignore = tuple(DEFAULT_IGNORE) + ("debug",)
+        ref = outputs[0]
+        diffs = [(i, d) for i, o in enumerate(outputs[1:] + [fresh], start=1) for d in diff_values(ref, o, ignore)[:1]]
+        msg = f"{len(outputs) + 1} 次输出一致（含新进程）" if not diffs else f"{len(diffs)} 次输出与首次不同，如第 {diffs[0][0]} 次: {diffs[0][1]}"
+        checks.append(_check("perf_determinism", not diffs, msg))
+
+    steady = lat["p50_ms"]
+    ratio = round(first_call_ms / steady, 2) if steady > 0 else None
+    msg = f"首次 {round(first_call_ms, 3)}ms / 稳态 p50 {steady}ms（{ratio}x）"
+    ok = True
+    if spec["first_call_budget_ms"] is not None:
+        ok = ok and first_call_ms <= float(spec["first_call_budget_ms"])
+        msg += f" 预算 {spec['first_call_budget_ms']}ms"
+    if spec["max_first_call_ratio"] is not None and ratio is not None:
+        ok = ok and ratio <= float(spec["max_first_call_ratio"])
+        msg += f" 倍数上限 {spec['max_first_call_ratio']}x"
+    checks.append(_check("perf_first_call", ok, msg))
+    return checks
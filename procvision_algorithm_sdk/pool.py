@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .client import ADAPTER_EXIT_ERROR_CODE, AdapterClient, _error_frame
+
+
+class _Member:
+    def __init__(self, name: str, index: int, client: AdapterClient) -> None:
+        self.name = name
+        self.index = index
+        self.client = client
+        self.failures = 0
+        self.served = 0
+        self.replaced = 0
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "pid": self.client.pid,
+            "alive": self.client.alive,
+            "outstanding": self.client.outstanding,
+            "served": self.served,
+            "failures": self.failures,
+            "replaced": self.replaced,
+            "restarts": self.client.restarts,
+        }
+
+
+class AdapterPool:
+    def __init__(
+        self,
+        health_interval_s: float = 5.0,
+        health_timeout_s: float = 2.0,
+        max_failures: int = 2,
+    ) -> None:
+        self.health_interval_s = health_interval_s
+        self.health_timeout_s = health_timeout_s
+        self.max_failures = max_failures
+        self._members: Dict[str, List[_Member]] = {}
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._rr = 0
+        self._accepting = True
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "AdapterPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def add(self, project: str, replicas: int = 1, name: Optional[str] = None, **client_kwargs: Any) -> str:
+        if not name:
+            try:
+                with open(os.path.join(project, "manifest.json"), "r", encoding="utf-8") as f:
+                    name = str(json.load(f).get("name") or "")
+            except Exception:
+                name = ""
+            name = name or os.path.basename(os.path.abspath(project))
+        client_kwargs.setdefault("auto_restart", False)
+        spec = {"project": project, "kwargs": client_kwargs}
+        members = [_Member(name, i, self._new_client(spec)) for i in range(max(1, int(replicas)))]
+        try:
+            for m in members:
+                m.client.start()
+        except Exception:
+            # 任一副本启动失败：关闭已启动的副本，不留下未登记的适配器进程
+            for m in members:
+                try:
+                    m.client.close(timeout=0.5)
+                except Exception:
+                    pass
+            raise
+        with self._lock:
+            self._specs[name] = spec
+            self._members.setdefault(name, []).extend(members)
+        if self.health_interval_s > 0 and self._health_thread is None:
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+            self._health_thread.start()
+        return name
+
+    def _new_client(self, spec: Dict[str, Any]) -> AdapterClient:
+        return AdapterClient(spec["project"], **spec["kwargs"])
+
+    def _snapshot(self) -> Dict[str, List[_Member]]:
+        with self._lock:
+            return {name: list(members) for name, members in self._members.items()}
+
+    def _pick(self, name: str) -> Optional[_Member]:
+        with self._lock:
+            members = [m for m in self._members.get(name, []) if m.client.alive]
+            if not members:
+                return None
+            # 最少在途请求优先；并列时轮询，避免总落在第一个副本
+            self._rr += 1
+            n = len(members)
+            return min((members[(self._rr + i) % n] for i in range(n)), key=lambda m: m.client.outstanding)
+
+    def call(self, name: str, data: Dict[str, Any], timeout: Optional[float] = None, request_id: Optional[str] = None, on_partial: Any = None) -> Dict[str, Any]:
+        if not self._accepting:
+            return _error_frame(request_id, "pool draining", ADAPTER_EXIT_ERROR_CODE)
+        member = self._pick(name)
+        if member is None:
+            self._replace_dead(name)
+            member = self._pick(name)
+        if member is None:
+            return _error_frame(request_id, f"no healthy adapter for {name}", ADAPTER_EXIT_ERROR_CODE)
+        member.served += 1
+        frame = member.client.call(data, timeout=timeout, request_id=request_id, on_partial=on_partial)
+        if frame.get("type") == "error" and not member.client.alive:
+            self._replace(member)
+        return frame
+
+    def _replace(self, member: _Member) -> None:
+        spec = self._specs.get(member.name)
+        if spec is None or self._stop.is_set():
+            return
+        old = member.client
+        with self._lock:
+            if member.client is not old:
+                return
+            member.client = self._new_client(spec)
+            member.failures = 0
+            member.replaced += 1
+        try:
+            old.close(timeout=0.5)
+        except Exception:
+            pass
+        try:
+            member.client.start()
+        except Exception:
+            member.failures += 1
+
+    def _replace_dead(self, name: str) -> None:
+        for m in self._snapshot().get(name, []):
+            if not m.client.alive:
+                self._replace(m)
+
+    def health_check(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {}
+        # 在锁内取快照，ping 与替换在锁外进行
+        for name, members in self._snapshot().items():
+            for m in members:
+                if not m.client.alive:
+                    m.failures = self.max_failures
+                elif m.client.outstanding == 0:
+                    # 适配器单线程：执行中的副本 pong 会排在 execute 之后，只探测空闲副本
+                    m.failures = 0 if m.client.ping(self.health_timeout_s) else m.failures + 1
+                if m.failures >= self.max_failures:
+                    self._replace(m)
+            report[name] = [m.status() for m in members]
+        return report
+
+    def _health_loop(self) -> None:
+        while not self._stop.wait(self.health_interval_s):
+            try:
+                self.health_check()
+            except Exception:
+                pass
+
+    def clients(self, name: str) -> List[AdapterClient]:
+        with self._lock:
+            return [m.client for m in self._members.get(name, [])]
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: [m.status() for m in members] for name, members in self._members.items()}
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        self._accepting = False
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if all(m.client.outstanding == 0 for ms in self._snapshot().values() for m in ms):
+                return True
+            time.sleep(0.02)
+        return False
+
+    def close(self, drain_timeout: float = 30.0) -> None:
+        self.drain(drain_timeout)
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=1.0)
+        with self._lock:
+            members = [m for ms in self._members.values() for m in ms]
+            self._members.clear()
+        for m in members:
+            try:
+                m.client.close()
+            except Exception:
+                pass
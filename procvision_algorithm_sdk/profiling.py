@@ -0,0 +1,265 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+CPU_MODES = ("cprofile", "sample", "none")
+
+
+def _frame_label(code: Any) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _StackSampler:
+    def __init__(self, interval_s: float = 0.001) -> None:
+        self.interval_s = interval_s
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._target: Optional[int] = None
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._switch: Optional[float] = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self._active.wait(0.1):
+                continue
+            frame = sys._current_frames().get(self._target or 0)
+            if frame is not None:
+                labels: List[str] = []
+                while frame is not None:
+                    if frame.f_code.co_filename == __file__:
+                        # 栈顶落在剖析器自身（进入/退出 execute 的边界），丢弃该样本
+                        labels = []
+                        break
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if labels:
+                    self.stacks[";".join(reversed(labels))] += 1
+                    self.samples += 1
+            time.sleep(self.interval_s)
+
+    def begin(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._target = threading.get_ident()
+        # 纯 Python 热循环只在 GIL 切换时让出，缩短切换间隔以提高采样分辨率
+        self._switch = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch, self.interval_s))
+        self._active.set()
+
+    def end(self) -> None:
+        self._active.clear()
+        if self._switch is not None:
+            sys.setswitchinterval(self._switch)
+            self._switch = None
+
+    def close(self) -> None:
+        self.end()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def top(self, n: int) -> List[Dict[str, Any]]:
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for f in set(frames):
+                total_counts[f] += count
+        total = max(1, self.samples)
+        return [
+            {"function": f, "self_samples": c, "self_pct": round(c * 100.0 / total, 2), "total_pct": round(total_counts[f] * 100.0 / total, 2)}
+            for f, c in self_counts.most_common(n)
+        ]
+
+
+def write_collapsed(stacks: Dict[str, int], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in sorted(stacks.items(), key=lambda kv: -kv[1]):
+            if count > 0:
+                f.write(f"{stack} {int(count)}\n")
+
+
+class ExecuteProfiler:
+    def __init__(
+        self,
+        output_dir: str,
+        calls: int = 20,
+        skip: int = 0,
+        cpu: str = "cprofile",
+        memory: bool = True,
+        top: int = 20,
+        memory_frames: int = 25,
+        sample_interval_s: float = 0.001,
+        on_written: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        if cpu not in CPU_MODES:
+            raise ValueError(f"unknown cpu profiler mode: {cpu}")
+        self.output_dir = output_dir
+        self.calls = max(1, int(calls))
+        self.skip = max(0, int(skip))
+        self.cpu = cpu
+        self.memory = memory
+        self.top = top
+        self.memory_frames = memory_frames
+        self.on_written = on_written
+        self.seen = 0
+        self.profiled = 0
+        self.summary: Optional[Dict[str, Any]] = None
+        self._durations: List[float] = []
+        self._peaks: List[int] = []
+        self._profile: Optional[cProfile.Profile] = cProfile.Profile() if cpu == "cprofile" else None
+        self._sampler: Optional[_StackSampler] = _StackSampler(sample_interval_s) if cpu == "sample" else None
+        self._growth: Dict[str, Any] = {}
+        self._alloc_stacks: Dict[str, int] = {}
+        self._started_tracemalloc = False
+
+    @property
+    def done(self) -> bool:
+        return self.summary is not None
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        self.seen += 1
+        if self.done or self.seen <= self.skip:
+            yield
+            return
+        before: Optional[tracemalloc.Snapshot] = None
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.memory_frames)
+                self._started_tracemalloc = True
+            # 每次调用前后各取快照，只统计 execute 内的分配，排除适配器自身的解码/序列化
+            before = tracemalloc.take_snapshot()
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            mem0 = tracemalloc.get_traced_memory()[0]
+        if self._sampler is not None:
+            self._sampler.begin()
+        if self._profile is not None:
+            self._profile.enable()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._durations.append((time.perf_counter() - t0) * 1000.0)
+            if self._profile is not None:
+                self._profile.disable()
+            if self._sampler is not None:
+                self._sampler.end()
+            if before is not None:
+                self._peaks.append(max(0, tracemalloc.get_traced_memory()[1] - mem0))
+                self._accumulate(before, tracemalloc.take_snapshot())
+            self.profiled += 1
+            if self.profiled >= self.calls:
+                self.write()
+
+    def _cpu_top(self) -> List[Dict[str, Any]]:
+        if self._profile is None:
+            return self._sampler.top(self.top) if self._sampler is not None else []
+        st = pstats.Stats(self._profile)
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _callers) in st.stats.items():  # type: ignore[attr-defined]
+            rows.append(
+                {
+                    "function": f"{func} ({os.path.basename(filename)}:{line})",
+                    "calls": nc,
+                    "tottime_ms": round(tt * 1000.0, 3),
+                    "cumtime_ms": round(ct * 1000.0, 3),
+                }
+            )
+        rows.sort(key=lambda r: -r["cumtime_ms"])
+        return rows[: self.top]
+
+    def _accumulate(self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> None:
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        before = before.filter_traces(ignore)
+        after = after.filter_traces(ignore)
+        for d in after.compare_to(before, "lineno"):
+            if d.size_diff > 0:
+                fr = d.traceback[0]
+                key = f"{os.path.basename(fr.filename)}:{fr.lineno}"
+                size, count = self._growth.get(key, (0, 0))
+                self._growth[key] = (size + d.size_diff, count + d.count_diff)
+        for d in after.compare_to(before, "traceback"):
+            if d.size_diff > 0:
+                key = ";".join(f"{os.path.basename(fr.filename)}:{fr.lineno}" for fr in d.traceback)
+                self._alloc_stacks[key] = self._alloc_stacks.get(key, 0) + d.size_diff
+
+    def _memory_report(self, files: Dict[str, str]) -> Dict[str, Any]:
+        if not self.memory or not self._peaks:
+            return {}
+        path = os.path.join(self.output_dir, "alloc.collapsed")
+        write_collapsed(self._alloc_stacks, path)
+        files["alloc_collapsed"] = path
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        growth = sorted(self._growth.items(), key=lambda kv: -kv[1][0])
+        return {
+            "peak_per_call_bytes": max(self._peaks),
+            "mean_peak_per_call_bytes": int(sum(self._peaks) / len(self._peaks)),
+            "retained_bytes": sum(v[0] for v in self._growth.values()),
+            "top": [{"location": k, "size_diff_bytes": v[0], "count_diff": v[1]} for k, v in growth[: self.top]],
+        }
+
+    def write(self) -> Optional[Dict[str, Any]]:
+        if self.done:
+            return self.summary
+        if self.profiled == 0:
+            self.close()
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        files: Dict[str, str] = {}
+        if self._profile is not None:
+            path = os.path.join(self.output_dir, "cpu.prof")
+            self._profile.dump_stats(path)
+            files["cpu_prof"] = path
+        if self._sampler is not None:
+            self._sampler.close()
+            path = os.path.join(self.output_dir, "cpu.collapsed")
+            write_collapsed(dict(self._sampler.stacks), path)
+            files["cpu_collapsed"] = path
+        memory = self._memory_report(files)
+        d = sorted(self._durations)
+        summary: Dict[str, Any] = {
+            "calls": self.profiled,
+            "skipped": self.skip,
+            "cpu_mode": self.cpu,
+            "execute_ms": {"mean": round(sum(d) / len(d), 3), "min": round(d[0], 3), "max": round(d[-1], 3)},
+            "cpu_top": self._cpu_top(),
+            "memory": memory,
+            "files": files,
+        }
+        if self._sampler is not None:
+            summary["samples"] = self._sampler.samples
+        path = os.path.join(self.output_dir, "summary.json")
+        files["summary"] = path
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        self.summary = summary
+        if self.on_written is not None:
+            try:
+                self.on_written(summary)
+            except Exception:
+                pass
+        return summary
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        if not self.done and self.profiled > 0:
+            return self.write()
+        if self._sampler is not None:
+            self._sampler.close()
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return self.summary
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+from .framing import encode_frame, read_exact, read_frame
+from .serialization import loads
+from .shared_memory import dev_read_shared_memory_raw
+
+CAPTURE_VERSION = 1
+
+_SHM_KEYS = ("cur_image_shm_id", "guide_image_shm_id")
+
+
+class TrafficRecorder:
+    def __init__(self, path: str, capture_images: bool = True) -> None:
+        self.path = path
+        self.capture_images = capture_images
+        self.frames = 0
+        self.blobs = 0
+        self._fp = open(path, "wb")
+        self._t0 = time.perf_counter()
+        self._digests: set = set()
+        self._lock = threading.Lock()
+        self._write({"kind": "header", "version": CAPTURE_VERSION, "created_ms": int(time.time() * 1000), "pid": os.getpid()})
+
+    def _t_ms(self) -> float:
+        return round((time.perf_counter() - self._t0) * 1000.0, 3)
+
+    def _write(self, record: Dict[str, Any], blob: Optional[bytes] = None) -> None:
+        with self._lock:
+            if self._fp is None:
+                return
+            self._fp.write(encode_frame(record))
+            if blob is not None:
+                # 图像数据以裸长度前缀块紧跟其元数据记录，避免 JSON 内 base64 膨胀
+                self._fp.write(len(blob).to_bytes(4, byteorder="big") + blob)
+            # 每条记录落盘，适配器崩溃时抓包仍可用
+            self._fp.flush()
+
+    def _capture_shm(self, shm_id: str) -> Optional[str]:
+        raw = dev_read_shared_memory_raw(shm_id)
+        if raw is None:
+            return None
+        fmt, data = raw
+        digest = hashlib.sha1(data).hexdigest()
+        if digest not in self._digests:
+            self._digests.add(digest)
+            # 已压缩格式（JPEG/PNG 等 .bin）不再压缩；原始数组用快速 zlib
+            payload = zlib.compress(data, 1) if fmt == "npy" else data
+            self._write({"kind": "blob", "digest": digest, "format": fmt, "compression": "zlib" if fmt == "npy" else "none", "size": len(data)}, payload)
+            self.blobs += 1
+        return digest
+
+    def inbound(self, frame: Dict[str, Any]) -> None:
+        try:
+            record: Dict[str, Any] = {"kind": "in", "t_ms": self._t_ms(), "frame": frame}
+            if self.capture_images and frame.get("type") == "call":
+                d = frame.get("data") or {}
+                refs = {}
+                for key in _SHM_KEYS:
+                    shm_id = d.get(key)
+                    if shm_id and shm_id not in refs:
+                        refs[shm_id] = self._capture_shm(str(shm_id))
+                record["shm"] = refs
+            self._write(record)
+            self.frames += 1
+        except Exception:
+            pass
+
+    def outbound(self, data: bytes) -> None:
+        try:
+            self._write({"kind": "out", "t_ms": self._t_ms(), "frame": loads(data)})
+            self.frames += 1
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            fp, self._fp = self._fp, None
+        if fp is not None:
+            try:
+                fp.close()
+            except Exception:
+                pass
+
+
+def read_capture(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as fp:
+        while True:
+            record = read_frame(fp)
+            if record is None:
+                return
+            if record.get("kind") == "blob":
+                h = read_exact(fp, 4)
+                if h is None:
+                    return
+                payload = read_exact(fp, int.from_bytes(h, byteorder="big"))
+                if payload is None:
+                    return
+                record["data"] = zlib.decompress(payload) if record.get("compression") == "zlib" else payload
+            yield record
@@ -0,0 +1,180 @@
+import json
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .bench import bench
+
+BASELINE_VERSION = 1
+
+# 指标 -> 变差方向；阈值为相对变化百分比
+METRICS = {
+    "p50_ms": "higher_is_worse",
+    "p99_ms": "higher_is_worse",
+    "throughput_per_s": "lower_is_worse",
+    "peak_rss_bytes": "higher_is_worse",
+    "ready_ms": "higher_is_worse",
+}
+
+DEFAULT_THRESHOLDS = {"p50_ms": 10.0, "p99_ms": 20.0, "throughput_per_s": 10.0, "peak_rss_bytes": 10.0, "ready_ms": 20.0}
+
+# 双侧 95% t 分布临界值（自由度 1..30），更大自由度近似 1.96
+_T95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228, 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+_BENCH_ARGS = ("calls", "warmup", "concurrency", "replicas", "rate", "images", "width", "height", "step_index", "step_desc", "guide_info", "timeout")
+
+
+def t_critical(df: float) -> float:
+    if df < 1:
+        return float("inf")
+    i = int(math.floor(df))
+    return _T95[i - 1] if i <= len(_T95) else 1.96
+
+
+def describe(values: List[float]) -> Dict[str, Any]:
+    n = len(values)
+    mean = sum(values) / n if n else 0.0
+    stdev = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1)) if n > 1 else 0.0
+    half = t_critical(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "n": n,
+        "mean": round(mean, 3),
+        "stdev": round(stdev, 3),
+        "ci95": [round(mean - half, 3), round(mean + half, 3)],
+        "values": [round(v, 3) for v in values],
+    }
+
+
+def _metric_values(report: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    return {
+        "p50_ms": (report.get("latency") or {}).get("p50_ms"),
+        "p99_ms": (report.get("latency") or {}).get("p99_ms"),
+        "throughput_per_s": report.get("throughput_per_s"),
+        "peak_rss_bytes": (report.get("resources") or {}).get("peak_rss_bytes"),
+        "ready_ms": report.get("ready_ms"),
+    }
+
+
+def summarize_runs(reports: List[Dict[str, Any]], bench_args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {}
+    for name in METRICS:
+        vals = [float(v) for v in (_metric_values(r)[name] for r in reports) if v is not None]
+        if vals:
+            metrics[name] = describe(vals)
+    return {
+        "runs": len(reports),
+        "errors": sum(1 for r in reports if r.get("status") != "OK"),
+        "bench_args": dict(bench_args or {}),
+        "metrics": metrics,
+    }
+
+
+def run_scenario(project: str, repeat: int = 5, entry: Optional[str] = None, env: Optional[Dict[str, str]] = None, **bench_args: Any) -> Dict[str, Any]:
+    reports = []
+    for _ in range(max(1, int(repeat))):
+        # 每轮使用新的适配器进程，使进程级噪声（布局、缓存、调度）体现在置信区间中
+        reports.append(bench(project, entry=entry, env=env, **bench_args))
+    return summarize_runs(reports, {k: v for k, v in bench_args.items() if k in _BENCH_ARGS})
+
+
+def default_scenario_name(bench_args: Dict[str, Any]) -> str:
+    src = os.path.basename(str(bench_args.get("images")).rstrip("/\\")) if bench_args.get("images") else f"{bench_args.get('width', 640)}x{bench_args.get('height', 480)}"
+    name = f"{src}-c{bench_args.get('concurrency', 1)}"
+    if bench_args.get("rate"):
+        name += f"-r{bench_args['rate']:g}"
+    return name
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or "scenarios" not in data:
+        raise ValueError(f"not a baseline file: {path}")
+    return data
+
+
+def save_baseline(path: str, scenarios: Dict[str, Dict[str, Any]], project: Optional[str] = None) -> Dict[str, Any]:
+    try:
+        data = load_baseline(path)
+    except Exception:
+        data = {"version": BASELINE_VERSION, "scenarios": {}}
+    data["version"] = BASELINE_VERSION
+    data["created_ms"] = int(time.time() * 1000)
+    if project:
+        try:
+            with open(os.path.join(project, "manifest.json"), "r", encoding="utf-8") as f:
+                mf = json.load(f)
+            data["algorithm"] = {"name": mf.get("name"), "version": mf.get("version")}
+        except Exception:
+            pass
+    data["scenarios"].update(scenarios)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return data
+
+
+def compare_metric(metric: str, base: Dict[str, Any], cur: Dict[str, Any], threshold_pct: float) -> Dict[str, Any]:
+    bm, cm = float(base["mean"]), float(cur["mean"])
+    change_pct = round((cm - bm) / bm * 100.0, 2) if bm else 0.0
+    worse_pct = change_pct if METRICS[metric] == "higher_is_worse" else -change_pct
+    nb, nc = int(base.get("n", 1)), int(cur.get("n", 1))
+    sb, sc = float(base.get("stdev", 0.0)), float(cur.get("stdev", 0.0))
+    significant = True
+    t_stat: Optional[float] = None
+    if nb > 1 and nc > 1:
+        vb, vc = sb * sb / nb, sc * sc / nc
+        se = math.sqrt(vb + vc)
+        if se > 0:
+            # Welch t 检验：仅当差异超出两侧重复运行的噪声时才判定为回归
+            t_stat = abs(cm - bm) / se
+            df = (vb + vc) ** 2 / (vb * vb / (nb - 1) + vc * vc / (nc - 1))
+            significant = t_stat > t_critical(df)
+    regressed = worse_pct > threshold_pct and significant
+    return {
+        "metric": metric,
+        "baseline": bm,
+        "current": cm,
+        "change_pct": change_pct,
+        "threshold_pct": threshold_pct,
+        "t_stat": round(t_stat, 3) if t_stat is not None else None,
+        "significant": significant,
+        "result": "FAIL" if regressed else "PASS",
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], thresholds: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    th = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    checks: List[Dict[str, Any]] = []
+    for name, base in (baseline.get("scenarios") or {}).items():
+        cur = (current.get("scenarios") or {}).get(name)
+        if cur is None:
+            checks.append({"scenario": name, "metric": "*", "result": "SKIP", "message": "scenario missing in current run"})
+            continue
+        if cur.get("errors"):
+            checks.append({"scenario": name, "metric": "errors", "result": "FAIL", "message": f"{cur['errors']} run(s) with failed calls"})
+        for metric, bstats in (base.get("metrics") or {}).items():
+            cstats = (cur.get("metrics") or {}).get(metric)
+            if metric not in METRICS or cstats is None:
+                continue
+            checks.append({"scenario": name, **compare_metric(metric, bstats, cstats, float(th.get(metric, 10.0)))})
+    failed = sum(1 for c in checks if c["result"] == "FAIL")
+    return {"status": "FAIL" if failed else "PASS", "failed": failed, "thresholds": th, "checks": checks}
+
+
+def rerun_baseline(project: str, baseline: Dict[str, Any], repeat: Optional[int] = None, entry: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    scenarios = {}
+    for name, base in (baseline.get("scenarios") or {}).items():
+        scenarios[name] = run_scenario(project, repeat=repeat or int(base.get("runs") or 5), entry=entry, env=env, **(base.get("bench_args") or {}))
+    return {"version": BASELINE_VERSION, "scenarios": scenarios}
+
+
+def parse_thresholds(items: Optional[List[str]]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in METRICS or not value:
+            raise ValueError(f"invalid threshold: {item} (expected one of {', '.join(METRICS)}=<pct>)")
+        out[key] = float(value.strip().rstrip("%"))
+    return out
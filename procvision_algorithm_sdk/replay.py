@@ -0,0 +1,178 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .bench import percentiles
+from .client import AdapterClient
+from .recording import read_capture
+from .shared_memory import dev_restore_shared_memory_raw, release_shared_memory
+
+DEFAULT_IGNORE = ("timestamp_ms", "timing")
+
+_COMPARED = ("type", "status", "message", "error_code", "data")
+
+
+def diff_values(a: Any, b: Any, ignore: Any = DEFAULT_IGNORE, path: str = "") -> List[str]:
+    if isinstance(a, dict) and isinstance(b, dict):
+        out: List[str] = []
+        for k in sorted(set(a) | set(b), key=str):
+            if k in ignore:
+                continue
+            p = f"{path}.{k}" if path else str(k)
+            if k not in a or k not in b:
+                out.append(p)
+            else:
+                out.extend(diff_values(a[k], b[k], ignore, p))
+        return out
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return [f"{path}[len {len(a)}!={len(b)}]"]
+        out = []
+        for i, (x, y) in enumerate(zip(a, b)):
+            out.extend(diff_values(x, y, ignore, f"{path}[{i}]"))
+        return out
+    if isinstance(a, float) or isinstance(b, float):
+        try:
+            if abs(float(a) - float(b)) <= 1e-6 * max(1.0, abs(float(a)), abs(float(b))):
+                return []
+        except (TypeError, ValueError):
+            pass
+    return [] if a == b else [path or "<root>"]
+
+
+def _latency(frame: Optional[Dict[str, Any]], fallback: Optional[float] = None) -> Optional[float]:
+    timing = (frame or {}).get("timing") or {}
+    total = timing.get("total_ms")
+    return float(total) if isinstance(total, (int, float)) else fallback
+
+
+def load_capture(path: str) -> Dict[str, Any]:
+    blobs: Dict[str, Dict[str, Any]] = {}
+    calls: List[Dict[str, Any]] = []
+    responses: Dict[str, Dict[str, Any]] = {}
+    capabilities: List[str] = []
+    for rec in read_capture(path):
+        kind = rec.get("kind")
+        if kind == "blob":
+            blobs[rec["digest"]] = rec
+        elif kind == "in":
+            frame = rec.get("frame") or {}
+            if frame.get("type") == "hello":
+                capabilities = list(frame.get("capabilities") or [])
+            elif frame.get("type") == "call":
+                calls.append(rec)
+        elif kind == "out":
+            frame = rec.get("frame") or {}
+            if frame.get("type") in ("result", "error") and frame.get("request_id") is not None:
+                responses[str(frame["request_id"])] = rec
+    return {"blobs": blobs, "calls": calls, "responses": responses, "capabilities": capabilities}
+
+
+def replay(
+    capture: str,
+    project: str,
+    entry: Optional[str] = None,
+    fast: bool = False,
+    ignore: Any = DEFAULT_IGNORE,
+    timeout: Optional[float] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    cap = load_capture(capture)
+    tag = f"replay-{int(time.time() * 1000)}"
+    restored: Dict[str, str] = {}
+
+    def _shm_id(digest: Optional[str]) -> Optional[str]:
+        # 生产 Runner 常复用同一共享内存段，按内容摘要重新编号，保证每次调用拿到录制时的图像
+        if digest is None or digest not in cap["blobs"]:
+            return None
+        if digest not in restored:
+            blob = cap["blobs"][digest]
+            restored[digest] = f"dev-shm:{tag}:{digest[:16]}"
+            dev_restore_shared_memory_raw(restored[digest], blob.get("format", "bin"), blob["data"])
+        return restored[digest]
+
+    frames = []
+    for rec in cap["calls"]:
+        frame = dict(rec["frame"])
+        data = dict(frame.get("data") or {})
+        for key in ("cur_image_shm_id", "guide_image_shm_id"):
+            new_id = _shm_id((rec.get("shm") or {}).get(data.get(key)))
+            if new_id is not None:
+                data[key] = new_id
+        frame["data"] = data
+        frames.append((rec["t_ms"], frame))
+
+    caps = sorted(set(cap["capabilities"]) | {"timing:v1"})
+    client = AdapterClient(project, entry=entry, env=env, capabilities=caps, call_timeout_s=timeout)
+    results: List[Dict[str, Any]] = []
+    t_start = time.perf_counter()
+    try:
+        client.start()
+        pendings = []
+        base_t = frames[0][0] if frames else 0.0
+        for t_ms, frame in frames:
+            if fast:
+                pendings.append((frame, client.wait(client.submit(frame), timeout)))
+                continue
+            # 按录制时的到达间隔发送，重现排队与突发
+            delay = (t_ms - base_t) / 1000.0 - (time.perf_counter() - t_start)
+            if delay > 0:
+                time.sleep(delay)
+            pendings.append((frame, client.submit(frame)))
+        for frame, p in pendings:
+            got = p if isinstance(p, dict) else client.wait(p, timeout)
+            if (got.get("data") or {}).get("outputs"):
+                client.release(str(got.get("request_id")))
+            results.append({"frame": frame, "replay": got})
+    except Exception as e:
+        return {"status": "ERROR", "message": f"replay failed: {e}"}
+    finally:
+        client.close()
+        for shm_id in restored.values():
+            release_shared_memory(shm_id)
+    wall_s = time.perf_counter() - t_start
+
+    details = []
+    orig_lat: List[float] = []
+    new_lat: List[float] = []
+    mismatched = 0
+    missing = 0
+    for item in results:
+        rid = str(item["frame"].get("request_id"))
+        rec = cap["responses"].get(rid)
+        got = item["replay"]
+        orig = rec["frame"] if rec else None
+        call_t = next((t for t, f in frames if str(f.get("request_id")) == rid), None)
+        o_ms = _latency(orig, round(rec["t_ms"] - call_t, 3) if rec and call_t is not None else None)
+        r_ms = _latency(got)
+        if o_ms is not None:
+            orig_lat.append(o_ms)
+        if r_ms is not None:
+            new_lat.append(r_ms)
+        if orig is None:
+            missing += 1
+            diffs = ["<no recorded response>"]
+        else:
+            diffs = diff_values({k: orig.get(k) for k in _COMPARED}, {k: got.get(k) for k in _COMPARED}, ignore)
+            if diffs:
+                mismatched += 1
+        details.append({"request_id": rid, "match": not diffs, "diffs": diffs, "original_ms": o_ms, "replay_ms": r_ms})
+    o_p, r_p = percentiles(orig_lat), percentiles(new_lat)
+    return {
+        "status": "PASS" if mismatched == 0 and missing == 0 else "FAIL",
+        "capture": os.path.abspath(capture),
+        "project": os.path.abspath(project),
+        "mode": "fast" if fast else "original",
+        "calls": len(results),
+        "matched": len(results) - mismatched - missing,
+        "mismatched": mismatched,
+        "missing_original": missing,
+        "wall_s": round(wall_s, 3),
+        "latency": {
+            "original": o_p,
+            "replay": r_p,
+            "delta_p50_ms": round(r_p["p50_ms"] - o_p["p50_ms"], 3),
+            "delta_p99_ms": round(r_p["p99_ms"] - o_p["p99_ms"], 3),
+        },
+        "results": details,
+    }
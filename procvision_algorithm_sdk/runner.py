@@ -0,0 +1,403 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .bench import _IMAGE_EXTS, _image_size, percentiles
+from .client import TIMEOUT_ERROR_CODE, AdapterClient
+from .deploy import deploy_package
+from .shared_memory import dev_write_image_to_shared_memory, release_shared_memory, write_image_array_to_shared_memory
+
+RUNNER_VERSION = "mock-1"
+# 未设置 execute 超时时，单次检测占用工位超过该时长即判定适配器挂起
+DEFAULT_HANG_TIMEOUT_MS = 60000
+
+
+def _load_frames(images: Optional[str], width: int, height: int, camera_id: str) -> List[Dict[str, Any]]:
+    files: List[str] = []
+    if images and os.path.isdir(images):
+        files = sorted(os.path.join(images, f) for f in os.listdir(images) if os.path.splitext(f)[1].lower() in _IMAGE_EXTS)
+    elif images and os.path.isfile(images):
+        files = [images]
+    frames: List[Dict[str, Any]] = []
+    for path in files:
+        with open(path, "rb") as f:
+            payload = f.read()
+        w, h = _image_size(path)
+        frames.append({"payload": payload, "width": int(w), "height": int(h), "camera_id": camera_id})
+    if not frames:
+        rng = np.random.default_rng(0)
+        frames.append({"payload": rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8), "width": width, "height": height, "camera_id": camera_id})
+    return frames
+
+
+class Station:
+    def __init__(
+        self,
+        name: str,
+        project: str,
+        entry: Optional[str] = None,
+        images: Optional[str] = None,
+        guide_images: Optional[str] = None,
+        width: int = 640,
+        height: int = 480,
+        step_index: int = 1,
+        step_desc: str = "station",
+        guide_info: Any = None,
+        execute_timeout_ms: Optional[int] = None,
+        heartbeat_interval_ms: int = 5000,
+        heartbeat_grace_ms: int = 2000,
+        hang_timeout_ms: Optional[int] = None,
+        max_restarts: int = 3,
+        capabilities: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        stderr_handler: Optional[Callable[[bytes], None]] = None,
+    ) -> None:
+        self.name = name
+        self.project = project
+        self.step_index = step_index
+        self.step_desc = step_desc
+        self.guide_info = guide_info if guide_info is not None else []
+        self.heartbeat_interval_ms = heartbeat_interval_ms
+        self.heartbeat_grace_ms = heartbeat_grace_ms
+        self.execute_timeout_ms = execute_timeout_ms
+        if hang_timeout_ms is None:
+            hang_timeout_ms = execute_timeout_ms + heartbeat_grace_ms if execute_timeout_ms else DEFAULT_HANG_TIMEOUT_MS
+        self.hang_timeout_ms = hang_timeout_ms
+        # 每个工位固定一对共享内存段，每次检测前覆盖写入（与 Runner 复用相机缓冲一致）
+        self.cur_shm_id = f"dev-shm:{name}:cur"
+        self.guide_shm_id = f"dev-shm:{name}:guide"
+        self._cur_frames = _load_frames(images, width, height, f"{name}-cur")
+        self._guide_frames = _load_frames(guide_images or images, width, height, f"{name}-guide")
+        self.client = AdapterClient(
+            project,
+            entry=entry,
+            env=env,
+            capabilities=capabilities,
+            heartbeat_interval_ms=heartbeat_interval_ms,
+            heartbeat_grace_ms=heartbeat_grace_ms,
+            call_timeout_s=execute_timeout_ms / 1000.0 if execute_timeout_ms else None,
+            restart_on_timeout=True,
+            auto_restart=True,
+            max_restarts=max_restarts,
+            stderr_handler=stderr_handler,
+        )
+        self.calls = 0
+        self.timeouts = 0
+        self.heartbeats = 0
+        self.heartbeat_misses = 0
+        self.heartbeat_restarts = 0
+        self.heartbeat_busy = 0
+        self.inject_ms: List[float] = []
+        self.latencies: List[float] = []
+        self.outcomes: Dict[str, int] = {"OK": 0, "NG": 0, "ERROR": 0}
+        self.errors: Dict[str, int] = {}
+        self.startup_ms: Optional[float] = None
+        self._lock = threading.Lock()
+        self._call_started: Optional[float] = None
+        self._hang_call: Optional[int] = None
+        self._stop = threading.Event()
+        self._hb_thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        t0 = time.perf_counter()
+        self.client.start()
+        self.startup_ms = round((time.perf_counter() - t0) * 1000.0, 3)
+        if self.heartbeat_interval_ms > 0:
+            self._hb_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+            self._hb_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval_ms / 1000.0):
+            self.heartbeat()
+
+    def heartbeat(self) -> str:
+        # 一次心跳周期，返回 sent/missed/busy/skipped；后台线程按间隔调用，也可由调用方直接驱动
+        # 适配器单线程：execute 期间 pong 会排队，工位忙时记为 busy 不发 ping；
+        # 同一次检测占用超过 hang_timeout_ms 记为丢失并重启（execute_timeout_ms 默认不限时）
+        if not self._lock.acquire(blocking=False):
+            started, call = self._call_started, self.calls
+            if started is None or (time.perf_counter() - started) * 1000.0 < self.hang_timeout_ms or self._hang_call == call:
+                self.heartbeat_busy += 1
+                return "busy"
+            self._hang_call = call
+            self.heartbeat_misses += 1
+            self.heartbeat_restarts += 1
+            try:
+                # 重启使挂起的 call 以错误帧返回并释放工位
+                self.client.restart()
+            except Exception:
+                pass
+            return "missed"
+        try:
+            if self._stop.is_set() or not self.client.alive:
+                return "skipped"
+            self.heartbeats += 1
+            if self.client.ping(self.heartbeat_grace_ms / 1000.0):
+                return "sent"
+            self.heartbeat_misses += 1
+            self.heartbeat_restarts += 1
+            try:
+                self.client.restart()
+            except Exception:
+                pass
+            return "missed"
+        finally:
+            self._lock.release()
+
+    def _inject(self, i: int) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        ts = int(time.time() * 1000)
+        metas = {}
+        for shm_id, frames, key in ((self.cur_shm_id, self._cur_frames, "cur"), (self.guide_shm_id, self._guide_frames, "guide")):
+            fr = frames[i % len(frames)]
+            if isinstance(fr["payload"], np.ndarray):
+                write_image_array_to_shared_memory(shm_id, fr["payload"])
+            else:
+                dev_write_image_to_shared_memory(shm_id, fr["payload"])
+            metas[key] = {"width": fr["width"], "height": fr["height"], "timestamp_ms": ts, "camera_id": fr["camera_id"]}
+        self.inject_ms.append((time.perf_counter() - t0) * 1000.0)
+        return {
+            "step_index": self.step_index,
+            "step_desc": self.step_desc,
+            "guide_info": self.guide_info,
+            "cur_image_shm_id": self.cur_shm_id,
+            "cur_image_meta": metas["cur"],
+            "guide_image_shm_id": self.guide_shm_id,
+            "guide_image_meta": metas["guide"],
+        }
+
+    def detect(self, scheduled: Optional[float] = None) -> Dict[str, Any]:
+        with self._lock:
+            i = self.calls
+            self.calls += 1
+            t0 = scheduled if scheduled is not None else time.perf_counter()
+            self._call_started = time.perf_counter()
+            try:
+                frame = self.client.call(self._inject(i), request_id=f"{self.name}-{i}")
+            finally:
+                self._call_started = None
+            ms = (time.perf_counter() - t0) * 1000.0
+        self.latencies.append(ms)
+        if frame.get("type") == "result" and frame.get("status") == "OK":
+            rs = (frame.get("data") or {}).get("result_status")
+            self.outcomes["NG" if rs == "NG" else "OK"] += 1
+        else:
+            self.outcomes["ERROR"] += 1
+            code = str(frame.get("error_code") or "execute_error")
+            self.errors[code] = self.errors.get(code, 0) + 1
+            if code == TIMEOUT_ERROR_CODE:
+                self.timeouts += 1
+        return frame
+
+    def run(self, calls: Optional[int] = None, duration_s: Optional[float] = None, rate: Optional[float] = None) -> None:
+        t_start = time.perf_counter()
+        deadline = t_start + duration_s if duration_s else None
+        i = 0
+        while not self._stop.is_set():
+            if calls is not None and i >= calls:
+                break
+            scheduled = t_start + i / rate if rate else None
+            if deadline is not None and (scheduled or time.perf_counter()) >= deadline:
+                break
+            if scheduled is not None:
+                delay = scheduled - time.perf_counter()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+            self.detect(scheduled)
+            i += 1
+
+    def report(self, wall_s: float) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "project": os.path.abspath(self.project),
+            "pid": self.client.pid,
+            "startup_ms": self.startup_ms,
+            "calls": len(self.latencies),
+            "throughput_per_s": round(len(self.latencies) / wall_s, 3) if wall_s > 0 else 0.0,
+            "latency": percentiles(self.latencies),
+            "inject": percentiles(self.inject_ms),
+            "outcomes": dict(self.outcomes),
+            "errors_by_code": dict(self.errors),
+            "timeouts": self.timeouts,
+            "restarts": self.client.restarts,
+            "heartbeat": {"sent": self.heartbeats, "missed": self.heartbeat_misses, "restarts": self.heartbeat_restarts, "busy": self.heartbeat_busy},
+        }
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._hb_thread is not None:
+            self._hb_thread.join(timeout=self.heartbeat_grace_ms / 1000.0 + 1.0)
+        self.client.close()
+        release_shared_memory(self.cur_shm_id)
+        release_shared_memory(self.guide_shm_id)
+
+
+class MockRunner:
+    def __init__(
+        self,
+        deploy_root: Optional[str] = None,
+        heartbeat_interval_ms: int = 5000,
+        heartbeat_grace_ms: int = 2000,
+        execute_timeout_ms: Optional[int] = None,
+        hang_timeout_ms: Optional[int] = None,
+        max_restarts: int = 3,
+        env: Optional[Dict[str, str]] = None,
+        stderr_handler: Optional[Callable[[bytes], None]] = None,
+    ) -> None:
+        self.deploy_root = deploy_root
+        self.defaults: Dict[str, Any] = {
+            "heartbeat_interval_ms": heartbeat_interval_ms,
+            "heartbeat_grace_ms": heartbeat_grace_ms,
+            "execute_timeout_ms": execute_timeout_ms,
+            "hang_timeout_ms": hang_timeout_ms,
+            "max_restarts": max_restarts,
+            "env": env,
+            "stderr_handler": stderr_handler,
+        }
+        self.stations: List[Station] = []
+        self.deployments: Dict[str, Dict[str, Any]] = {}
+
+    def __enter__(self) -> "MockRunner":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def resolve(self, package: str) -> str:
+        if os.path.isdir(package):
+            return package
+        key = os.path.abspath(package)
+        if key not in self.deployments:
+            if not self.deploy_root:
+                raise ValueError("部署 zip 算法包需要指定 deploy_root")
+            res = deploy_package(package, self.deploy_root)
+            if res.get("status") != "OK":
+                # 同名目录已存在时复用已部署副本（多工位共享同一算法包）
+                if res.get("path") and os.path.isfile(os.path.join(res["path"], "manifest.json")):
+                    res = {"status": "OK", "path": res["path"], "reused": True}
+                else:
+                    raise RuntimeError(res.get("message") or "deploy failed")
+            self.deployments[key] = res
+        return self.deployments[key]["path"]
+
+    def add_station(self, name: str, package: str, **station_kwargs: Any) -> Station:
+        kwargs = {**self.defaults, **{k: v for k, v in station_kwargs.items() if v is not None}}
+        station = Station(name, self.resolve(package), **kwargs)
+        self.stations.append(station)
+        return station
+
+    def run(self, calls: Optional[int] = None, duration_s: Optional[float] = None, rates: Optional[Dict[str, float]] = None, rate: Optional[float] = None) -> Dict[str, Any]:
+        if calls is None and not duration_s:
+            raise ValueError("需要指定 calls 或 duration_s")
+        t0 = time.perf_counter()
+        started: List[Station] = []
+        failed: List[Dict[str, Any]] = []
+        for st in self.stations:
+            try:
+                st.start()
+                started.append(st)
+            except Exception as e:
+                failed.append({"name": st.name, "message": str(e)})
+        startup_s = time.perf_counter() - t0
+        t_run = time.perf_counter()
+        threads = [threading.Thread(target=st.run, args=(calls, duration_s, (rates or {}).get(st.name, rate)), daemon=True) for st in started]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall_s = time.perf_counter() - t_run
+        stations = [st.report(wall_s) for st in started]
+        all_lat = [ms for st in started for ms in st.latencies]
+        outcomes = {k: sum(s["outcomes"][k] for s in stations) for k in ("OK", "NG", "ERROR")}
+        return {
+            "status": "OK" if not failed and outcomes["ERROR"] == 0 else "ERROR",
+            "runner_version": RUNNER_VERSION,
+            "stations_started": len(started),
+            "stations_failed": failed,
+            "startup_s": round(startup_s, 3),
+            "wall_s": round(wall_s, 3),
+            "calls": len(all_lat),
+            "throughput_per_s": round(len(all_lat) / wall_s, 3) if wall_s > 0 else 0.0,
+            "latency": percentiles(all_lat),
+            "outcomes": outcomes,
+            "timeouts": sum(s["timeouts"] for s in stations),
+            "restarts": sum(s["restarts"] for s in stations),
+            "deployments": list(self.deployments.values()),
+            "stations": stations,
+        }
+
+    def close(self) -> None:
+        for st in self.stations:
+            try:
+                st.stop()
+            except Exception:
+                pass
+
+
+_STATION_KEYS = (
+    "entry",
+    "images",
+    "guide_images",
+    "width",
+    "height",
+    "step_index",
+    "step_desc",
+    "guide_info",
+    "execute_timeout_ms",
+    "heartbeat_interval_ms",
+    "heartbeat_grace_ms",
+    "hang_timeout_ms",
+    "max_restarts",
+    "capabilities",
+    "env",
+)
+
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    if not isinstance(cfg, dict) or not isinstance(cfg.get("stations"), list) or not cfg["stations"]:
+        raise ValueError(f"scenario requires a non-empty stations list: {path}")
+    base = os.path.dirname(os.path.abspath(path))
+    # 场景文件中的相对路径以场景文件所在目录为基准
+    for key in ("deploy_root",):
+        if cfg.get(key) and not os.path.isabs(cfg[key]):
+            cfg[key] = os.path.join(base, cfg[key])
+    for st in cfg["stations"]:
+        for key in ("package", "images", "guide_images"):
+            if st.get(key) and not os.path.isabs(st[key]):
+                st[key] = os.path.join(base, st[key])
+    return cfg
+
+
+def run_scenario(cfg: Dict[str, Any], stderr_handler: Optional[Callable[[bytes], None]] = None) -> Dict[str, Any]:
+    runner = MockRunner(
+        deploy_root=cfg.get("deploy_root"),
+        heartbeat_interval_ms=int(cfg.get("heartbeat_interval_ms", 5000)),
+        heartbeat_grace_ms=int(cfg.get("heartbeat_grace_ms", 2000)),
+        execute_timeout_ms=cfg.get("execute_timeout_ms"),
+        hang_timeout_ms=cfg.get("hang_timeout_ms"),
+        max_restarts=int(cfg.get("max_restarts", 3)),
+        env=cfg.get("env"),
+        stderr_handler=stderr_handler,
+    )
+    rates: Dict[str, float] = {}
+    try:
+        for i, st in enumerate(cfg["stations"]):
+            # count>1 时按同一配置展开为多个工位，便于多工位压测
+            count = max(1, int(st.get("count", 1)))
+            base_name = str(st.get("name") or f"station-{i + 1}")
+            for k in range(count):
+                name = base_name if count == 1 else f"{base_name}-{k + 1}"
+                runner.add_station(name, st["package"], **{key: st.get(key) for key in _STATION_KEYS})
+                if st.get("rate"):
+                    rates[name] = float(st["rate"])
+        return runner.run(calls=cfg.get("calls"), duration_s=cfg.get("duration_s"), rates=rates, rate=cfg.get("rate"))
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+    finally:
+        runner.close()
@@ -0,0 +1,73 @@
+import json
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+
+def _numpy_default(obj: Any) -> Any:
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonSerializer:
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=_numpy_default).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
+
+
+class OrjsonSerializer:
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson  # type: ignore
+        self._orjson = orjson
+        self._opts = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        # 非连续/非原生字节序数组等 orjson 不支持的对象会回落到 _numpy_default
+        return self._orjson.dumps(obj, default=_numpy_default, option=self._opts)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+_SERIALIZER: Any = None
+
+
+def get_serializer(name: Optional[str] = None) -> Any:
+    global _SERIALIZER
+    choice = (name or os.environ.get("PROC_SERIALIZER") or "auto").strip().lower()
+    if name is None and _SERIALIZER is not None:
+        return _SERIALIZER
+    ser: Any = None
+    if choice in {"auto", "orjson"}:
+        try:
+            ser = OrjsonSerializer()
+        except Exception:
+            if choice == "orjson":
+                raise
+    if ser is None:
+        ser = JsonSerializer()
+    if name is None:
+        _SERIALIZER = ser
+    return ser
+
+
+def dumps(obj: Any) -> bytes:
+    return get_serializer().dumps(obj)
+
+
+def loads(data: bytes) -> Any:
+    return get_serializer().loads(data)
@@ -1,11 +1,14 @@
-from typing import Any, Dict
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
+import io
 import os
 import re
 import tempfile
 import numpy as np
 
 _DEV_SHM: Dict[str, Any] = {}
+_READ_STATS: Dict[str, int] = {"memory": 0, "file": 0, "missing": 0}
 
 
 def _shm_dir() -> str:
@@ -44,6 +47,107 @@ def write_image_array_to_shared_memory(shared_mem_id: str, image_array: Any) ->
         pass
 
 
+def write_array_to_shared_memory(shared_mem_id: str, array: Any) -> Dict[str, Any]:
+    arr = np.ascontiguousarray(array)
+    _DEV_SHM[shared_mem_id] = arr
+    try:
+        p = os.path.join(_shm_dir(), _safe_name(shared_mem_id) + ".npy")
+        np.save(p, arr)
+    except Exception:
+        pass
+    return {"shm_id": shared_mem_id, "shape": list(arr.shape), "dtype": str(arr.dtype), "nbytes": int(arr.nbytes)}
+
+
+def read_array_from_shared_memory(shared_mem_id: str, array_meta: Optional[Dict[str, Any]] = None) -> Any:
+    data = _DEV_SHM.get(shared_mem_id)
+    if isinstance(data, np.ndarray):
+        return data
+    p = os.path.join(_shm_dir(), _safe_name(shared_mem_id) + ".npy")
+    if not os.path.isfile(p):
+        return None
+    # 只读内存映射，读取方不复制数据
+    arr = np.load(p, mmap_mode="r", allow_pickle=False)
+    if array_meta and "shape" in array_meta and list(arr.shape) != list(array_meta["shape"]):
+        return None
+    return arr
+
+
+def dev_read_shared_memory_raw(shared_mem_id: str) -> Optional[Tuple[str, bytes]]:
+    data = _DEV_SHM.get(shared_mem_id)
+    if isinstance(data, np.ndarray):
+        buf = io.BytesIO()
+        np.save(buf, data)
+        return "npy", buf.getvalue()
+    if isinstance(data, (bytes, bytearray)):
+        return "bin", bytes(data)
+    for ext in ("npy", "bin"):
+        p = os.path.join(_shm_dir(), _safe_name(shared_mem_id) + "." + ext)
+        if os.path.isfile(p):
+            try:
+                with open(p, "rb") as f:
+                    return ext, f.read()
+            except Exception:
+                return None
+    return None
+
+
+def dev_restore_shared_memory_raw(shared_mem_id: str, fmt: str, raw: bytes) -> None:
+    if fmt == "npy":
+        write_image_array_to_shared_memory(shared_mem_id, np.load(io.BytesIO(raw), allow_pickle=False))
+    else:
+        dev_write_image_to_shared_memory(shared_mem_id, raw)
+
+
+def release_shared_memory(shared_mem_id: str) -> None:
+    _DEV_SHM.pop(shared_mem_id, None)
+    for ext in (".npy", ".bin"):
+        try:
+            os.remove(os.path.join(_shm_dir(), _safe_name(shared_mem_id) + ext))
+        except Exception:
+            pass
+
+
+class ResultSegmentManager:
+    def __init__(self, keep: int = 8) -> None:
+        self.keep = max(1, int(keep))
+        self._segments: "OrderedDict[str, List[str]]" = OrderedDict()
+
+    def publish(self, request_id: str, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        refs: Dict[str, Any] = {}
+        ids: List[str] = []
+        for name, (array, meta) in outputs.items():
+            shm_id = f"dev-shm:result:{request_id}:{name}"
+            refs[name] = {**write_array_to_shared_memory(shm_id, array), **meta}
+            ids.append(shm_id)
+        self._segments[request_id] = ids
+        # 超出保留数量时按发布顺序回收最旧的段，防止 Runner 未 release 导致泄漏
+        while len(self._segments) > self.keep:
+            _, old = self._segments.popitem(last=False)
+            for shm_id in old:
+                release_shared_memory(shm_id)
+        return refs
+
+    def release(self, request_id: str) -> bool:
+        ids = self._segments.pop(request_id, None)
+        if ids is None:
+            return False
+        for shm_id in ids:
+            release_shared_memory(shm_id)
+        return True
+
+    def release_all(self) -> None:
+        for rid in list(self._segments.keys()):
+            self.release(rid)
+
+    def active(self) -> int:
+        return len(self._segments)
+
+
+def shared_memory_read_stats() -> Dict[str, Any]:
+    # 图像读取来源计数（进程内字典 / 文件回退 / 未找到），不是缓存命中率
+    return dict(_READ_STATS)
+
+
 def read_image_from_shared_memory(shared_mem_id: str, image_meta: Dict[str, Any]) -> Any:
     width = int(image_meta.get("width", 0))
     height = int(image_meta.get("height", 0))
@@ -51,6 +155,7 @@ def read_image_from_shared_memory(shared_mem_id: str, image_meta: Dict[str, Any]
         return None
     data = _DEV_SHM.get(shared_mem_id)
     if data is not None:
+        _READ_STATS["memory"] += 1
         if isinstance(data, np.ndarray):
             arr = data
             if arr.ndim == 2:
@@ -81,6 +186,11 @@ def read_image_from_shared_memory(shared_mem_id: str, image_meta: Dict[str, Any]
         base = os.path.join(_shm_dir(), _safe_name(shared_mem_id))
         npy_path = base + ".npy"
         bin_path = base + ".bin"
+        if os.path.isfile(npy_path) or os.path.isfile(bin_path):
+            if data is None:
+                _READ_STATS["file"] += 1
+        elif data is None:
+            _READ_STATS["missing"] += 1
         if os.path.isfile(npy_path):
             try:
                 arr = np.load(npy_path, allow_pickle=False)
@@ -0,0 +1,210 @@
+import csv
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .bench import percentiles, prepare_images, release_images
+from .client import AdapterClient
+
+DEFAULT_THRESHOLDS = {
+    "rss_mb_per_hour": 20.0,
+    "fds_per_hour": 10.0,
+    "threads_per_hour": 2.0,
+    "latency_drift_pct": 25.0,
+    "min_r2": 0.5,
+    "min_rss_growth_mb": 4.0,
+    "min_fds_growth": 2.0,
+    "min_threads_growth": 1.0,
+    "warmup_fraction": 0.2,
+}
+
+
+def linear_trend(xs: List[float], ys: List[float]) -> Dict[str, float]:
+    n = len(xs)
+    if n < 2:
+        return {"slope": 0.0, "intercept": ys[0] if ys else 0.0, "r2": 0.0}
+    mx = sum(xs) / n
+    my = sum(ys) / n
+    sxx = sum((x - mx) ** 2 for x in xs)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    syy = sum((y - my) ** 2 for y in ys)
+    if sxx == 0:
+        return {"slope": 0.0, "intercept": my, "r2": 0.0}
+    slope = sxy / sxx
+    r2 = (sxy * sxy) / (sxx * syy) if syy > 0 else 0.0
+    return {"slope": slope, "intercept": my - slope * mx, "r2": round(r2, 4)}
+
+
+def analyze_samples(samples: List[Dict[str, Any]], thresholds: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    th = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    if samples and samples[-1].get("pid") is not None:
+        # 适配器重启后 RSS/句柄归零，只对最后一个进程的样本拟合
+        samples = [s for s in samples if s.get("pid") == samples[-1]["pid"]]
+    # 跳过预热段：首批调用的缓存/懒加载增长不计入泄漏趋势
+    skip = int(len(samples) * th["warmup_fraction"])
+    steady = samples[skip:] if len(samples) - skip >= 3 else samples
+    trends: Dict[str, Any] = {}
+    findings: List[Dict[str, Any]] = []
+
+    def _fit(key: str, scale: float) -> Optional[Dict[str, float]]:
+        pts = [(s["t_s"], float(s[key])) for s in steady if s.get(key) is not None]
+        if len(pts) < 3:
+            return None
+        t = linear_trend([p[0] for p in pts], [p[1] for p in pts])
+        growth = t["slope"] * (pts[-1][0] - pts[0][0]) / scale
+        return {"per_hour": round(t["slope"] * 3600.0 / scale, 3), "growth": round(growth, 3), "r2": t["r2"], "first": pts[0][1], "last": pts[-1][1]}
+
+    for key, scale, limit, floor, unit in (
+        ("rss_bytes", 1024.0 * 1024.0, th["rss_mb_per_hour"], th["min_rss_growth_mb"], "MB/h"),
+        ("open_fds", 1.0, th["fds_per_hour"], th["min_fds_growth"], "/h"),
+        ("threads", 1.0, th["threads_per_hour"], th["min_threads_growth"], "/h"),
+    ):
+        t = _fit(key, scale)
+        if t is None:
+            continue
+        trends[key] = t
+        # 短时运行外推到每小时会放大噪声，同时要求拟合期内的绝对增长超过下限
+        if t["per_hour"] > limit and t["growth"] >= floor and t["r2"] >= th["min_r2"]:
+            findings.append({"kind": "leak", "metric": key, "message": f"{key} 持续增长 {t['per_hour']}{unit} (r2={t['r2']})"})
+
+    lat = _fit("p50_ms", 1.0)
+    if lat is not None and steady:
+        span_h = (steady[-1]["t_s"] - steady[0]["t_s"]) / 3600.0
+        base = lat["first"] or 0.0
+        drift_pct = round(lat["per_hour"] * span_h / base * 100.0, 2) if base > 0 else 0.0
+        lat["drift_pct"] = drift_pct
+        trends["p50_ms"] = lat
+        if drift_pct > th["latency_drift_pct"] and lat["r2"] >= th["min_r2"]:
+            findings.append({"kind": "drift", "metric": "p50_ms", "message": f"p50 延迟漂移 {drift_pct}% (r2={lat['r2']})"})
+    return {"status": "FAIL" if findings else "PASS", "findings": findings, "trends": trends, "thresholds": th}
+
+
+def soak(
+    project: str,
+    duration_s: float = 600.0,
+    rate: float = 10.0,
+    sample_interval_s: float = 5.0,
+    entry: Optional[str] = None,
+    images: Optional[str] = None,
+    width: int = 640,
+    height: int = 480,
+    step_index: int = 1,
+    step_desc: str = "soak",
+    guide_info: Any = None,
+    timeout: Optional[float] = None,
+    thresholds: Optional[Dict[str, float]] = None,
+    env: Optional[Dict[str, str]] = None,
+    on_sample: Any = None,
+) -> Dict[str, Any]:
+    pairs = prepare_images(f"soak-{int(time.time() * 1000)}", images, width, height)
+    client = AdapterClient(project, entry=entry, env=env, call_timeout_s=timeout)
+    try:
+        client.start()
+    except Exception as e:
+        client.close()
+        release_images(pairs)
+        return {"status": "ERROR", "message": f"adapter start failed: {e}"}
+    samples: List[Dict[str, Any]] = []
+    window: List[float] = []
+    errors = 0
+    calls = 0
+    late = 0
+    pids = {client.pid}
+    interval = 1.0 / rate if rate > 0 else 0.0
+    t0 = time.perf_counter()
+    next_sample = t0 + sample_interval_s
+
+    def _sample(now: float) -> None:
+        frame = client.stats()
+        res = ((frame.get("data") or {}).get("resources")) or {}
+        lat = percentiles(window)
+        s = {
+            "t_s": round(now - t0, 3),
+            "pid": client.pid,
+            "calls": calls,
+            "errors": errors,
+            "window_calls": lat["count"],
+            "p50_ms": lat["p50_ms"] if lat["count"] else None,
+            "p99_ms": lat["p99_ms"] if lat["count"] else None,
+            "rss_bytes": res.get("rss_bytes"),
+            "open_fds": res.get("open_fds"),
+            "threads": res.get("threads"),
+            "cpu_s": round((res.get("cpu_user_s") or 0.0) + (res.get("cpu_system_s") or 0.0), 3) if res else None,
+        }
+        samples.append(s)
+        window.clear()
+        if on_sample is not None:
+            on_sample(s)
+
+    try:
+        _sample(t0)
+        i = 0
+        while True:
+            now = time.perf_counter()
+            if now - t0 >= duration_s:
+                break
+            if now >= next_sample:
+                _sample(now)
+                next_sample += sample_interval_s
+                continue
+            scheduled = t0 + i * interval
+            if scheduled > now:
+                time.sleep(min(scheduled, next_sample, t0 + duration_s) - now)
+                continue
+            if now - scheduled > interval and interval > 0:
+                # 执行慢于目标速率：跳过错过的发送时刻，不做突发补发
+                late += 1
+                i = int((now - t0) / interval)
+            p = pairs[i % len(pairs)]
+            ts = time.perf_counter()
+            frame = client.call(
+                {
+                    "step_index": step_index,
+                    "step_desc": step_desc,
+                    "guide_info": guide_info if guide_info is not None else [],
+                    "cur_image_shm_id": p["cur_image_shm_id"],
+                    "cur_image_meta": p["cur_image_meta"],
+                    "guide_image_shm_id": p["guide_image_shm_id"],
+                    "guide_image_meta": p["guide_image_meta"],
+                }
+            )
+            window.append((time.perf_counter() - ts) * 1000.0)
+            calls += 1
+            if frame.get("type") != "result" or frame.get("status") != "OK":
+                errors += 1
+            pids.add(client.pid)
+            i += 1
+        _sample(time.perf_counter())
+    finally:
+        client.close()
+        release_images(pairs)
+    report = analyze_samples(samples, thresholds)
+    restarts = len({p for p in pids if p is not None}) - 1
+    if restarts:
+        report["findings"].append({"kind": "restart", "metric": "pid", "message": f"适配器重启 {restarts} 次"})
+    if errors:
+        report["findings"].append({"kind": "errors", "metric": "errors", "message": f"失败调用 {errors} 次"})
+    if report["findings"]:
+        report["status"] = "FAIL"
+    elapsed = samples[-1]["t_s"] if samples else 0.0
+    report.update(
+        {
+            "config": {"project": os.path.abspath(project), "duration_s": duration_s, "rate": rate, "sample_interval_s": sample_interval_s},
+            "calls": calls,
+            "errors": errors,
+            "late_calls": late,
+            "restarts": restarts,
+            "achieved_rate": round(calls / elapsed, 3) if elapsed > 0 else 0.0,
+            "samples": samples,
+        }
+    )
+    return report
+
+
+def write_samples_csv(samples: List[Dict[str, Any]], path: str) -> None:
+    fields = ["t_s", "pid", "calls", "errors", "window_calls", "p50_ms", "p99_ms", "rss_bytes", "open_fds", "threads", "cpu_s"]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        w.writeheader()
+        for s in samples:
+            w.writerow(s)
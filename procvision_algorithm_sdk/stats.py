@@ -0,0 +1,161 @@
+import gc
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+
+def _default_bounds() -> List[float]:
+    # 对数分桶：0.05ms 起每桶 ×1.25，约 70 桶覆盖到 2 分钟，相对误差 ≤25%
+    bounds: List[float] = []
+    b = 0.05
+    while b < 120000.0:
+        bounds.append(round(b, 4))
+        b *= 1.25
+    return bounds
+
+
+_BOUNDS = _default_bounds()
+
+
+class LatencyHistogram:
+    def __init__(self, bounds: Optional[List[float]] = None) -> None:
+        self.bounds = list(bounds) if bounds is not None else _BOUNDS
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank:
+                upper = self.bounds[i] if i < len(self.bounds) else self.max_ms
+                return min(upper, self.max_ms)
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        import psutil  # type: ignore
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 单位为 KB，macOS 为字节
+        return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+    except Exception:
+        pass
+    try:
+        import psutil  # type: ignore
+        return int(getattr(psutil.Process().memory_info(), "peak_wset", 0)) or None
+    except Exception:
+        return None
+
+
+def _open_fds() -> Optional[int]:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except Exception:
+        pass
+    try:
+        import psutil  # type: ignore
+        p = psutil.Process()
+        return int(p.num_handles()) if hasattr(p, "num_handles") else int(p.num_fds())
+    except Exception:
+        return None
+
+
+def resource_usage() -> Dict[str, Any]:
+    t = os.times()
+    return {
+        "rss_bytes": _rss_bytes(),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "cpu_user_s": round(t.user, 3),
+        "cpu_system_s": round(t.system, 3),
+        "threads": threading.active_count(),
+        "open_fds": _open_fds(),
+        "gc_counts": list(gc.get_count()),
+        "gc_collections": [s.get("collections", 0) for s in gc.get_stats()],
+    }
+
+
+class RuntimeStats:
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self.calls = 0
+        self.results_ok = 0
+        self.results_error = 0
+        self.errors_by_code: Dict[str, int] = {}
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.startup: Dict[str, Any] = {}
+
+    def observe(self, stage: str, ms: Optional[float]) -> None:
+        if ms is None:
+            return
+        h = self.stages.get(stage)
+        if h is None:
+            h = self.stages[stage] = LatencyHistogram()
+        h.record(ms)
+
+    def record_call(self) -> None:
+        self.calls += 1
+
+    def record_result(self, status: str, error_code: Optional[str] = None) -> None:
+        if status == "OK":
+            self.results_ok += 1
+        else:
+            self.results_error += 1
+            self.record_error(error_code or "execute_error")
+
+    def record_error(self, code: Optional[str]) -> None:
+        key = str(code or "unknown")
+        self.errors_by_code[key] = self.errors_by_code.get(key, 0) + 1
+
+    def snapshot(self, shared_memory_reads: Optional[Dict[str, Any]] = None, logging: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return {
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "calls": self.calls,
+            "results_ok": self.results_ok,
+            "results_error": self.results_error,
+            "errors_by_code": dict(self.errors_by_code),
+            "latency": {k: h.snapshot() for k, h in self.stages.items()},
+            "startup": dict(self.startup),
+            "shared_memory_reads": shared_memory_reads or {},
+            "logging": logging or {},
+            "resources": resource_usage(),
+        }
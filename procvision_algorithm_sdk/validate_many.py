@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def discover_projects(paths: Sequence[str]) -> List[str]:
+    # 含 manifest.json 的目录即项目；否则展开其下一级含 manifest.json 的子目录
+    out: List[str] = []
+    for p in paths:
+        if os.path.isfile(os.path.join(p, "manifest.json")) or not os.path.isdir(p):
+            out.append(p)
+            continue
+        children = sorted(os.path.join(p, d) for d in os.listdir(p) if os.path.isfile(os.path.join(p, d, "manifest.json")))
+        out.extend(children or [p])
+    unique: Dict[str, str] = {}
+    for p in out:
+        unique.setdefault(os.path.abspath(p), p)
+    return list(unique.values())
+
+
+def validate_in_subprocess(
+    project: str,
+    python: Optional[str] = None,
+    extra_args: Sequence[str] = (),
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    # 每个项目独立解释器进程：入口导入、全局状态与崩溃互不影响
+    run_env = os.environ.copy()
+    run_env.update(env or {})
+    cmd = [python or sys.executable, "-c", "from procvision_algorithm_sdk.cli import main; main()", "validate", os.path.abspath(project), "--json"] + list(extra_args)
+    t0 = time.perf_counter()
+    try:
+        res = subprocess.run(cmd, cwd=project if os.path.isdir(project) else None, env=run_env, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        report: Dict[str, Any] = {"summary": {"status": "FAIL", "passed": 0, "failed": 1}, "checks": [{"name": "validate_run", "result": "FAIL", "message": f"超时（{timeout}s）"}]}
+        report.update({"exit_code": None, "wall_ms": round((time.perf_counter() - t0) * 1000.0, 3)})
+        return report
+    try:
+        report = json.loads((res.stdout or "").strip().splitlines()[-1])
+    except Exception:
+        tail = "\n".join((res.stderr or "").splitlines()[-5:])
+        report = {"summary": {"status": "FAIL", "passed": 0, "failed": 1}, "checks": [{"name": "validate_run", "result": "FAIL", "message": tail or f"exit {res.returncode}"}]}
+    report.update({"exit_code": res.returncode, "wall_ms": round((time.perf_counter() - t0) * 1000.0, 3)})
+    return report
+
+
+def validate_many(
+    projects: Sequence[str],
+    workers: Optional[int] = None,
+    full: bool = False,
+    perf: bool = False,
+    perf_calls: Optional[int] = None,
+    python: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    args: List[str] = (["--full"] if full else []) + (["--perf"] if perf else []) + (["--perf-calls", str(perf_calls)] if perf_calls else [])
+    n = max(1, min(len(projects) or 1, int(workers or os.cpu_count() or 1)))
+    t0 = time.perf_counter()
+
+    def _one(project: str) -> Dict[str, Any]:
+        started = round((time.perf_counter() - t0) * 1000.0, 3)
+        report = validate_in_subprocess(project, python=python, extra_args=args, env=env, timeout=timeout)
+        return {"project": os.path.abspath(project), "status": report["summary"]["status"], "started_ms": started, **report}
+
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        results = list(ex.map(_one, projects))
+    wall_s = time.perf_counter() - t0
+    failed = [r for r in results if r["status"] != "PASS"]
+    serial_s = sum(r["wall_ms"] for r in results) / 1000.0
+    return {
+        "summary": {
+            "status": "PASS" if results and not failed else "FAIL",
+            "projects": len(results),
+            "passed": len(results) - len(failed),
+            "failed": len(failed),
+            "workers": n,
+            "wall_s": round(wall_s, 3),
+            "serial_s": round(serial_s, 3),
+            "speedup": round(serial_s / wall_s, 2) if wall_s > 0 else None,
+        },
+        "projects": results,
+    }
@@ -0,0 +1,297 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+# v2：索引按解析后的版本钉（name==version）记录 wheel，需求集合只记录其解析结果
+INDEX_VERSION = 2
+_PINNED = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*(\[[^\]]*\])?\s*===?\s*[^\s,;*]+$")
+
+
+def default_cache_dir() -> str:
+    env = os.environ.get("PROC_WHEEL_CACHE")
+    if env:
+        return env
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "procvision", "wheels")
+
+
+def target_key(platform: str, python_version: str, implementation: str, abi: str) -> str:
+    return f"{platform}-{implementation}{python_version.replace('.', '')}-{abi}"
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for buf in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(buf)
+    return h.hexdigest()
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.split()).lower()
+
+
+def _canonical_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _is_pinned(req: str) -> bool:
+    return bool(_PINNED.match(req))
+
+
+def _set_key(reqs: List[str], options: List[str]) -> str:
+    # 需求集合整体作为解析缓存的键；集合中任一行变化都重新解析
+    doc = json.dumps({"requirements": sorted(_normalize(r) for r in reqs), "options": options})
+    return hashlib.sha256(doc.encode("utf-8")).hexdigest()
+
+
+def read_requirements(path: str) -> Tuple[List[str], List[str]]:
+    reqs: List[str] = []
+    options: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            s = line.split(" #")[0].strip()
+            if not s or s.startswith("#"):
+                continue
+            # --extra-index-url 等选项行作用于每一次 pip 调用
+            if s.startswith("-"):
+                options.extend(s.split())
+            else:
+                reqs.append(s)
+    return reqs, options
+
+
+class WheelStore:
+    def __init__(self, root: Optional[str] = None) -> None:
+        self.root = os.path.abspath(root or default_cache_dir())
+        self.blobs_dir = os.path.join(self.root, "blobs")
+        self.index_dir = os.path.join(self.root, "index")
+        self._lock = threading.Lock()
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+
+    def blob_path(self, sha: str, filename: str) -> str:
+        # 以内容摘要寻址；保留原始文件名，便于 pip --find-links 与人工排查
+        return os.path.join(self.blobs_dir, sha[:2], sha, filename)
+
+    def add(self, path: str) -> Tuple[str, str]:
+        filename = os.path.basename(path)
+        sha = _sha256(path)
+        dst = self.blob_path(sha, filename)
+        if not os.path.isfile(dst):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(path, tmp)
+            # 硬链接共享同一 inode，置为只读防止某个项目原地修改污染缓存
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, dst)
+        return sha, filename
+
+    def ingest_dir(self, directory: str) -> List[Tuple[str, str]]:
+        out = []
+        for f in sorted(os.listdir(directory)):
+            if f.endswith(".whl"):
+                out.append(self.add(os.path.join(directory, f)))
+        return out
+
+    def _index_path(self, target: str) -> str:
+        return os.path.join(self.index_dir, target + ".json")
+
+    def load_index(self, target: str) -> Dict[str, Any]:
+        try:
+            with open(self._index_path(target), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                return data
+        except Exception:
+            pass
+        return {"version": INDEX_VERSION, "resolutions": {}, "wheels": {}}
+
+    def save_index(self, target: str, index: Dict[str, Any]) -> None:
+        with self._lock:
+            # 多个构建并发写入时以“读-合并-原子替换”更新，最坏情况仅丢失缓存命中
+            merged = self.load_index(target)
+            merged["resolutions"].update(index.get("resolutions") or {})
+            merged["wheels"].update(index.get("wheels") or {})
+            path = self._index_path(target)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(merged, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+
+    def lookup(self, index: Dict[str, Any], pin: str) -> Optional[Dict[str, str]]:
+        wheel = (index.get("wheels") or {}).get(pin)
+        if not wheel or not os.path.isfile(self.blob_path(wheel["sha256"], wheel["filename"])):
+            return None
+        return wheel
+
+    def materialize(self, wheels: List[Dict[str, str]], dest: str) -> Dict[str, int]:
+        os.makedirs(dest, exist_ok=True)
+        counts = {"linked": 0, "copied": 0, "present": 0}
+        for w in wheels:
+            src = self.blob_path(w["sha256"], w["filename"])
+            dst = os.path.join(dest, w["filename"])
+            if os.path.isfile(dst):
+                try:
+                    if os.path.samefile(src, dst) or os.path.getsize(dst) == os.path.getsize(src):
+                        counts["present"] += 1
+                        continue
+                except OSError:
+                    pass
+                os.chmod(dst, 0o644)
+                os.remove(dst)
+            try:
+                os.link(src, dst)
+                counts["linked"] += 1
+            except OSError:
+                # 跨文件系统或不支持硬链接时退回复制
+                shutil.copyfile(src, dst)
+                counts["copied"] += 1
+        return counts
+
+
+def _pip_download(req: str, dest: str, pip_args: List[str]) -> Tuple[bool, str]:
+    cmd = [sys.executable, "-m", "pip", "download", req, "--no-deps", "-d", dest, "--disable-pip-version-check"] + pip_args
+    res = subprocess.run(cmd, capture_output=True, text=True)
+    return res.returncode == 0, ((res.stderr or "") + ("\n" + res.stdout if res.stdout else "")).strip()
+
+
+def _pip_resolve(reqs: List[str], pip_args: List[str]) -> Tuple[Optional[List[Dict[str, str]]], str]:
+    # 整个需求集合一次联合解析（pip install --dry-run --report），同一包只会解析出一个版本
+    with tempfile.TemporaryDirectory(prefix="procvision-resolve-") as tmp:
+        req_file = os.path.join(tmp, "requirements.txt")
+        with open(req_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(reqs) + "\n")
+        report = os.path.join(tmp, "report.json")
+        cmd = [sys.executable, "-m", "pip", "install", "--dry-run", "--ignore-installed", "--quiet", "--report", report, "--target", os.path.join(tmp, "target"), "-r", req_file, "--disable-pip-version-check"] + pip_args
+        res = subprocess.run(cmd, capture_output=True, text=True)
+        output = ((res.stderr or "") + ("\n" + res.stdout if res.stdout else "")).strip()
+        if res.returncode != 0 or not os.path.isfile(report):
+            return None, output
+        with open(report, "r", encoding="utf-8") as f:
+            items = json.load(f).get("install") or []
+    pins = []
+    for item in items:
+        meta = item.get("metadata") or {}
+        pins.append({"pin": f"{_canonical_name(meta['name'])}=={meta['version']}", "url": (item.get("download_info") or {}).get("url", "")})
+    return pins, output
+
+
+def fetch_wheels(
+    req_path: str,
+    dest: str,
+    platform: str,
+    python_version: str,
+    implementation: str,
+    abi: str,
+    cache_dir: Optional[str] = None,
+    offline: bool = False,
+    find_links: Optional[str] = None,
+    extra_index_url: Optional[str] = None,
+    jobs: Optional[int] = None,
+) -> Dict[str, Any]:
+    store = WheelStore(cache_dir)
+    target = target_key(platform, python_version, implementation, abi)
+    reqs, options = read_requirements(req_path)
+    if find_links and os.path.isdir(find_links):
+        store.ingest_dir(find_links)
+    index = store.load_index(target)
+
+    pip_args = ["--platform", platform, "--python-version", python_version, "--implementation", implementation, "--abi", abi, "--only-binary=:all:"]
+    if offline:
+        # 离线模式：只从本地 wheel 目录解析，不访问任何索引
+        pip_args += ["--no-index"] + (["--find-links", os.path.abspath(find_links)] if find_links else [])
+    else:
+        pip_args += options
+        if find_links:
+            pip_args += ["--find-links", os.path.abspath(find_links)]
+        if extra_index_url:
+            pip_args += ["--extra-index-url", extra_index_url]
+
+    failures: List[Dict[str, str]] = []
+    key = _set_key(reqs, options)
+    cached = index["resolutions"].get(key)
+    no_source = offline and not find_links
+    pins: List[Dict[str, str]] = []
+    resolution: Optional[str] = None
+    if not reqs:
+        pass
+    elif cached is not None and (no_source or all(_is_pinned(r) for r in reqs)):
+        # 全部精确钉版本的集合解析结果确定，可复用；含范围的集合只在无法联网解析时复用上次结果
+        pins = [{"pin": p, "url": ""} for p in cached]
+        resolution = "cache"
+    elif no_source:
+        failures = [{"requirement": r, "message": "offline: not in wheel cache and no --find-links directory"} for r in reqs]
+    else:
+        resolved, output = _pip_resolve(reqs, pip_args)
+        if resolved is None:
+            failures.append({"requirement": os.path.basename(req_path), "message": output or "pip 依赖解析失败"})
+        else:
+            pins = resolved
+            resolution = "pip"
+            index["resolutions"][key] = [p["pin"] for p in pins]
+
+    wheels: Dict[str, Dict[str, str]] = {}
+    missing: List[Dict[str, str]] = []
+    for p in pins:
+        hit = store.lookup(index, p["pin"])
+        if hit is None:
+            missing.append(p)
+        else:
+            wheels[p["pin"]] = hit
+
+    if missing and no_source:
+        failures += [{"requirement": p["pin"], "message": "offline: resolved wheel missing from cache"} for p in missing]
+    elif missing:
+
+        def _fetch(p: Dict[str, str]) -> Tuple[str, Optional[Dict[str, str]], str]:
+            # 按解析结果逐个钉版本、不带依赖地并行下载；本地 wheel（find-links）直接入库
+            url = urlparse(p["url"])
+            if url.scheme == "file" and url.path.endswith(".whl"):
+                sha, fn = store.add(url2pathname(unquote(url.path)))
+                return p["pin"], {"sha256": sha, "filename": fn}, ""
+            with tempfile.TemporaryDirectory(prefix="procvision-wheels-") as tmp:
+                ok, output = _pip_download(p["pin"], tmp, pip_args)
+                got = store.ingest_dir(tmp) if ok else []
+            if not got:
+                return p["pin"], None, output
+            return p["pin"], {"sha256": got[0][0], "filename": got[0][1]}, output
+
+        n = max(1, min(len(missing), int(jobs or os.cpu_count() or 1)))
+        with ThreadPoolExecutor(max_workers=n) as ex:
+            for pin, wheel, output in ex.map(_fetch, missing):
+                if wheel is None:
+                    failures.append({"requirement": pin, "message": output or "pip download 失败"})
+                else:
+                    wheels[pin] = wheel
+                    index["wheels"][pin] = wheel
+    if resolution == "pip" or missing:
+        store.save_index(target, index)
+
+    unique = {w["filename"]: w for w in wheels.values()}
+    counts = store.materialize(list(unique.values()), dest)
+    fetched = sum(1 for p in missing if p["pin"] in wheels)
+    return {
+        "status": "ERROR" if failures else "OK",
+        "target": target,
+        "cache_dir": store.root,
+        "requirements": len(reqs),
+        "resolution": resolution,
+        "resolved": len(pins),
+        "cache_hits": len(pins) - len(missing),
+        "fetched": fetched,
+        "wheels": sorted(unique),
+        "failures": failures,
+        "message": "\n".join(f"{f['requirement']}: {f['message']}" for f in failures),
+        **counts,
+    }
@@ -0,0 +1,54 @@
+import contextlib
+import os
+import subprocess
+import sys
+
+from tests.test_adapter_phases import _read_frame, _write_frame
+
+__all__ = ["_adapter", "_call_payload", "_read_frame", "_stop_adapter", "_write_frame"]
+
+
+def _call_payload(rid="r1"):
+    return {
+        "type": "call",
+        "request_id": rid,
+        "data": {
+            "step_index": 1,
+            "step_desc": "step-1",
+            "guide_info": [],
+            "cur_image_shm_id": "dev-shm:s1:cur",
+            "cur_image_meta": {"width": 1, "height": 1, "timestamp_ms": 0, "camera_id": "c"},
+            "guide_image_shm_id": "dev-shm:s1:guide",
+            "guide_image_meta": {"width": 1, "height": 1, "timestamp_ms": 0, "camera_id": "c"},
+        },
+    }
+
+
+def _stop_adapter(p):
+    if p.poll() is None:
+        p.terminate()
+    try:
+        p.wait(timeout=5.0)
+    except subprocess.TimeoutExpired:
+        p.kill()
+        p.wait()
+    for fp in (p.stdin, p.stdout, p.stderr):
+        try:
+            if fp:
+                fp.close()
+        except Exception:
+            pass
+
+
+@contextlib.contextmanager
+def _adapter(entry, *args, env=None):
+    # 以 -m 启动适配器子进程（PYTHONPATH 指向仓库根以导入 tests.mock_phases_algo），退出时终止并关闭管道
+    full_env = os.environ.copy()
+    full_env["PYTHONPATH"] = os.getcwd()
+    full_env.update(env or {})
+    cmd = [sys.executable, "-m", "procvision_algorithm_sdk.adapter", "--entry", entry, *args]
+    p = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=full_env)
+    try:
+        yield p
+    finally:
+        _stop_adapter(p)
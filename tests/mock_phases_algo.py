@@ -26,5 +26,97 @@ class StdoutSpamAlgo(BaseAlgorithm):
         print("spam-to-stdout")
         return {"status": "OK", "data": {"result_status": "OK", "defect_rects": [], "debug": {"step_index": step_index}}}
 
+class OutputAlgo(BaseAlgorithm):
+    def execute(
+        self,
+        step_index: int,
+        step_desc: str,
+        cur_image: Any,
+        guide_image: Any,
+        guide_info: Any,
+    ) -> Dict[str, Any]:
+        import numpy as np
+        mask = np.zeros((4, 6), dtype=np.uint8)
+        mask[1, 2] = 255
+        self.publish_output("mask", mask, kind="segmentation")
+        return {"status": "OK", "data": {"result_status": "NG", "ng_reason": "mask", "defect_rects": []}}
+
+class PartialAlgo(BaseAlgorithm):
+    def execute(
+        self,
+        step_index: int,
+        step_desc: str,
+        cur_image: Any,
+        guide_image: Any,
+        guide_info: Any,
+    ) -> Dict[str, Any]:
+        delivered = self.report_progress(50, "roi-1 done")
+        self.emit_partial({"roi": 1, "result_status": "NG", "defect_rects": [{"x": 1, "y": 2, "width": 3, "height": 4}]})
+        return {"status": "OK", "data": {"result_status": "NG", "ng_reason": "roi-1", "defect_rects": [], "debug": {"partial_delivered": delivered}}}
+
+class ControlAlgo(BaseAlgorithm):
+    def execute(
+        self,
+        step_index: int,
+        step_desc: str,
+        cur_image: Any,
+        guide_image: Any,
+        guide_info: Any,
+    ) -> Dict[str, Any]:
+        import os
+        import time
+        if step_desc.startswith("sleep:"):
+            time.sleep(float(step_desc.split(":", 1)[1]))
+        if step_desc == "exit":
+            os._exit(3)
+        return {"status": "OK", "data": {"result_status": "OK", "defect_rects": [], "debug": {"step_index": step_index, "pid": os.getpid()}}}
+
 class MissingExecuteAlgo:
     pass
+
+class RandomAlgo(BaseAlgorithm):
+    def execute(
+        self,
+        step_index: int,
+        step_desc: str,
+        cur_image: Any,
+        guide_image: Any,
+        guide_info: Any,
+    ) -> Dict[str, Any]:
+        import random
+        rect = {"x": 1, "y": 1, "width": 2, "height": 2, "label": "d", "score": random.random()}
+        return {"status": "OK", "data": {"result_status": "NG", "ng_reason": "random", "defect_rects": [rect]}}
+
+class LeakAlgo(BaseAlgorithm):
+    _kept: list = []
+
+    def execute(
+        self,
+        step_index: int,
+        step_desc: str,
+        cur_image: Any,
+        guide_image: Any,
+        guide_info: Any,
+    ) -> Dict[str, Any]:
+        self._kept.append(bytearray(b"x" * (2 * 1024 * 1024)))
+        return {"status": "OK", "data": {"result_status": "OK", "defect_rects": []}}
+
+class LogSpamAlgo(BaseAlgorithm):
+    lazy_evals = 0
+
+    def _detail(self) -> Dict[str, Any]:
+        LogSpamAlgo.lazy_evals += 1
+        return {"tile": LogSpamAlgo.lazy_evals}
+
+    def execute(
+        self,
+        step_index: int,
+        step_desc: str,
+        cur_image: Any,
+        guide_image: Any,
+        guide_info: Any,
+    ) -> Dict[str, Any]:
+        for i in range(200):
+            self.logger.info("spam", step_index=step_index, i=i)
+            self.logger.debug("detail", i=i, detail=self._detail)
+        return {"status": "OK", "data": {"result_status": "OK", "defect_rects": [], "debug": {"lazy_evals": LogSpamAlgo.lazy_evals}}}
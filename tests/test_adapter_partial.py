@@ -0,0 +1,39 @@
+import unittest
+
+from tests.adapter_helpers import _adapter, _call_payload, _read_frame, _write_frame
+
+
+class TestAdapterPartial(unittest.TestCase):
+    def _run(self, runner_hello):
+        frames = []
+        with _adapter("tests.mock_phases_algo:PartialAlgo") as p:
+            hello = _read_frame(p.stdout)
+            self.assertIn("partial:v1", hello.get("capabilities", []))
+            _write_frame(p.stdin, runner_hello)
+            _write_frame(p.stdin, _call_payload("rp"))
+            while True:
+                f = _read_frame(p.stdout)
+                frames.append(f)
+                if f is None or f["type"] != "partial":
+                    break
+            _write_frame(p.stdin, {"type": "shutdown"})
+            _read_frame(p.stdout)
+        return frames
+
+    def test_partial_frames_before_result(self):
+        frames = self._run({"type": "hello", "runner_version": "dev", "capabilities": ["partial:v1"]})
+        self.assertEqual([f["type"] for f in frames], ["partial", "partial", "result"])
+        self.assertEqual(frames[0]["request_id"], "rp")
+        self.assertEqual(frames[0]["seq"], 1)
+        self.assertEqual(frames[0]["data"]["progress"], 50.0)
+        self.assertEqual(frames[1]["data"]["result_status"], "NG")
+        self.assertTrue(frames[2]["data"]["debug"]["partial_delivered"])
+
+    def test_no_partial_without_negotiation(self):
+        frames = self._run({"type": "hello", "runner_version": "dev"})
+        self.assertEqual([f["type"] for f in frames], ["result"])
+        self.assertFalse(frames[0]["data"]["debug"]["partial_delivered"])
+
+
+if __name__ == "__main__":
+    unittest.main()
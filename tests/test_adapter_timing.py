@@ -0,0 +1,38 @@
+import unittest
+
+from tests.adapter_helpers import _adapter, _call_payload, _read_frame, _write_frame
+
+
+class TestAdapterTiming(unittest.TestCase):
+    def _run(self, runner_hello):
+        with _adapter("tests.mock_phases_algo:ExecuteAlgo") as p:
+            hello = _read_frame(p.stdout)
+            self.assertIn("timing:v1", hello.get("capabilities", []))
+            _write_frame(p.stdin, runner_hello)
+            _write_frame(p.stdin, _call_payload("r1"))
+            first = _read_frame(p.stdout)
+            _write_frame(p.stdin, _call_payload("r2"))
+            second = _read_frame(p.stdout)
+            _write_frame(p.stdin, {"type": "shutdown"})
+            _read_frame(p.stdout)
+            return first, second
+
+    def test_timing_attached_when_negotiated(self):
+        first, second = self._run({"type": "hello", "runner_version": "dev", "capabilities": ["timing:v1"]})
+        self.assertEqual(first["type"], "result")
+        timing = first.get("timing")
+        self.assertIsInstance(timing, dict)
+        for key in ("decode_ms", "shm_read_cur_ms", "shm_read_guide_ms", "execute_ms", "serialize_ms", "total_ms"):
+            self.assertGreaterEqual(timing[key], 0.0)
+        self.assertIsNone(timing["prev_write_ms"])
+        self.assertGreaterEqual(second["timing"]["prev_write_ms"], 0.0)
+        self.assertEqual(first["data"]["result_status"], "OK")
+
+    def test_timing_absent_by_default(self):
+        first, _ = self._run({"type": "hello", "runner_version": "dev"})
+        self.assertEqual(first["type"], "result")
+        self.assertNotIn("timing", first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import unittest
+
+from procvision_algorithm_sdk.aio_client import AsyncAdapterClient
+from tests.test_client import _data
+
+
+class TestAsyncAdapterClient(unittest.TestCase):
+    def _client(self, logs=None, **kw):
+        return AsyncAdapterClient(
+            os.getcwd(),
+            entry="tests.mock_phases_algo:ControlAlgo",
+            env={"PYTHONPATH": os.getcwd()},
+            stderr_handler=(logs.append if logs is not None else None),
+            **kw,
+        )
+
+    def test_concurrent_calls_across_adapters(self):
+        async def scenario():
+            clients = [self._client() for _ in range(3)]
+            await asyncio.gather(*(c.start() for c in clients))
+            try:
+                t0 = asyncio.get_running_loop().time()
+                frames = await asyncio.gather(*(c.call(_data(i + 1, "sleep:0.2")) for i, c in enumerate(clients)))
+                return frames, [c.pid for c in clients], asyncio.get_running_loop().time() - t0
+            finally:
+                await asyncio.gather(*(c.close() for c in clients))
+
+        loop = asyncio.new_event_loop()
+        try:
+            frames, pids, elapsed = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+        self.assertEqual([f["data"]["step_index"] for f in frames], [1, 2, 3])
+        self.assertEqual([f["data"]["debug"]["pid"] for f in frames], pids)
+        # 三个 0.2s 调用并发执行：总耗时应明显小于串行的 0.6s
+        self.assertLess(elapsed, 0.6)
+
+    def test_timeout_cancel_and_stderr(self):
+        logs = []
+
+        async def scenario():
+            async with self._client(logs=logs) as c:
+                pid = c.pid
+                timed_out = await c.call(_data(1, "sleep:5"), timeout=0.3)
+                restarted_pid = c.pid
+                task = asyncio.ensure_future(c.call(_data(2, "sleep:0.5")))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                try:
+                    await task
+                    cancelled = False
+                except asyncio.CancelledError:
+                    cancelled = True
+                ok = await c.call(_data(3))
+                stats = await c.stats()
+                return pid, timed_out, restarted_pid, cancelled, ok, stats
+
+        loop = asyncio.new_event_loop()
+        try:
+            pid, timed_out, restarted_pid, cancelled, ok, stats = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+        self.assertEqual(timed_out["error_code"], "1005")
+        self.assertNotEqual(pid, restarted_pid)
+        self.assertTrue(cancelled)
+        self.assertEqual(ok["status"], "OK")
+        self.assertEqual(ok["data"]["step_index"], 3)
+        self.assertEqual(stats["data"]["calls"], 2)
+
+
+    def test_concurrent_timeouts_restart_once(self):
+        async def scenario():
+            async with self._client() as c:
+                pid = c.pid
+                frames = await asyncio.gather(
+                    c.call(_data(1, "sleep:2"), timeout=0.3),
+                    c.call(_data(2), timeout=5),
+                    c.call(_data(3, "sleep:2"), timeout=0.3),
+                )
+                # 推迟的重启在下一次调用前执行，且只执行一次
+                after = await c.call(_data(4))
+                return pid, frames, after, c.restarts, c.pid, c.alive
+
+        loop = asyncio.new_event_loop()
+        try:
+            pid, frames, after, restarts, new_pid, alive = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+        self.assertEqual(frames[0]["error_code"], "1005")
+        self.assertEqual(frames[1]["status"], "OK", frames[1])
+        self.assertEqual(frames[2]["error_code"], "1005")
+        self.assertEqual(after["status"], "OK", after)
+        self.assertEqual(restarts, 1)
+        self.assertNotEqual(pid, new_pid)
+        self.assertTrue(alive)
+
+
+if __name__ == "__main__":
+    unittest.main()
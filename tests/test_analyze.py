@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+
+from procvision_algorithm_sdk.analyze import analyze
+from procvision_algorithm_sdk.cli import package
+
+_ENV = {"PYTHONPATH": os.getcwd()}
+
+
+def _wheel(directory, name, top_level=None):
+    path = os.path.join(directory, f"{name}-1.0-py3-none-any.whl")
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr(f"{name}/__init__.py", "")
+        if top_level is not None:
+            z.writestr(f"{name}-1.0.dist-info/top_level.txt", top_level)
+        z.writestr(f"{name}-1.0.dist-info/METADATA", f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n")
+    return path
+
+
+def _project(d):
+    proj = os.path.join(d, "algo")
+    os.makedirs(os.path.join(proj, "algo_pkg"))
+    os.makedirs(os.path.join(proj, "models"))
+    os.makedirs(os.path.join(proj, "wheels"))
+    with open(os.path.join(proj, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"name": "algo", "version": "1.0.0", "entry_point": "algo_pkg.main:Algo"}, f)
+    with open(os.path.join(proj, "requirements.txt"), "w", encoding="utf-8") as f:
+        f.write("")
+    with open(os.path.join(proj, "algo_pkg", "main.py"), "w", encoding="utf-8") as f:
+        f.write("import usedpkg\nfrom tests.mock_phases_algo import ExecuteAlgo as Algo\n")
+    # 以项目内模块模拟已安装的依赖，使其在启动路径上被导入
+    with open(os.path.join(proj, "usedpkg.py"), "w", encoding="utf-8") as f:
+        f.write("VALUE = 1\n")
+    weights = os.urandom(50000)
+    for n in ("a.onnx", "b.onnx"):
+        with open(os.path.join(proj, "models", n), "wb") as f:
+            f.write(weights)
+    _wheel(os.path.join(proj, "wheels"), "usedpkg", "usedpkg\n")
+    _wheel(os.path.join(proj, "wheels"), "unusedpkg")
+    return proj
+
+
+class TestAnalyze(unittest.TestCase):
+    def _check(self, report, prefix):
+        self.assertEqual(report["status"], "OK", report)
+        self.assertEqual(report["largest"][0]["size"], 50000)
+        dup = report["duplicates"]
+        self.assertEqual(dup["group_count"], 1)
+        self.assertEqual(dup["wasted_bytes"], 50000)
+        self.assertEqual(dup["groups"][0]["paths"], [f"{prefix}models/a.onnx", f"{prefix}models/b.onnx"])
+        self.assertEqual(report["by_dir"][0]["path"], "models")
+        self.assertEqual(report["imports"]["status"], "OK", report["imports"])
+        self.assertIn("usedpkg", report["imports"]["imported"])
+        self.assertIn("algo_pkg", report["imports"]["imported"])
+        self.assertEqual([w["file"] for w in report["unused_wheels"]], ["unusedpkg-1.0-py3-none-any.whl"])
+
+    def test_project(self):
+        with tempfile.TemporaryDirectory() as d:
+            self._check(analyze(_project(d), top=50, env=_ENV), "")
+
+    def test_zip(self):
+        with tempfile.TemporaryDirectory() as d:
+            out = os.path.join(d, "algo.zip")
+            res = package(_project(d), out, None, False, None, None, None, None, True, False, None, None, None)
+            self.assertEqual(res["status"], "OK", res)
+            report = analyze(out, top=50, env=_ENV)
+            self._check(report, "algo/")
+            self.assertIsNotNone(report["compressed_bytes"])
+            self.assertEqual(report["wheel_bytes"], sum(w["size"] for w in report["wheels"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import unittest
+
+from procvision_algorithm_sdk.batch import iter_jobs, run_batch
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.images = os.path.join(self.tmp.name, "images")
+        os.makedirs(os.path.join(self.images, "sub"))
+        for rel in ("a.png", "b.jpg", "sub/c.png", "notes.txt"):
+            with open(os.path.join(self.images, rel), "wb") as f:
+                f.write(b"\x00" * 16)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, source, output, **kw):
+        return run_batch(os.getcwd(), source, output, entry="tests.mock_phases_algo:ControlAlgo", env={"PYTHONPATH": os.getcwd()}, **kw)
+
+    def test_directory_jobs_skip_non_images(self):
+        ids = [j["id"] for j in iter_jobs(self.images)]
+        self.assertEqual(ids, ["a.png", "b.jpg", "sub/c.png"])
+
+    def test_adapter_pool_streams_and_resumes(self):
+        out = os.path.join(self.tmp.name, "results.jsonl")
+        report = self._run(self.images, out, workers=2)
+        self.assertEqual(report["status"], "OK")
+        self.assertEqual(report["processed"], 3)
+        self.assertEqual(report["counts"]["OK"], 3)
+        self.assertEqual(sorted(r["id"] for r in _read(out)), ["a.png", "b.jpg", "sub/c.png"])
+        again = self._run(self.images, out, workers=2)
+        self.assertEqual(again["processed"], 0)
+        self.assertEqual(again["skipped"], 3)
+        self.assertEqual(len(_read(out)), 3)
+
+    def test_manifest_in_process_workers(self):
+        manifest = os.path.join(self.tmp.name, "jobs.csv")
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.write("id,cur_image,step_index,step_desc,guide_info\n")
+            f.write('j1,images/a.png,2,step two,"[{""x"": 1}]"\n')
+            f.write("j2,images/missing.png,3,,\n")
+        out = os.path.join(self.tmp.name, "results.jsonl")
+        report = self._run(manifest, out, workers=2, in_process=True)
+        self.assertEqual(report["processed"], 2)
+        recs = {r["id"]: r for r in _read(out)}
+        self.assertEqual(recs["j1"]["status"], "OK")
+        self.assertEqual(recs["j1"]["data"]["debug"]["step_index"], 2)
+        self.assertEqual(recs["j2"]["status"], "ERROR")
+        self.assertEqual(recs["j2"]["error_code"], "1002")
+        self.assertEqual(report["counts"]["ERROR"], 1)
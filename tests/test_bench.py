@@ -0,0 +1,34 @@
+import os
+import unittest
+
+from procvision_algorithm_sdk.bench import bench, percentiles
+
+
+class TestBench(unittest.TestCase):
+    def _bench(self, **kw):
+        return bench(os.getcwd(), entry="tests.mock_phases_algo:ControlAlgo", env={"PYTHONPATH": os.getcwd()}, width=32, height=24, **kw)
+
+    def test_percentiles_nearest_rank(self):
+        p = percentiles([float(i) for i in range(1, 101)])
+        self.assertEqual(p["count"], 100)
+        self.assertEqual(p["p50_ms"], 50.0)
+        self.assertEqual(p["p99_ms"], 99.0)
+        self.assertEqual(p["max_ms"], 100.0)
+        self.assertEqual(percentiles([])["count"], 0)
+
+    def test_bench_reports_latency_stages_and_resources(self):
+        report = self._bench(calls=20, warmup=2, concurrency=2)
+        self.assertEqual(report["status"], "OK")
+        self.assertEqual(report["latency"]["count"], 20)
+        self.assertEqual(report["outcomes"]["OK"] + report["outcomes"]["NG"], 20)
+        self.assertGreater(report["throughput_per_s"], 0)
+        self.assertIn("execute", report["stages"])
+        self.assertIn("total", report["stages"])
+        self.assertEqual(report["stages"]["execute"]["count"], 20)
+        self.assertIsNotNone(report["first_call_ms"])
+        self.assertIn("rss_growth_bytes", report["resources"])
+
+    def test_fixed_rate_paces_calls(self):
+        report = self._bench(calls=5, warmup=0, rate=20.0)
+        self.assertEqual(report["latency"]["count"], 5)
+        self.assertGreaterEqual(report["wall_s"], 0.19)
@@ -0,0 +1,106 @@
+import os
+import threading
+import unittest
+
+from procvision_algorithm_sdk.client import AdapterClient
+
+
+def _data(step_index=1, step_desc="step"):
+    meta = {"width": 1, "height": 1, "timestamp_ms": 0, "camera_id": "c"}
+    return {
+        "step_index": step_index,
+        "step_desc": step_desc,
+        "guide_info": [],
+        "cur_image_shm_id": "dev-shm:client:cur",
+        "cur_image_meta": meta,
+        "guide_image_shm_id": "dev-shm:client:guide",
+        "guide_image_meta": meta,
+    }
+
+
+class TestAdapterClient(unittest.TestCase):
+    def _client(self, **kw):
+        return AdapterClient(os.getcwd(), entry="tests.mock_phases_algo:ControlAlgo", env={"PYTHONPATH": os.getcwd()}, **kw)
+
+    def test_reuses_process_across_calls(self):
+        with self._client() as c:
+            pids = {c.call(_data(i))["data"]["debug"]["pid"] for i in range(1, 4)}
+            self.assertEqual(pids, {c.pid})
+            self.assertTrue(c.ping())
+            self.assertEqual(c.stats()["data"]["calls"], 3)
+
+    def test_multiplexed_concurrent_calls(self):
+        with self._client() as c:
+            results = {}
+
+            def worker(i):
+                results[i] = c.call(_data(i))
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            for i in range(1, 6):
+                self.assertEqual(results[i]["data"]["step_index"], i)
+            self.assertEqual(c.outstanding, 0)
+
+    def test_timeout_restarts_adapter(self):
+        with self._client() as c:
+            pid = c.pid
+            res = c.call(_data(1, "sleep:5"), timeout=0.3)
+            self.assertEqual(res["type"], "error")
+            self.assertEqual(res["error_code"], "1005")
+            self.assertNotEqual(c.pid, pid)
+            self.assertEqual(c.call(_data(2))["status"], "OK")
+
+    def test_crash_then_restart_on_next_call(self):
+        with self._client() as c:
+            res = c.call(_data(1, "exit"), timeout=10)
+            self.assertEqual(res["type"], "error")
+            ok = c.call(_data(2), timeout=10)
+            self.assertEqual(ok["status"], "OK")
+            self.assertEqual(c.restarts, 1)
+
+    def test_concurrent_callers_restart_once_after_crash(self):
+        with self._client() as c:
+            self.assertEqual(c.call(_data(1, "exit"), timeout=10)["type"], "error")
+            results = {}
+
+            def worker(i):
+                results[i] = c.call(_data(i), timeout=10)
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(2, 8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual({r["status"] for r in results.values()}, {"OK"})
+            self.assertEqual({r["data"]["debug"]["pid"] for r in results.values()}, {c.pid})
+            self.assertEqual(c.restarts, 1)
+
+    def test_timeout_does_not_fail_other_inflight_calls(self):
+        with self._client() as c:
+            pid = c.pid
+            slow = c.submit({"type": "call", "data": _data(1, "sleep:0.8")})
+            other = c.submit({"type": "call", "data": _data(2)})
+            self.assertEqual(c.wait(slow, timeout=0.2)["error_code"], "1005")
+            self.assertEqual(c.pid, pid)
+            self.assertEqual(c.wait(other, timeout=10)["status"], "OK")
+            res = c.call(_data(3), timeout=10)
+            self.assertEqual(res["status"], "OK")
+            self.assertNotEqual(res["data"]["debug"]["pid"], pid)
+
+    def test_entry_failure_reported_without_restart(self):
+        c = AdapterClient(os.getcwd(), entry="tests.mock_phases_algo:NoSuchAlgo", env={"PYTHONPATH": os.getcwd()}, auto_restart=False)
+        try:
+            c.start()
+            res = c.call(_data(), timeout=10)
+            self.assertEqual(res["type"], "error")
+            self.assertIn("NoSuchAlgo", res["message"])
+        finally:
+            c.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+import io
+import json
+import signal
+import threading
+import time
+import unittest
+
+from procvision_algorithm_sdk.logger import MAX_LIMIT_KEYS, StructuredLogger, flush_loggers, get_levels, logger_counters, set_level
+from tests.adapter_helpers import _adapter, _call_payload, _read_frame, _write_frame
+
+
+class _SlowSink(io.StringIO):
+    def __init__(self, delay_s: float = 0.0):
+        super().__init__()
+        self.delay_s = delay_s
+        self.writes = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def write(self, s):
+        self.gate.wait()
+        time.sleep(self.delay_s)
+        self.writes += 1
+        return super().write(s)
+
+
+class TestAsyncLogger(unittest.TestCase):
+    def test_async_batches_keep_order_and_flush(self):
+        sink = _SlowSink()
+        log = StructuredLogger(sink=sink, async_mode=True, batch_size=64)
+        for i in range(500):
+            log.info("tick", i=i)
+        self.assertTrue(log.flush(5.0))
+        lines = [json.loads(x) for x in sink.getvalue().splitlines()]
+        self.assertEqual([x["i"] for x in lines], list(range(500)))
+        c = log.counters()
+        self.assertEqual(c["mode"], "async")
+        self.assertEqual(c["emitted"], 500)
+        self.assertEqual(c["dropped"], 0)
+        self.assertLess(sink.writes, 500)
+        self.assertEqual(c["batches"], sink.writes)
+        log.close()
+
+    def test_drop_policy_counts(self):
+        sink = _SlowSink()
+        sink.gate.clear()
+        log = StructuredLogger(sink=sink, async_mode=True, queue_size=10, batch_size=1, overflow="drop")
+        for i in range(100):
+            log.info("tick", i=i)
+        sink.gate.set()
+        flush_loggers(5.0)
+        c = log.counters()
+        self.assertGreater(c["dropped"], 0)
+        self.assertEqual(c["emitted"] + c["dropped"], 100)
+        self.assertEqual(len(sink.getvalue().splitlines()), c["emitted"])
+        self.assertGreaterEqual(logger_counters()["dropped"], c["dropped"])
+        log.close()
+
+    def test_block_policy_loses_nothing(self):
+        sink = _SlowSink(delay_s=0.001)
+        log = StructuredLogger(sink=sink, async_mode=True, queue_size=5, batch_size=2, overflow="block")
+        for i in range(50):
+            log.info("tick", i=i, obj=object())
+        log.close()
+        c = log.counters()
+        self.assertEqual(c["emitted"], 50)
+        self.assertEqual(c["dropped"], 0)
+        self.assertGreater(c["blocked"], 0)
+        lines = [json.loads(x) for x in sink.getvalue().splitlines()]
+        self.assertEqual([x["i"] for x in lines], list(range(50)))
+        self.assertTrue(lines[0]["obj"].startswith("<object"))
+
+    def test_invalid_overflow(self):
+        with self.assertRaises(ValueError):
+            StructuredLogger(sink=io.StringIO(), overflow="spill")
+
+
+class TestLogLevels(unittest.TestCase):
+    def tearDown(self):
+        for name in list(get_levels()["loggers"]):
+            set_level(None, name)
+        set_level("info")
+
+    def test_filtered_records_skip_lazy_fields(self):
+        calls = []
+        sink = io.StringIO()
+        log = StructuredLogger(sink=sink, name="algo.detector")
+        log.debug("tile", detail=lambda: calls.append(1))
+        self.assertEqual(sink.getvalue(), "")
+        self.assertEqual(calls, [])
+        log.info("tile", detail=lambda: {"n": len(calls) + 1}, boom=lambda: 1 / 0)
+        obj = json.loads(sink.getvalue())
+        self.assertEqual(obj["detail"], {"n": 1})
+        self.assertEqual(obj["logger"], "algo.detector")
+        self.assertIn("ZeroDivisionError", obj["boom"])
+        self.assertFalse(log.is_enabled("debug"))
+
+    def test_runtime_levels_by_prefix(self):
+        sink = io.StringIO()
+        det = StructuredLogger(sink=sink, name="algo.detector")
+        other = StructuredLogger(sink=sink, name="algo2")
+        fixed = StructuredLogger(sink=sink, name="algo.fixed", level="error")
+        set_level("debug", "algo")
+        det.debug("a")
+        other.debug("b")
+        set_level("warning")
+        set_level(None, "algo")
+        det.info("c")
+        det.warning("d")
+        fixed.warning("e")
+        self.assertEqual([json.loads(x)["message"] for x in sink.getvalue().splitlines()], ["a", "d"])
+        self.assertEqual(get_levels(), {"default": "warning", "loggers": {}})
+        with self.assertRaises(ValueError):
+            set_level("verbose")
+
+
+class TestRateLimits(unittest.TestCase):
+    def test_sampling_and_summary(self):
+        sink = io.StringIO()
+        log = StructuredLogger(sink=sink, summary_interval_s=3600)
+        log.limit("tile", every=10)
+        for i in range(100):
+            log.info("tile", i=i)
+        log.info("other")
+        c = log.counters()
+        self.assertEqual(c["emitted"], 11)
+        self.assertEqual(c["suppressed"], 90)
+        self.assertEqual(c["limits"]["tile"], {"seen": 100, "suppressed": 90})
+        log.flush()
+        lines = [json.loads(x) for x in sink.getvalue().splitlines()]
+        self.assertEqual([x["i"] for x in lines if x["message"] == "tile"], list(range(0, 100, 10)))
+        self.assertEqual(lines[-1]["message"], "log_suppressed")
+        self.assertEqual(lines[-1]["suppressed"], {"tile": 90})
+        log.flush()
+        self.assertEqual(len(sink.getvalue().splitlines()), len(lines))
+
+    def test_token_bucket_and_periodic_summary(self):
+        sink = io.StringIO()
+        log = StructuredLogger(sink=sink, rate_limit=1000.0, summary_interval_s=0.05)
+        log.limit("defect", rate=1.0, burst=5)
+        for i in range(100):
+            log.info("defect", i=i, expensive=lambda: 1 / 0)
+        self.assertLessEqual(log.counters()["limits"]["defect"]["seen"] - log.counters()["limits"]["defect"]["suppressed"], 6)
+        time.sleep(0.06)
+        log.info("defect")
+        summaries = [json.loads(x) for x in sink.getvalue().splitlines() if '"log_suppressed"' in x]
+        self.assertEqual(len(summaries), 1)
+        self.assertGreaterEqual(summaries[0]["suppressed"]["defect"], 94)
+        for i in range(50):
+            log.info(f"frame {i}")
+        self.assertEqual(log.counters()["suppressed"] - log.counters()["limits"]["defect"]["suppressed"], 0)
+        self.assertGreaterEqual(logger_counters()["suppressed_by_message"].get("defect", 0), 94)
+
+
+    def test_counters_while_new_keys_are_inserted(self):
+        log = StructuredLogger(sink=io.StringIO(), rate_limit=1000.0, summary_interval_s=3600)
+        stop = threading.Event()
+        errors = []
+
+        def spam():
+            i = 0
+            while not stop.is_set() and i < MAX_LIMIT_KEYS:
+                log.info(f"frame {i}")
+                i += 1
+
+        t = threading.Thread(target=spam)
+        t.start()
+        try:
+            while t.is_alive():
+                try:
+                    log.counters()
+                    logger_counters()
+                    log.summarize()
+                except RuntimeError as e:
+                    errors.append(e)
+                    break
+        finally:
+            stop.set()
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(log.counters()["limits"]), MAX_LIMIT_KEYS)
+
+
+class TestAdapterAsyncLogging(unittest.TestCase):
+    def test_stats_and_flush_on_sigterm(self):
+        with _adapter("tests.mock_phases_algo:LogSpamAlgo", "--log-async") as p:
+            _read_frame(p.stdout)
+            _write_frame(p.stdin, {"type": "hello", "runner_version": "dev"})
+            for i in range(3):
+                _write_frame(p.stdin, _call_payload(f"r{i}"))
+                self.assertEqual(_read_frame(p.stdout)["type"], "result")
+            _write_frame(p.stdin, {"type": "stats", "request_id": "s1"})
+            logging = _read_frame(p.stdout)["data"]["logging"]
+            self.assertGreaterEqual(logging["async"], 1)
+            self.assertEqual(logging["dropped"], 0)
+            p.send_signal(signal.SIGTERM)
+            _, err = p.communicate(timeout=10)
+        spam = [json.loads(x) for x in err.decode("utf-8").splitlines() if '"spam"' in x]
+        self.assertEqual(len(spam), 600)
+        self.assertEqual(p.returncode, 128 + signal.SIGTERM)
+
+    def test_rate_limit_flag(self):
+        with _adapter("tests.mock_phases_algo:LogSpamAlgo", "--log-rate-limit", "5") as p:
+            _read_frame(p.stdout)
+            _write_frame(p.stdin, {"type": "hello", "runner_version": "dev"})
+            _write_frame(p.stdin, _call_payload("r0"))
+            self.assertEqual(_read_frame(p.stdout)["type"], "result")
+            _write_frame(p.stdin, {"type": "stats", "request_id": "s1"})
+            logging = _read_frame(p.stdout)["data"]["logging"]
+            self.assertGreaterEqual(logging["suppressed"], 190)
+            self.assertIn("spam", logging["suppressed_by_message"])
+            _write_frame(p.stdin, {"type": "shutdown"})
+            _read_frame(p.stdout)
+            _, err = p.communicate(timeout=10)
+        lines = [json.loads(x) for x in err.decode("utf-8").splitlines() if x.startswith("{")]
+        self.assertLessEqual(sum(1 for x in lines if x["message"] == "spam"), 10)
+        summary = [x for x in lines if x["message"] == "log_suppressed"]
+        self.assertEqual(sum(x["suppressed"]["spam"] for x in summary), logging["suppressed_by_message"]["spam"])
+
+    def test_log_level_message(self):
+        with _adapter("tests.mock_phases_algo:LogSpamAlgo", env={"PROC_LOG_LEVEL": "WARNING"}) as p:
+            self.assertIn("log_level:v1", _read_frame(p.stdout)["capabilities"])
+            _write_frame(p.stdin, {"type": "hello", "runner_version": "dev"})
+            _write_frame(p.stdin, _call_payload("r0"))
+            self.assertEqual(_read_frame(p.stdout)["data"]["debug"]["lazy_evals"], 0)
+            _write_frame(p.stdin, {"type": "log_level", "request_id": "l1", "level": "debug", "logger": "tests.mock_phases_algo"})
+            res = _read_frame(p.stdout)
+            self.assertEqual(res["data"], {"default": "warning", "loggers": {"tests.mock_phases_algo": "debug"}})
+            _write_frame(p.stdin, _call_payload("r1"))
+            self.assertEqual(_read_frame(p.stdout)["data"]["debug"]["lazy_evals"], 200)
+            _write_frame(p.stdin, {"type": "log_level", "request_id": "l2", "level": "loud"})
+            self.assertEqual(_read_frame(p.stdout)["type"], "error")
+            _write_frame(p.stdin, {"type": "shutdown"})
+            _read_frame(p.stdout)
+            _, err = p.communicate(timeout=10)
+        lines = [json.loads(x) for x in err.decode("utf-8").splitlines() if x.startswith("{")]
+        self.assertEqual(sum(1 for x in lines if x["message"] == "detail"), 200)
+        self.assertEqual(sum(1 for x in lines if x["message"] == "spam"), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
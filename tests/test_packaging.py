@@ -0,0 +1,194 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from procvision_algorithm_sdk import packaging
+from procvision_algorithm_sdk.cli import package
+from procvision_algorithm_sdk.client import AdapterClient
+from procvision_algorithm_sdk.imports import parse_importtime, slow_imports
+
+
+def _project(d):
+    proj = os.path.join(d, "algo")
+    os.makedirs(os.path.join(proj, "algo_pkg"))
+    os.makedirs(os.path.join(proj, "models"))
+    os.makedirs(os.path.join(proj, "wheels"))
+    os.makedirs(os.path.join(proj, ".venv", "lib"))
+    with open(os.path.join(proj, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"name": "algo", "version": "1.0.0"}, f)
+    with open(os.path.join(proj, "requirements.txt"), "w", encoding="utf-8") as f:
+        f.write("numpy\n")
+    with open(os.path.join(proj, "algo_pkg", "main.py"), "w", encoding="utf-8") as f:
+        f.write("x = 1\n" * 2000)
+    with open(os.path.join(proj, "models", "net.onnx"), "wb") as f:
+        f.write(b"\0" * 100000)
+    with open(os.path.join(proj, "wheels", "dep-1.0-py3-none-any.whl"), "wb") as f:
+        f.write(b"PK" * 1000)
+    with open(os.path.join(proj, ".venv", "lib", "big.py"), "w", encoding="utf-8") as f:
+        f.write("ignored\n")
+    return proj
+
+
+def _build(proj, out, **kw):
+    return package(proj, out, None, False, None, None, None, None, True, False, None, None, None, **kw)
+
+
+class TestIncrementalPackage(unittest.TestCase):
+    def test_layout_and_compression_modes(self):
+        with tempfile.TemporaryDirectory() as d:
+            proj = _project(d)
+            out = os.path.join(d, "algo.zip")
+            res = _build(proj, out, jobs=2)
+            self.assertEqual(res["status"], "OK", res)
+            with zipfile.ZipFile(out) as z:
+                self.assertIsNone(z.testzip())
+                names = z.namelist()
+                self.assertIn("algo/algo_pkg/main.py", names)
+                self.assertIn("wheels/dep-1.0-py3-none-any.whl", names)
+                self.assertIn("algo/deploy_bootstrap.json", names)
+                self.assertFalse(any(".venv" in n or ".procvision_cache" in n for n in names))
+                self.assertEqual(z.getinfo("algo/algo_pkg/main.py").compress_type, zipfile.ZIP_DEFLATED)
+                self.assertEqual(z.getinfo("algo/models/net.onnx").compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(z.getinfo("wheels/dep-1.0-py3-none-any.whl").compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(z.read("algo/algo_pkg/main.py"), b"x = 1\n" * 2000)
+
+    def test_rebuild_reuses_hashes_and_compressed_members(self):
+        with tempfile.TemporaryDirectory() as d:
+            proj = _project(d)
+            out = os.path.join(d, "algo.zip")
+            first = _build(proj, out)["build"]["stats"]
+            self.assertGreater(first["compressed"], 0)
+            second = _build(proj, out)["build"]["stats"]
+            self.assertEqual(second["compressed"], 0)
+            # 仅每次重写的 requirements.sanitized.txt 需要重新哈希，内容未变仍复用压缩结果
+            self.assertEqual(second["hashed"], 1)
+            self.assertEqual(second["compress_reused"], first["compressed"])
+            with open(os.path.join(proj, "algo_pkg", "main.py"), "a", encoding="utf-8") as f:
+                f.write("y = 2\n")
+            third = _build(proj, out)["build"]["stats"]
+            self.assertEqual(third["compressed"], 1)
+            with zipfile.ZipFile(out) as z:
+                self.assertIsNone(z.testzip())
+                self.assertTrue(z.read("algo/algo_pkg/main.py").endswith(b"y = 2\n"))
+            full = _build(proj, out, incremental=False)["build"]["stats"]
+            self.assertEqual(full["compress_reused"], 0)
+
+
+    def test_raw_members_fall_back_without_zipfile_internals(self):
+        with tempfile.TemporaryDirectory() as d:
+            proj = _project(d)
+            raw_out = os.path.join(d, "raw.zip")
+            raw = _build(proj, raw_out)["build"]["stats"]
+            self.assertEqual(raw["raw_fallback"], 0)
+            # 模拟缺少私有属性的 zipfile 实现：成员内容与压缩方式不变
+            fb_out = os.path.join(d, "fallback.zip")
+            with mock.patch.object(packaging, "_RAW_ATTRS", packaging._RAW_ATTRS + ("_missing_attr",)):
+                fb = _build(proj, fb_out)["build"]["stats"]
+            self.assertEqual(fb["raw_fallback"], fb["files"])
+            with zipfile.ZipFile(raw_out) as a, zipfile.ZipFile(fb_out) as b:
+                self.assertIsNone(b.testzip())
+                self.assertEqual(a.namelist(), b.namelist())
+                for info in a.infolist():
+                    self.assertEqual(b.getinfo(info.filename).compress_type, info.compress_type)
+                    self.assertEqual(b.read(info.filename), a.read(info.filename))
+
+
+class TestBytecodeAndImportIndex(unittest.TestCase):
+    def _project(self, d):
+        proj = _project(d)
+        with open(os.path.join(proj, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({"name": "algo", "version": "1.0.0", "entry_point": "algo_pkg.main:Algo"}, f)
+        with open(os.path.join(proj, "algo_pkg", "main.py"), "a", encoding="utf-8") as f:
+            f.write(
+                "class Algo:\n"
+                "    def execute(self, step_index, step_desc, cur_image, guide_image, guide_info):\n"
+                "        import algo_pkg.lazy_mod\n"
+                "        return {'status': 'OK', 'data': {'result_status': 'OK', 'defect_rects': []}}\n"
+            )
+        with open(os.path.join(proj, "algo_pkg", "lazy_mod.py"), "w", encoding="utf-8") as f:
+            f.write("VALUE = 1\n")
+        return proj
+
+    def test_hash_based_pycs_and_import_index(self):
+        with tempfile.TemporaryDirectory() as d:
+            proj = self._project(d)
+            out = os.path.join(d, "algo.zip")
+            res = _build(proj, out, compile_bytecode=True, import_index=True)
+            self.assertEqual(res["status"], "OK", res)
+            self.assertEqual(res["bytecode"]["compiled"], 2)
+            tag = sys.implementation.cache_tag
+            with zipfile.ZipFile(out) as z:
+                pyc = z.read(f"algo/algo_pkg/__pycache__/main.{tag}.pyc")
+                index = json.loads(z.read("algo/import_index.json"))
+                z.extractall(os.path.join(d, "deployed"))
+            # flags=0b11：基于哈希且导入时校验源码
+            self.assertEqual(int.from_bytes(pyc[4:8], "little"), 3)
+            phases = {m["module"]: m["phase"] for m in index["modules"]}
+            self.assertEqual(phases.get("algo_pkg.main"), "startup")
+            self.assertEqual(phases.get("algo_pkg.lazy_mod"), "lazy")
+            again = _build(proj, out, compile_bytecode=True)
+            self.assertEqual(again["bytecode"]["reused"], 2)
+
+            logs = []
+            env = {"PYTHONPATH": os.getcwd(), "PROC_PRELOAD_IMPORTS": "1"}
+            with AdapterClient(os.path.join(d, "deployed", "algo"), env=env, stderr_handler=logs.append) as c:
+                startup = c.stats()["data"]["startup"]
+            self.assertTrue(startup["import_index"])
+            self.assertIn("preload_ms", startup)
+            preloaded = [json.loads(line) for line in logs if b"imports_preloaded" in line]
+            self.assertEqual(preloaded[0]["imported"], 1)
+
+    def test_compiled_pycs_replace_stale_project_pycache(self):
+        with tempfile.TemporaryDirectory() as d:
+            proj = self._project(d)
+            tag = sys.implementation.cache_tag
+            cache = os.path.join(proj, "algo_pkg", "__pycache__")
+            os.makedirs(cache)
+            # 旧的基于时间戳的 pyc（flags=0）与已删除源码遗留的 pyc
+            for name in (f"main.{tag}.pyc", f"gone.{tag}.pyc"):
+                with open(os.path.join(cache, name), "wb") as f:
+                    f.write(b"\0" * 16)
+            out = os.path.join(d, "algo.zip")
+            res = _build(proj, out, compile_bytecode=True)
+            self.assertEqual(res["status"], "OK", res)
+            self.assertEqual(res["bytecode"]["stale_dropped"], 2)
+            with zipfile.ZipFile(out) as z:
+                names = z.namelist()
+                pyc = z.read(f"algo/algo_pkg/__pycache__/main.{tag}.pyc")
+            self.assertEqual(names.count(f"algo/algo_pkg/__pycache__/main.{tag}.pyc"), 1)
+            self.assertNotIn(f"algo/algo_pkg/__pycache__/gone.{tag}.pyc", names)
+            self.assertEqual(int.from_bytes(pyc[4:8], "little"), 3)
+
+    def test_parse_importtime_phases(self):
+        text = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 | site\n"
+            "procvision-import-phase:startup\n"
+            "import time:       300 |        300 |   algo_pkg.util\n"
+            "import time:      1500 |       1800 | algo_pkg.main\n"
+            "procvision-import-phase:lazy\n"
+            "import time:    900000 |     900000 | torch\n"
+        )
+        mods = parse_importtime(text)
+        self.assertEqual([m["module"] for m in mods], ["site", "algo_pkg.util", "algo_pkg.main", "torch"])
+        self.assertEqual(mods[1]["depth"], 1)
+        self.assertEqual(mods[2]["cumulative_ms"], 1.8)
+        self.assertEqual([m["phase"] for m in mods], [None, "startup", "startup", "lazy"])
+        self.assertEqual(slow_imports({"modules": mods}, 500.0), [{"module": "torch", "self_ms": 900.0, "phase": "lazy"}])
+
+    def test_bytecode_rejects_other_target_version(self):
+        with tempfile.TemporaryDirectory() as d:
+            proj = self._project(d)
+            with open(os.path.join(proj, ".procvision_env.json"), "w", encoding="utf-8") as f:
+                json.dump({"python_version": "2.7"}, f)
+            res = _build(proj, os.path.join(d, "algo.zip"), compile_bytecode=True)
+            self.assertEqual(res["status"], "ERROR")
+            self.assertIn("--target-python", res["message"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import unittest
+
+from procvision_algorithm_sdk.perf_validate import manifest_perf_checks
+
+_ENV = {"PYTHONPATH": os.getcwd()}
+
+
+def _project(d, entry, performance):
+    with open(os.path.join(d, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"name": "perf", "version": "1.0.0", "entry_point": entry, "performance": performance}, f)
+    return d
+
+
+def _results(checks):
+    return {c["name"]: c["result"] for c in checks}
+
+
+class TestManifestPerfChecks(unittest.TestCase):
+    def test_budgets_pass_at_declared_resolution(self):
+        with tempfile.TemporaryDirectory() as d:
+            perf = {"image_width": 320, "image_height": 200, "calls": 10, "p99_budget_ms": 2000, "first_call_budget_ms": 5000}
+            checks = manifest_perf_checks(_project(d, "tests.mock_phases_algo:ExecuteAlgo", perf), env=_ENV)
+        self.assertEqual(set(_results(checks).values()), {"PASS"}, checks)
+        self.assertEqual(sorted(_results(checks)), ["perf_calls_ok", "perf_determinism", "perf_first_call", "perf_p99_budget", "perf_rss_growth"])
+        self.assertIn("@ 320x200", next(c["message"] for c in checks if c["name"] == "perf_p99_budget"))
+
+    def test_budget_exceeded_and_nondeterminism_fail(self):
+        with tempfile.TemporaryDirectory() as d:
+            checks = manifest_perf_checks(_project(d, "tests.mock_phases_algo:RandomAlgo", {"calls": 5, "p99_budget_ms": 0.001}), env=_ENV)
+        res = _results(checks)
+        self.assertEqual(res["perf_p99_budget"], "FAIL")
+        self.assertEqual(res["perf_determinism"], "FAIL")
+        self.assertEqual(res["perf_calls_ok"], "PASS")
+
+    def test_rss_growth_limit(self):
+        with tempfile.TemporaryDirectory() as d:
+            perf = {"calls": 10, "max_rss_growth_mb": 8, "deterministic": False}
+            checks = manifest_perf_checks(_project(d, "tests.mock_phases_algo:LeakAlgo", perf), env=_ENV)
+        res = _results(checks)
+        self.assertNotIn("perf_determinism", res)
+        self.assertEqual(res["perf_rss_growth"], "FAIL", checks)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import threading
+import unittest
+
+from procvision_algorithm_sdk.pool import AdapterPool
+from tests.test_client import _data
+
+
+class TestAdapterPool(unittest.TestCase):
+    def _pool(self, replicas=2):
+        pool = AdapterPool(health_interval_s=0)
+        name = pool.add(os.getcwd(), replicas=replicas, name="ctl", entry="tests.mock_phases_algo:ControlAlgo", env={"PYTHONPATH": os.getcwd()})
+        return pool, name
+
+    def test_least_outstanding_spreads_load(self):
+        pool, name = self._pool()
+        try:
+            pids = []
+            lock = threading.Lock()
+
+            def worker(i):
+                res = pool.call(name, _data(i, "sleep:0.2"))
+                with lock:
+                    pids.append(res["data"]["debug"]["pid"])
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(len(set(pids)), 2)
+            self.assertEqual(sum(m["served"] for m in pool.status()[name]), 4)
+        finally:
+            pool.close()
+
+    def test_health_check_replaces_dead_member(self):
+        pool, name = self._pool()
+        try:
+            victim = pool.status()[name][0]["pid"]
+            pool._members[name][0].client.proc.kill()
+            pool._members[name][0].client.proc.wait()
+            report = pool.health_check()
+            self.assertTrue(all(m["alive"] for m in report[name]))
+            self.assertNotIn(victim, [m["pid"] for m in report[name]])
+            self.assertEqual(report[name][0]["replaced"], 1)
+            self.assertEqual(pool.call(name, _data())["status"], "OK")
+        finally:
+            pool.close()
+
+    def test_crashed_member_replaced_after_call(self):
+        pool, name = self._pool(replicas=1)
+        try:
+            self.assertEqual(pool.call(name, _data(1, "exit"), timeout=10)["type"], "error")
+            self.assertEqual(pool.call(name, _data(2), timeout=10)["status"], "OK")
+        finally:
+            pool.close()
+
+    def test_failed_replica_start_closes_started_ones(self):
+        pool = AdapterPool(health_interval_s=0)
+        made = []
+        procs = []
+        new_client = pool._new_client
+
+        def _new_client(spec):
+            # 第二个副本使用不存在的解释器，启动时抛出
+            c = new_client(spec)
+            if made:
+                c.python = os.path.join(os.getcwd(), "no-such-python")
+            start = c.start
+
+            def _start():
+                hello = start()
+                procs.append(c.proc)
+                return hello
+
+            c.start = _start
+            made.append(c)
+            return c
+
+        pool._new_client = _new_client
+        try:
+            with self.assertRaises(OSError):
+                pool.add(os.getcwd(), replicas=3, name="ctl", entry="tests.mock_phases_algo:ControlAlgo", env={"PYTHONPATH": os.getcwd()})
+            self.assertEqual(len(made), 3)
+            self.assertEqual(len(procs), 1)
+            self.assertIsNotNone(procs[0].poll())
+            self.assertEqual(pool.status(), {})
+        finally:
+            pool.close()
+
+    def test_drain_rejects_new_calls(self):
+        pool, name = self._pool(replicas=1)
+        try:
+            self.assertTrue(pool.drain(timeout=1.0))
+            res = pool.call(name, _data())
+            self.assertEqual(res["type"], "error")
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
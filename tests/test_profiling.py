@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from procvision_algorithm_sdk.client import AdapterClient
+from procvision_algorithm_sdk.profiling import ExecuteProfiler
+from tests.test_client import _data
+
+_LEAK = []
+
+
+def _hot_loop(ms):
+    end = time.perf_counter() + ms / 1000.0
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    _LEAK.append(bytearray(64 * 1024))
+    return n
+
+
+class TestExecuteProfiler(unittest.TestCase):
+    def test_cprofile_and_tracemalloc_summary(self):
+        with tempfile.TemporaryDirectory() as d:
+            prof = ExecuteProfiler(d, calls=3, skip=1)
+            for _ in range(4):
+                with prof.call():
+                    _hot_loop(2)
+            self.assertTrue(prof.done)
+            s = prof.summary
+            self.assertEqual(s["calls"], 3)
+            self.assertTrue(any("_hot_loop" in r["function"] for r in s["cpu_top"]))
+            self.assertGreaterEqual(s["memory"]["retained_bytes"], 3 * 64 * 1024)
+            self.assertTrue(s["memory"]["top"][0]["location"].startswith("test_profiling.py:"))
+            for key in ("cpu_prof", "alloc_collapsed", "summary"):
+                self.assertTrue(os.path.isfile(s["files"][key]))
+
+    def test_sampling_writes_collapsed_stacks(self):
+        with tempfile.TemporaryDirectory() as d:
+            prof = ExecuteProfiler(d, calls=3, cpu="sample", memory=False)
+            for _ in range(3):
+                with prof.call():
+                    _hot_loop(30)
+            with open(prof.summary["files"]["cpu_collapsed"], "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertTrue(lines)
+            self.assertTrue(any("_hot_loop" in line for line in lines))
+            self.assertNotIn("alloc_collapsed", prof.summary["files"])
+
+    def test_adapter_profile_flag(self):
+        with tempfile.TemporaryDirectory() as d:
+            args = ["--profile-dir", d, "--profile-calls", "2", "--profile-skip", "1"]
+            with AdapterClient(os.getcwd(), entry="tests.mock_phases_algo:ControlAlgo", env={"PYTHONPATH": os.getcwd()}, adapter_args=args) as c:
+                for i in range(3):
+                    self.assertEqual(c.call(_data(i + 1))["status"], "OK")
+                with open(os.path.join(d, "summary.json"), "r", encoding="utf-8") as f:
+                    summary = json.load(f)
+            self.assertEqual(summary["calls"], 2)
+            self.assertEqual(summary["skipped"], 1)
+            self.assertTrue(any("execute" in r["function"] for r in summary["cpu_top"]))
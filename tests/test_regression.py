@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from procvision_algorithm_sdk.cli import perf_checks
+from procvision_algorithm_sdk.regression import compare, describe, load_baseline, parse_thresholds, run_scenario, save_baseline
+
+
+def _doc(p99_values, throughput_values=None):
+    metrics = {"p99_ms": describe(p99_values)}
+    if throughput_values is not None:
+        metrics["throughput_per_s"] = describe(throughput_values)
+    return {"scenarios": {"s": {"runs": len(p99_values), "errors": 0, "metrics": metrics}}}
+
+
+class TestRegression(unittest.TestCase):
+    def test_describe_confidence_interval(self):
+        d = describe([10.0, 12.0, 14.0])
+        self.assertEqual(d["mean"], 12.0)
+        self.assertEqual(d["stdev"], 2.0)
+        # t(2)=4.303, 4.303*2/sqrt(3)=4.969
+        self.assertEqual(d["ci95"], [7.031, 16.969])
+
+    def test_significant_regression_fails(self):
+        report = compare(_doc([10.0, 10.2, 9.9, 10.1]), _doc([13.0, 13.1, 12.9, 13.2]))
+        self.assertEqual(report["status"], "FAIL")
+        self.assertTrue(report["checks"][0]["significant"])
+
+    def test_change_within_noise_passes(self):
+        report = compare(_doc([10.0, 16.0, 7.0, 12.0]), _doc([14.0, 9.0, 18.0, 11.0]))
+        self.assertEqual(report["status"], "PASS")
+        self.assertFalse(report["checks"][0]["significant"])
+
+    def test_direction_and_thresholds(self):
+        base = _doc([10.0, 10.0], [100.0, 101.0])
+        cur = _doc([10.0, 10.0], [80.0, 81.0])
+        report = compare(base, cur)
+        failed = {c["metric"] for c in report["checks"] if c["result"] == "FAIL"}
+        self.assertEqual(failed, {"throughput_per_s"})
+        self.assertEqual(compare(base, cur, parse_thresholds(["throughput_per_s=25%"]))["status"], "PASS")
+        with self.assertRaises(ValueError):
+            parse_thresholds(["bogus=5"])
+
+    def test_run_scenario_and_baseline_roundtrip(self):
+        scenario = run_scenario(os.getcwd(), repeat=2, entry="tests.mock_phases_algo:ControlAlgo", env={"PYTHONPATH": os.getcwd()}, calls=5, warmup=1, width=16, height=16)
+        self.assertEqual(scenario["runs"], 2)
+        self.assertEqual(scenario["metrics"]["p50_ms"]["n"], 2)
+        self.assertEqual(scenario["bench_args"]["calls"], 5)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "baseline.json")
+            save_baseline(path, {"small": scenario})
+            save_baseline(path, {"other": scenario})
+            data = load_baseline(path)
+            self.assertEqual(set(data["scenarios"]), {"small", "other"})
+            self.assertEqual(compare(data, data)["status"], "PASS")
+            checks = perf_checks(os.getcwd(), path, repeat=2, entry="tests.mock_phases_algo:ControlAlgo", thresholds={"p99_ms": 500.0})
+            p99 = [c for c in checks if c["name"] == "perf:small:p99_ms"]
+            self.assertEqual(len(p99), 1)
+            self.assertIn("阈值 500.0%", p99[0]["message"])
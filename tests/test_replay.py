@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from procvision_algorithm_sdk.client import AdapterClient
+from procvision_algorithm_sdk.recording import read_capture
+from procvision_algorithm_sdk.replay import diff_values, replay
+from procvision_algorithm_sdk.shared_memory import release_shared_memory, write_image_array_to_shared_memory
+from tests.test_client import _data
+
+_ENV = {"PYTHONPATH": os.getcwd()}
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.capture = os.path.join(self.tmp.name, "traffic.pvcap")
+        img = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)
+        write_image_array_to_shared_memory("dev-shm:client:cur", img)
+        write_image_array_to_shared_memory("dev-shm:client:guide", img)
+        args = ["--record", self.capture]
+        with AdapterClient(os.getcwd(), entry="tests.mock_phases_algo:ExecuteAlgo", env=_ENV, adapter_args=args) as c:
+            for i in range(3):
+                self.assertEqual(c.call(_data(i + 1))["status"], "OK")
+        # 回放时图像只能来自抓包
+        release_shared_memory("dev-shm:client:cur")
+        release_shared_memory("dev-shm:client:guide")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_capture_contents(self):
+        records = list(read_capture(self.capture))
+        kinds = [r["kind"] for r in records]
+        self.assertEqual(kinds[0], "header")
+        self.assertEqual(kinds.count("blob"), 1)
+        calls = [r for r in records if r["kind"] == "in" and r["frame"].get("type") == "call"]
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(set(calls[0]["shm"].values())), 1)
+        self.assertTrue(any(r["kind"] == "out" and r["frame"].get("type") == "hello" for r in records))
+
+    def test_replay_matches_same_package(self):
+        report = replay(self.capture, os.getcwd(), entry="tests.mock_phases_algo:ExecuteAlgo", fast=True, env=_ENV)
+        self.assertEqual(report["status"], "PASS", report)
+        self.assertEqual(report["matched"], 3)
+        self.assertEqual(report["latency"]["replay"]["count"], 3)
+        report = replay(self.capture, os.getcwd(), entry="tests.mock_phases_algo:ExecuteAlgo", env=_ENV)
+        self.assertEqual(report["status"], "PASS", report)
+
+    def test_replay_reports_diffs(self):
+        report = replay(self.capture, os.getcwd(), entry="tests.mock_phases_algo:ControlAlgo", fast=True, env=_ENV)
+        self.assertEqual(report["status"], "FAIL")
+        self.assertEqual(report["mismatched"], 3)
+        self.assertIn("data.debug.pid", report["results"][0]["diffs"])
+
+    def test_diff_values(self):
+        self.assertEqual(diff_values({"a": 1.0, "timing": 1}, {"a": 1.0 + 1e-9, "timing": 2}), [])
+        self.assertEqual(diff_values({"a": [1, 2]}, {"a": [1, 3]}), ["a[1]"])
+        self.assertEqual(diff_values({"a": 1}, {"b": 1}), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
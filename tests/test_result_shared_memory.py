@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from procvision_algorithm_sdk.shared_memory import ResultSegmentManager, read_array_from_shared_memory, write_array_to_shared_memory
+from tests.adapter_helpers import _adapter, _call_payload, _read_frame, _write_frame
+
+
+class TestResultSegmentManager(unittest.TestCase):
+    def test_array_roundtrip_keeps_dtype(self):
+        arr = np.arange(12, dtype=np.float32).reshape(3, 4)
+        meta = write_array_to_shared_memory("dev-shm:test-array", arr)
+        self.assertEqual(meta["shape"], [3, 4])
+        self.assertEqual(meta["dtype"], "float32")
+        out = read_array_from_shared_memory("dev-shm:test-array", meta)
+        self.assertTrue(np.array_equal(out, arr))
+
+    def test_eviction_beyond_keep(self):
+        mgr = ResultSegmentManager(keep=2)
+        for rid in ("a", "b", "c"):
+            mgr.publish(rid, {"m": (np.zeros((2, 2), dtype=np.uint8), {})})
+        self.assertEqual(mgr.active(), 2)
+        self.assertIsNone(read_array_from_shared_memory("dev-shm:result:a:m"))
+        self.assertTrue(mgr.release("c"))
+        self.assertIsNone(read_array_from_shared_memory("dev-shm:result:c:m"))
+        self.assertFalse(mgr.release("c"))
+
+
+class TestAdapterResultSharedMemory(unittest.TestCase):
+    def test_outputs_returned_by_reference(self):
+        with _adapter("tests.mock_phases_algo:OutputAlgo") as p:
+            hello = _read_frame(p.stdout)
+            self.assertIn("result_shm:v1", hello.get("capabilities", []))
+            _write_frame(p.stdin, {"type": "hello", "runner_version": "dev", "capabilities": ["result_shm:v1"]})
+            _write_frame(p.stdin, _call_payload("out-1"))
+            res = _read_frame(p.stdout)
+            self.assertEqual(res["type"], "result")
+            ref = res["data"]["outputs"]["mask"]
+            self.assertEqual(ref["shape"], [4, 6])
+            self.assertEqual(ref["dtype"], "uint8")
+            self.assertEqual(ref["kind"], "segmentation")
+            mask = read_array_from_shared_memory(ref["shm_id"], ref)
+            self.assertEqual(int(mask[1, 2]), 255)
+            del mask
+            _write_frame(p.stdin, {"type": "release", "request_id": "out-1"})
+            _write_frame(p.stdin, {"type": "ping", "request_id": "p1"})
+            self.assertEqual(_read_frame(p.stdout)["type"], "pong")
+            self.assertIsNone(read_array_from_shared_memory(ref["shm_id"], ref))
+            _write_frame(p.stdin, {"type": "shutdown"})
+            _read_frame(p.stdout)
+
+    def test_outputs_dropped_without_negotiation(self):
+        with _adapter("tests.mock_phases_algo:OutputAlgo") as p:
+            _read_frame(p.stdout)
+            _write_frame(p.stdin, {"type": "hello", "runner_version": "dev"})
+            _write_frame(p.stdin, _call_payload("out-2"))
+            res = _read_frame(p.stdout)
+            self.assertEqual(res["type"], "result")
+            self.assertNotIn("outputs", res["data"])
+            _write_frame(p.stdin, {"type": "shutdown"})
+            _read_frame(p.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from unittest import mock
+
+from procvision_algorithm_sdk import deploy
+from procvision_algorithm_sdk.cli import package
+from procvision_algorithm_sdk.deploy import deploy_package
+from procvision_algorithm_sdk.runner import MockRunner, load_scenario, run_scenario
+
+_ENV = {"PYTHONPATH": os.getcwd()}
+_ENTRY = "tests.mock_phases_algo:ControlAlgo"
+
+
+def _make_zip(path, name="algo-x", version="1.2.0"):
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr(f"{name}/manifest.json", json.dumps({"name": name, "version": version}))
+        z.writestr(f"{name}/pkg/__init__.py", "")
+        z.writestr("wheels/dummy-0.1-py3-none-any.whl", b"whl")
+    return path
+
+
+class TestDeploy(unittest.TestCase):
+    def test_deploy_layout_and_no_overwrite(self):
+        with tempfile.TemporaryDirectory() as d:
+            pkg = _make_zip(os.path.join(d, "algo.zip"))
+            root = os.path.join(d, "deploy")
+            res = deploy_package(pkg, root)
+            self.assertEqual(res["status"], "OK", res)
+            self.assertEqual(res["path"], os.path.join(os.path.abspath(root), "algo-x-1.2.0"))
+            self.assertTrue(os.path.isfile(os.path.join(res["path"], "manifest.json")))
+            self.assertTrue(os.path.isfile(os.path.join(res["path"], "wheels", "dummy-0.1-py3-none-any.whl")))
+            again = deploy_package(pkg, root)
+            self.assertEqual(again["status"], "ERROR")
+            self.assertEqual(sorted(os.listdir(root)), ["algo-x-1.2.0"])
+
+    def _packaged(self, d):
+        proj = os.path.join(d, "algo")
+        os.makedirs(os.path.join(proj, "algo_pkg"))
+        os.makedirs(os.path.join(proj, "wheels"))
+        with open(os.path.join(proj, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({"name": "algo-y", "version": "2.0.0", "entry_point": "algo_pkg.main:Algo"}, f)
+        with open(os.path.join(proj, "requirements.txt"), "w", encoding="utf-8") as f:
+            f.write("dep==1.0\n")
+        with open(os.path.join(proj, "algo_pkg", "main.py"), "w", encoding="utf-8") as f:
+            f.write("from tests.mock_phases_algo import ExecuteAlgo as Algo\n")
+        with open(os.path.join(proj, "algo_pkg", "weights.bin"), "wb") as f:
+            f.write(os.urandom(300000))
+        with zipfile.ZipFile(os.path.join(proj, "wheels", "dep-1.0-py3-none-any.whl"), "w") as z:
+            z.writestr("dep/__init__.py", "def main():\n    print('dep-ok')\n")
+            z.writestr("dep-1.0.dist-info/entry_points.txt", "[console_scripts]\ndep-tool = dep:main\n")
+            z.writestr("dep-1.0.dist-info/METADATA", "Metadata-Version: 2.1\nName: dep\nVersion: 1.0\n")
+            z.writestr("dep-1.0.dist-info/WHEEL", "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n")
+            z.writestr("dep-1.0.dist-info/RECORD", "")
+        out = os.path.join(d, "algo.zip")
+        res = package(proj, out, None, False, None, None, None, None, True, False, None, None, None)
+        self.assertEqual(res["status"], "OK", res)
+        return out
+
+    def test_verified_venv_deploy(self):
+        with tempfile.TemporaryDirectory() as d:
+            pkg = self._packaged(d)
+            root = os.path.join(d, "deploy")
+            with mock.patch.object(deploy, "LARGE_MEMBER_BYTES", 100000):
+                res = deploy_package(pkg, root, venv=True, system_site_packages=True, validate=True, env=_ENV)
+            self.assertEqual(res["status"], "OK", res)
+            self.assertTrue(res["verified"])
+            self.assertEqual(res["parallel_members"], 1)
+            self.assertEqual(res["validate"]["summary"]["status"], "PASS")
+            self.assertTrue(res["venv"]["installed"])
+            self.assertTrue(res["venv"]["python"].startswith(res["path"]))
+            site = [r for r, ds, _ in os.walk(os.path.join(res["path"], "venv")) if "dep" in ds]
+            self.assertEqual(len(site), 1)
+            self.assertEqual(os.listdir(root), ["algo-y-2.0.0"])
+            self.assertGreaterEqual(res["venv"]["relocated"], 2)
+            # venv 写入的绝对路径必须指向最终目录，而非已删除的 .tmp
+            bindir = os.path.dirname(res["venv"]["python"])
+            for f in ("pyvenv.cfg", os.path.join(bindir, "activate"), os.path.join(bindir, "dep-tool")):
+                with open(os.path.join(res["venv"]["path"], f), "r", encoding="utf-8") as fh:
+                    self.assertNotIn(".tmp", fh.read(), f)
+            out = subprocess.run([os.path.join(bindir, "dep-tool")], capture_output=True, text=True, timeout=30)
+            self.assertEqual(out.stdout.strip(), "dep-ok", out.stderr)
+
+    def test_failed_validation_never_publishes(self):
+        with tempfile.TemporaryDirectory() as d:
+            pkg = _make_zip(os.path.join(d, "algo.zip"))
+            root = os.path.join(d, "deploy")
+            final = os.path.join(os.path.abspath(root), "algo-x-1.2.0")
+            seen = []
+
+            def _fail(path, python, env):
+                seen.append((path, os.path.exists(final)))
+                return {"summary": {"status": "FAIL"}, "checks": [{"result": "FAIL", "name": "x"}]}
+
+            with mock.patch.object(deploy, "_validate", side_effect=_fail):
+                res = deploy_package(pkg, root, validate=True)
+            self.assertEqual(res["status"], "ERROR")
+            # 验证期间最终目录尚不存在，失败后暂存目录被清理
+            self.assertEqual(seen, [(f"{final}.{os.getpid()}.tmp", False)])
+            self.assertEqual(os.listdir(root), [])
+
+    def test_checksum_mismatch_leaves_nothing(self):
+        with tempfile.TemporaryDirectory() as d:
+            pkg = self._packaged(d)
+            tampered = os.path.join(d, "tampered.zip")
+            with zipfile.ZipFile(pkg) as src, zipfile.ZipFile(tampered, "w") as dst:
+                for info in src.infolist():
+                    data = src.read(info)
+                    dst.writestr(info, b"# patched\n" if info.filename == "algo/algo_pkg/main.py" else data)
+            root = os.path.join(d, "deploy")
+            res = deploy_package(tampered, root)
+            self.assertEqual(res["status"], "ERROR")
+            self.assertIn("algo/algo_pkg/main.py", res["message"])
+            self.assertEqual(os.listdir(root), [])
+
+
+class TestMockRunner(unittest.TestCase):
+    def test_multi_station_calls(self):
+        with MockRunner(heartbeat_interval_ms=0, heartbeat_grace_ms=1000, env=_ENV) as runner:
+            for i in range(2):
+                runner.add_station(f"st{i}", os.getcwd(), entry=_ENTRY, width=8, height=6)
+            report = runner.run(calls=4, rate=20)
+            # 心跳由测试直接驱动，不依赖后台线程的时间窗口
+            for st in runner.stations:
+                self.assertEqual(st.heartbeat(), "sent")
+                with st._lock:
+                    self.assertEqual(st.heartbeat(), "busy")
+            beats = [st.report(1.0)["heartbeat"] for st in runner.stations]
+        self.assertEqual(report["status"], "OK", report)
+        self.assertEqual(report["calls"], 8)
+        self.assertEqual(report["outcomes"]["OK"], 8)
+        pids = {st["pid"] for st in report["stations"]}
+        self.assertEqual(len(pids), 2)
+        self.assertEqual(beats, [{"sent": 1, "missed": 0, "restarts": 0, "busy": 1}] * 2)
+
+    def test_hung_execute_counts_as_missed_heartbeat(self):
+        with MockRunner(heartbeat_interval_ms=0, hang_timeout_ms=100, env=_ENV) as runner:
+            st = runner.add_station("st", os.getcwd(), entry=_ENTRY, width=8, height=6, step_desc="sleep:30")
+            st.start()
+            pid = st.client.pid
+            out = []
+            t = threading.Thread(target=lambda: out.append(st.detect()))
+            t.start()
+            while st._call_started is None:
+                time.sleep(0.01)
+            self.assertEqual(st.heartbeat(), "busy")
+            time.sleep(0.2)
+            self.assertEqual(st.heartbeat(), "missed")
+            t.join(10)
+            self.assertFalse(t.is_alive())
+            self.assertEqual(out[0]["status"], "ERROR")
+            self.assertNotEqual(st.client.pid, pid)
+            beats = st.report(1.0)["heartbeat"]
+        self.assertEqual((beats["missed"], beats["restarts"], beats["busy"]), (1, 1, 1))
+
+    def test_timeout_restarts_adapter(self):
+        with MockRunner(heartbeat_interval_ms=0, execute_timeout_ms=300, env=_ENV) as runner:
+            runner.add_station("slow", os.getcwd(), entry=_ENTRY, step_desc="sleep:2", width=8, height=6)
+            report = runner.run(calls=1)
+        st = report["stations"][0]
+        self.assertEqual(st["timeouts"], 1)
+        self.assertEqual(st["errors_by_code"], {"1005": 1})
+        self.assertGreaterEqual(st["restarts"], 1)
+
+    def test_scenario_deploys_zip(self):
+        with tempfile.TemporaryDirectory() as d:
+            _make_zip(os.path.join(d, "algo.zip"))
+            with open(os.path.join(d, "scenario.json"), "w", encoding="utf-8") as f:
+                json.dump({"deploy_root": "deploy", "calls": 2, "env": _ENV, "heartbeat_interval_ms": 0, "stations": [{"name": "line", "count": 2, "package": "algo.zip", "entry": _ENTRY, "width": 8, "height": 6}]}, f)
+            cfg = load_scenario(os.path.join(d, "scenario.json"))
+            report = run_scenario(cfg)
+            self.assertEqual(report["status"], "OK", report)
+            self.assertEqual([st["name"] for st in report["stations"]], ["line-1", "line-2"])
+            self.assertTrue(all(st["project"] == os.path.join(d, "deploy", "algo-x-1.2.0") for st in report["stations"]))
+            self.assertEqual(os.listdir(os.path.join(d, "deploy")), ["algo-x-1.2.0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import unittest
+
+from procvision_algorithm_sdk.soak import analyze_samples, linear_trend, soak
+
+
+def _samples(rss_step, fds_step=0, p50_step=0.0, n=20):
+    return [
+        {"t_s": i * 60.0, "pid": 1, "rss_bytes": 100 * 1024 * 1024 + i * rss_step, "open_fds": 10 + i * fds_step, "threads": 4, "p50_ms": 10.0 + i * p50_step}
+        for i in range(n)
+    ]
+
+
+class TestSoak(unittest.TestCase):
+    def test_linear_trend(self):
+        t = linear_trend([0.0, 1.0, 2.0, 3.0], [1.0, 3.0, 5.0, 7.0])
+        self.assertAlmostEqual(t["slope"], 2.0)
+        self.assertAlmostEqual(t["intercept"], 1.0)
+        self.assertEqual(t["r2"], 1.0)
+
+    def test_flat_samples_pass(self):
+        report = analyze_samples(_samples(0))
+        self.assertEqual(report["status"], "PASS")
+        self.assertEqual(report["trends"]["rss_bytes"]["per_hour"], 0.0)
+
+    def test_leak_and_drift_flagged(self):
+        # 每分钟 +1MB => 60MB/h；每分钟 +1 fd；p50 每分钟 +1ms
+        report = analyze_samples(_samples(1024 * 1024, fds_step=1, p50_step=1.0))
+        self.assertEqual(report["status"], "FAIL")
+        metrics = {f["metric"] for f in report["findings"]}
+        self.assertEqual(metrics, {"rss_bytes", "open_fds", "p50_ms"})
+        self.assertAlmostEqual(report["trends"]["rss_bytes"]["per_hour"], 60.0, places=3)
+
+    def test_only_last_process_is_fitted(self):
+        samples = _samples(1024 * 1024, n=10) + [dict(s, pid=2, t_s=s["t_s"] + 600.0) for s in _samples(0, n=10)]
+        self.assertEqual(analyze_samples(samples)["status"], "PASS")
+
+    def test_soak_collects_time_series(self):
+        report = soak(os.getcwd(), duration_s=1.2, rate=40.0, sample_interval_s=0.3, entry="tests.mock_phases_algo:ControlAlgo", env={"PYTHONPATH": os.getcwd()}, width=16, height=16)
+        self.assertGreaterEqual(len(report["samples"]), 4)
+        self.assertGreater(report["calls"], 20)
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(report["restarts"], 0)
+        self.assertIsNotNone(report["samples"][-1]["rss_bytes"])
+        self.assertIn("rss_bytes", report["trends"])
@@ -0,0 +1,64 @@
+import unittest
+
+from procvision_algorithm_sdk.stats import LatencyHistogram, RuntimeStats, resource_usage
+from tests.adapter_helpers import _adapter, _call_payload, _read_frame, _write_frame
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_error(self):
+        h = LatencyHistogram()
+        for i in range(1, 1001):
+            h.record(float(i))
+        snap = h.snapshot()
+        self.assertEqual(snap["count"], 1000)
+        self.assertEqual(snap["max_ms"], 1000.0)
+        self.assertAlmostEqual(snap["p50_ms"], 500.0, delta=500.0 * 0.25)
+        self.assertAlmostEqual(snap["p99_ms"], 990.0, delta=990.0 * 0.25)
+        self.assertLessEqual(snap["p99_ms"], snap["max_ms"])
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().snapshot()["p50_ms"], 0.0)
+
+    def test_runtime_stats_errors_by_code(self):
+        st = RuntimeStats()
+        st.record_call()
+        st.record_result("OK")
+        st.record_result("ERROR", "1002")
+        st.record_error("1009")
+        snap = st.snapshot()
+        self.assertEqual(snap["results_ok"], 1)
+        self.assertEqual(snap["errors_by_code"], {"1002": 1, "1009": 1})
+        self.assertIn("rss_bytes", snap["resources"])
+
+    def test_resource_usage_keys(self):
+        usage = resource_usage()
+        for key in ("rss_bytes", "peak_rss_bytes", "cpu_user_s", "threads", "gc_counts"):
+            self.assertIn(key, usage)
+
+
+class TestAdapterStats(unittest.TestCase):
+    def test_stats_after_calls(self):
+        with _adapter("tests.mock_phases_algo:ExecuteAlgo") as p:
+            hello = _read_frame(p.stdout)
+            self.assertIn("stats:v1", hello.get("capabilities", []))
+            _write_frame(p.stdin, {"type": "hello", "runner_version": "dev"})
+            for i in range(3):
+                _write_frame(p.stdin, _call_payload(f"r{i}"))
+                self.assertEqual(_read_frame(p.stdout)["type"], "result")
+            _write_frame(p.stdin, {"type": "stats", "request_id": "s1"})
+            res = _read_frame(p.stdout)
+            self.assertEqual(res["type"], "stats")
+            self.assertEqual(res["request_id"], "s1")
+            data = res["data"]
+            self.assertEqual(data["calls"], 3)
+            self.assertEqual(data["results_ok"], 3)
+            self.assertEqual(data["latency"]["execute"]["count"], 3)
+            self.assertIn("p99_ms", data["latency"]["total"])
+            self.assertEqual(set(data["shared_memory_reads"]), {"memory", "file", "missing"})
+            self.assertNotIn("queue_depth", data)
+            _write_frame(p.stdin, {"type": "shutdown"})
+            _read_frame(p.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
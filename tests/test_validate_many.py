@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from procvision_algorithm_sdk.validate_many import discover_projects, validate_many
+
+_ENV = {"PYTHONPATH": os.getcwd()}
+
+
+def _project(parent, name, entry):
+    d = os.path.join(parent, name)
+    os.makedirs(d)
+    with open(os.path.join(d, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"name": name, "version": "1.0.0", "entry_point": entry}, f)
+    return d
+
+
+class TestValidateMany(unittest.TestCase):
+    def test_parallel_projects_combined_report(self):
+        with tempfile.TemporaryDirectory() as d:
+            _project(d, "a", "tests.mock_phases_algo:ExecuteAlgo")
+            _project(d, "b", "tests.mock_phases_algo:PartialAlgo")
+            _project(d, "c", "tests.mock_phases_algo:NoSuchAlgo")
+            os.makedirs(os.path.join(d, "not-a-project"))
+            projects = discover_projects([d, os.path.join(d, "a")])
+            self.assertEqual([os.path.basename(p) for p in projects], ["a", "b", "c"])
+            report = validate_many(projects, workers=3, full=True, env=_ENV)
+        s = report["summary"]
+        self.assertEqual((s["status"], s["projects"], s["passed"], s["failed"], s["workers"]), ("FAIL", 3, 2, 1, 3))
+        by_name = {os.path.basename(r["project"]): r for r in report["projects"]}
+        self.assertEqual(by_name["a"]["status"], "PASS")
+        self.assertEqual(by_name["c"]["status"], "FAIL")
+        self.assertEqual(by_name["c"]["exit_code"], 1)
+        self.assertTrue(all(r["wall_ms"] > 0 and "started_ms" in r for r in report["projects"]))
+        self.assertGreater(s["serial_s"], 0)
+
+
+    def test_default_path_stays_single_project(self):
+        with tempfile.TemporaryDirectory() as d:
+            a = _project(d, "a", "tests.mock_phases_algo:ExecuteAlgo")
+            _project(d, "b", "tests.mock_phases_algo:ExecuteAlgo")
+            cmd = [sys.executable, "-c", "from procvision_algorithm_sdk.cli import main; main()", "validate"]
+            env = {**os.environ, **_ENV}
+            # 工作区根目录无 manifest：不给路径时不展开子项目，单项目参数照常可用
+            res = subprocess.run(cmd + ["--manifest", os.path.join(a, "manifest.json"), "--json"], cwd=d, env=env, capture_output=True, text=True)
+            self.assertNotEqual(res.returncode, 2, res.stdout + res.stderr)
+            self.assertNotIn("projects", json.loads(res.stdout))
+            res = subprocess.run(cmd + [d, "--json"], cwd=d, env=env, capture_output=True, text=True)
+            self.assertEqual(json.loads(res.stdout)["summary"]["projects"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
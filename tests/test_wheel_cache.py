@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+import zipfile
+
+from procvision_algorithm_sdk.wheel_cache import WheelStore, fetch_wheels
+
+_TARGET = ("linux_x86_64", "3.10", "cp", "cp310")
+
+
+def _wheel(directory, name, version, requires=()):
+    path = os.path.join(directory, f"{name}-{version}-py3-none-any.whl")
+    info = f"{name}-{version}.dist-info"
+    meta = f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n" + "".join(f"Requires-Dist: {r}\n" for r in requires)
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr(f"{name}/__init__.py", "")
+        z.writestr(f"{info}/METADATA", meta)
+        z.writestr(f"{info}/WHEEL", "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n")
+        z.writestr(f"{info}/RECORD", "")
+    return path
+
+
+class TestWheelCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        d = self.tmp.name
+        self.links = os.path.join(d, "links")
+        os.makedirs(self.links)
+        _wheel(self.links, "alpha", "1.0", requires=["beta>=2"])
+        _wheel(self.links, "beta", "2.0")
+        _wheel(self.links, "gamma", "0.3")
+        self.cache = os.path.join(d, "cache")
+        self.req = os.path.join(d, "requirements.txt")
+        with open(self.req, "w", encoding="utf-8") as f:
+            f.write("alpha==1.0\ngamma==0.3  # pinned\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_offline_fetch_then_shared_cache_hit(self):
+        dest1 = os.path.join(self.tmp.name, "p1", "wheels")
+        res = fetch_wheels(self.req, dest1, *_TARGET, cache_dir=self.cache, offline=True, find_links=self.links, jobs=2)
+        self.assertEqual(res["status"], "OK", res)
+        self.assertEqual(res["resolution"], "pip")
+        self.assertEqual(res["fetched"], 3)
+        self.assertEqual(sorted(os.listdir(dest1)), ["alpha-1.0-py3-none-any.whl", "beta-2.0-py3-none-any.whl", "gamma-0.3-py3-none-any.whl"])
+
+        # 第二个项目：无本地目录、离线，完全由共享缓存满足并以硬链接落地
+        dest2 = os.path.join(self.tmp.name, "p2", "wheels")
+        res = fetch_wheels(self.req, dest2, *_TARGET, cache_dir=self.cache, offline=True)
+        self.assertEqual(res["status"], "OK", res)
+        self.assertEqual(res["resolution"], "cache")
+        self.assertEqual(res["cache_hits"], 3)
+        self.assertEqual(res["fetched"], 0)
+        self.assertEqual(res["linked"], 3)
+        store = WheelStore(self.cache)
+        blobs = [os.path.join(r, f) for r, _, fs in os.walk(store.blobs_dir) for f in fs]
+        self.assertEqual(len(blobs), 3)
+        self.assertTrue(any(os.path.samefile(b, os.path.join(dest2, "beta-2.0-py3-none-any.whl")) for b in blobs))
+
+    def test_offline_miss_fails_without_local_dir(self):
+        res = fetch_wheels(self.req, os.path.join(self.tmp.name, "w"), *_TARGET, cache_dir=self.cache, offline=True)
+        self.assertEqual(res["status"], "ERROR")
+        self.assertEqual(len(res["failures"]), 2)
+
+    def test_requirements_resolve_jointly(self):
+        # 逐行解析时 alpha 的依赖会选 beta 2.1，而 beta<2.1 另选 2.0，两个版本同时落地
+        _wheel(self.links, "beta", "2.1")
+        with open(self.req, "w", encoding="utf-8") as f:
+            f.write("alpha==1.0\nbeta<2.1\n")
+        dest = os.path.join(self.tmp.name, "w")
+        res = fetch_wheels(self.req, dest, *_TARGET, cache_dir=self.cache, offline=True, find_links=self.links)
+        self.assertEqual(res["status"], "OK", res)
+        self.assertEqual(sorted(os.listdir(dest)), ["alpha-1.0-py3-none-any.whl", "beta-2.0-py3-none-any.whl"])
+
+    def test_unpinned_requirements_are_re_resolved(self):
+        with open(self.req, "w", encoding="utf-8") as f:
+            f.write("gamma\n")
+        res = fetch_wheels(self.req, os.path.join(self.tmp.name, "a"), *_TARGET, cache_dir=self.cache, offline=True, find_links=self.links)
+        self.assertEqual(res["wheels"], ["gamma-0.3-py3-none-any.whl"])
+        _wheel(self.links, "gamma", "0.4")
+        res = fetch_wheels(self.req, os.path.join(self.tmp.name, "b"), *_TARGET, cache_dir=self.cache, offline=True, find_links=self.links)
+        self.assertEqual(res["resolution"], "pip")
+        self.assertEqual(res["wheels"], ["gamma-0.4-py3-none-any.whl"])
+        # 无任何来源时退回最近一次的解析结果
+        res = fetch_wheels(self.req, os.path.join(self.tmp.name, "c"), *_TARGET, cache_dir=self.cache, offline=True)
+        self.assertEqual(res["resolution"], "cache")
+        self.assertEqual(res["wheels"], ["gamma-0.4-py3-none-any.whl"])
+
+    def test_cache_is_keyed_by_target(self):
+        fetch_wheels(self.req, os.path.join(self.tmp.name, "a"), *_TARGET, cache_dir=self.cache, offline=True, find_links=self.links)
+        res = fetch_wheels(self.req, os.path.join(self.tmp.name, "b"), "win_amd64", "3.11", "cp", "cp311", cache_dir=self.cache, offline=True)
+        self.assertEqual(res["status"], "ERROR")
+        self.assertEqual(res["cache_hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()